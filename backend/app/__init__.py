@@ -0,0 +1,4 @@
+import time
+
+# Reference point for the startup profile (app.core.startup)
+STARTED = time.perf_counter()
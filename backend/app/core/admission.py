@@ -0,0 +1,163 @@
+"""
+Adaptive admission control.
+
+Requests are grouped into route classes, each with its own concurrency limit
+that adapts to the latency it observes (a gradient limit): while recent
+latency stays near the long-run baseline the limit grows by about sqrt(limit)
+per sample, and as a queue builds up and latency rises the limit shrinks in
+proportion. Server errors back it off multiplicatively. A request that would
+exceed its class limit is rejected at once with 503 and Retry-After rather
+than waiting for a threadpool slot, so a burst of bcrypt logins or exports
+cannot starve the cheap reads, and /health never waits behind anything.
+"""
+import json
+import math
+import time
+from typing import Dict, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.metrics import labels, registry
+
+# Never limited: probes, metrics, operator diagnostics and long-lived streams
+EXEMPT_PATHS = ("/health", "/metrics", "/api/admin/", "/api/hiring/stream")
+
+SHORT_WINDOW = 10  # samples in the recent latency average
+LONG_WINDOW = 500  # samples in the baseline latency average
+RTT_TOLERANCE = 2.0  # recent/baseline latency ratio tolerated before the limit shrinks
+SMOOTHING = 0.2
+BACKOFF = 0.9  # limit multiplier after a server error
+
+
+class ClassLimits(NamedTuple):
+    initial: int
+    minimum: int
+    maximum: int
+
+
+# Reads are cheap and mostly cached, so they start (and may grow) far above the
+# CPU-bound bcrypt and bulk classes
+ROUTE_CLASSES: Dict[str, ClassLimits] = {
+    "read": ClassLimits(initial=64, minimum=16, maximum=512),
+    "write": ClassLimits(initial=16, minimum=4, maximum=128),
+    "auth": ClassLimits(initial=4, minimum=1, maximum=16),
+    "bulk": ClassLimits(initial=2, minimum=1, maximum=8),
+}
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Route class for a request, or None when it bypasses admission control."""
+    if method == "OPTIONS" or path.startswith(EXEMPT_PATHS):
+        return None
+    if path.startswith("/auth/") and method == "POST":
+        return "auth"
+    if path.endswith("/export") or path.endswith("/bulk-import"):
+        return "bulk"
+    if method in ("GET", "HEAD"):
+        return "read"
+    return "write"
+
+
+class GradientLimiter:
+    """
+    Concurrency limit for one route class. Only touched from the event loop
+    thread, so it needs no locking.
+    """
+
+    def __init__(self, limits: ClassLimits):
+        self.limits = limits
+        self.limit = float(limits.initial)
+        self.in_flight = 0
+        self._short_rtt: Optional[float] = None
+        self._long_rtt: Optional[float] = None
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, rtt: float, failed: bool, in_flight: int):
+        """Return a slot and adapt the limit to the request's latency (`in_flight` as seen at admission)."""
+        self.in_flight -= 1
+        if self._long_rtt is None:
+            self._short_rtt = self._long_rtt = rtt
+        else:
+            self._short_rtt += (rtt - self._short_rtt) / SHORT_WINDOW
+            self._long_rtt += (rtt - self._long_rtt) / LONG_WINDOW
+            if self._long_rtt > 2 * self._short_rtt:
+                # Latency dropped for good (e.g. after a deploy); let the baseline catch up faster
+                self._long_rtt *= 0.95
+
+        if failed:
+            target = self.limit * BACKOFF
+        elif in_flight < self.limit / 2:
+            return  # not using the limit, so latency says nothing about raising it
+        else:
+            gradient = max(0.5, min(1.0, RTT_TOLERANCE * self._long_rtt / max(self._short_rtt, 1e-6)))
+            target = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - SMOOTHING) + target * SMOOTHING
+        self.limit = min(max(limit, self.limits.minimum), self.limits.maximum)
+
+
+limiters: Dict[str, GradientLimiter] = {name: GradientLimiter(limits) for name, limits in ROUTE_CLASSES.items()}
+
+registry.gauge("admission_limit", "Current concurrency limit per route class.")
+registry.gauge("admission_in_flight", "Admitted requests in progress per route class.")
+registry.counter("admission_shed_total", "Requests rejected with 503 per route class.")
+
+
+def _collect():
+    for name, limiter in limiters.items():
+        registry.set("admission_limit", labels(route_class=name), int(limiter.limit))
+        registry.set("admission_in_flight", labels(route_class=name), limiter.in_flight)
+
+
+registry.add_collector(_collect)
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying the per-class limits before the request reaches a route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        name = route_class(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[name]
+        if not limiter.try_acquire():
+            registry.inc("admission_shed_total", labels(route_class=name))
+            await _reject(send)
+            return
+
+        in_flight = limiter.in_flight
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            limiter.release(time.perf_counter() - start, status_code >= 500, in_flight)
+
+
+async def _reject(send):
+    body = json.dumps({"detail": "Server is busy, please retry shortly"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,235 @@
+"""
+Columnar in-memory snapshot of applications for dashboard analytics.
+
+Enabled with ANALYTICS_ENGINE=numpy (requires the optional numpy package).
+Only the three columns the dashboard reads are kept, as parallel arrays:
+status and job_type as uint8 category codes and date_sent as int32 day
+ordinals, roughly 14 bytes per application including the id. Writes in this
+worker are folded in after commit via the history hook; writes in other
+workers mark the snapshot stale and it reloads on the next read.
+"""
+import logging
+import threading
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.core import archive, history
+from app.core.bus import Change, bus
+from app.core.config import settings
+from app.core.history import ApplicationChange
+from app.models import (
+    Application, ApplicationStatus, CumulativeDataPoint, DashboardStats, JobType, WeeklyDataPoint,
+)
+
+STATUSES = list(ApplicationStatus)
+JOB_TYPES = list(JobType)
+_STATUS_CODE = {s: i for i, s in enumerate(STATUSES)}
+_JOB_TYPE_CODE = {j: i for i, j in enumerate(JOB_TYPES)}
+DELETED = 255  # status code of a removed row until the next compaction
+
+RESPONSE_STATUSES = {"response", "interview", "offer", "rejected"}
+LOAD_CHUNK_SIZE = 50_000
+
+logger = logging.getLogger(__name__)
+
+
+def available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ColumnarSnapshot:
+    """Parallel id/status/job_type/day arrays, kept sorted by id."""
+
+    def __init__(self):
+        import numpy as np
+
+        self._np = np
+        self._lock = threading.Lock()
+        self._size = 0
+        self._deleted = 0
+        self._stale = True
+        self.ids = np.empty(0, dtype=np.int64)
+        self.status = np.empty(0, dtype=np.uint8)
+        self.job_type = np.empty(0, dtype=np.uint8)
+        self.day = np.empty(0, dtype=np.int32)
+
+    @property
+    def rows(self) -> int:
+        return self._size - self._deleted
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.status.nbytes + self.job_type.nbytes + self.day.nbytes
+
+    def mark_stale(self):
+        self._stale = True
+
+    def load(self, engine):
+        """Replace the snapshot with a fresh columnar read of every application, archived ones included."""
+        np = self._np
+        ids, status, job_type, day = [], [], [], []
+        with Session(engine) as session:
+            # Archived applications still count towards the dashboard
+            rows = archive.union(Application, lambda m: select(m.id, m.status, m.job_type, m.date_sent))
+            result = session.exec(
+                rows.order_by(rows.selected_columns.id).execution_options(yield_per=LOAD_CHUNK_SIZE)
+            )
+            for rows in result.partitions():
+                ids.append(np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)))
+                status.append(np.fromiter((_STATUS_CODE[r[1]] for r in rows), dtype=np.uint8, count=len(rows)))
+                job_type.append(np.fromiter((_JOB_TYPE_CODE[r[2]] for r in rows), dtype=np.uint8, count=len(rows)))
+                day.append(np.fromiter((r[3].toordinal() for r in rows), dtype=np.int32, count=len(rows)))
+
+        def joined(parts, dtype):
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+        with self._lock:
+            self.ids = joined(ids, np.int64)
+            self.status = joined(status, np.uint8)
+            self.job_type = joined(job_type, np.uint8)
+            self.day = joined(day, np.int32)
+            self._size = len(self.ids)
+            self._deleted = 0
+            self._stale = False
+
+    def _grow(self, needed: int):
+        np = self._np
+        capacity = max(needed, 2 * len(self.ids), 1024)
+        for name in ("ids", "status", "job_type", "day"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _compact(self):
+        keep = self.status[:self._size] != DELETED
+        for name in ("ids", "status", "job_type", "day"):
+            setattr(self, name, getattr(self, name)[:self._size][keep])
+        self._size = len(self.ids)
+        self._deleted = 0
+
+    def apply(self, changes: List[ApplicationChange]):
+        """Fold committed changes in: O(log n) per update/delete, amortised O(1) per append."""
+        np = self._np
+        with self._lock:
+            if self._stale:
+                return
+            for change in changes:
+                ids = self.ids[:self._size]
+                pos = int(np.searchsorted(ids, change.application_id))
+                found = pos < self._size and ids[pos] == change.application_id
+                if change.after is None:
+                    if found and self.status[pos] != DELETED:
+                        self.status[pos] = DELETED
+                        self._deleted += 1
+                    continue
+                values = (
+                    _STATUS_CODE[change.after.status],
+                    _JOB_TYPE_CODE[change.after.job_type],
+                    change.after.date_sent.toordinal(),
+                )
+                if not found and pos < self._size:
+                    # Out-of-order id (rare): fall back to a full reload on the next read
+                    self._stale = True
+                    return
+                if not found:
+                    if self._size == len(self.ids):
+                        self._grow(self._size + 1)
+                    self.ids[self._size] = change.application_id
+                    self._size += 1
+                elif self.status[pos] == DELETED:
+                    self._deleted -= 1
+                self.status[pos], self.job_type[pos], self.day[pos] = values
+            if self._deleted > max(1024, self._size // 10):
+                self._compact()
+
+    def dashboard_stats(self, engine, today: Optional[date] = None) -> DashboardStats:
+        np = self._np
+        if self._stale:
+            self.load(engine)
+        today = today or date.today()
+        with self._lock:
+            status = self.status[:self._size]
+            live = status != DELETED
+            status = status[live]
+            job_type = self.job_type[:self._size][live]
+            day = self.day[:self._size][live]
+
+        status_counts = np.bincount(status, minlength=len(STATUSES))
+        job_type_counts = np.bincount(job_type, minlength=len(JOB_TYPES))
+        total_sent = int(status_counts.sum())
+        response_codes = [_STATUS_CODE[ApplicationStatus(s)] for s in RESPONSE_STATUSES]
+        total_responses = int(status_counts[response_codes].sum())
+
+        # Weekly applications — last 8 ISO weeks, bucketed relative to this week's Monday
+        monday = (today - timedelta(days=today.weekday())).toordinal()
+        weeks_ago = (monday - day + 6) // 7
+        weekly = np.bincount(weeks_ago[(weeks_ago >= 0) & (weeks_ago < 8)], minlength=8)
+        weekly_applications = [
+            WeeklyDataPoint(week=(today - timedelta(weeks=i)).strftime("%Y-W%V"), count=int(weekly[i]))
+            for i in range(7, -1, -1)
+        ]
+
+        # Cumulative applications, one point per day with applications
+        days, per_day = np.unique(day, return_counts=True)
+        running = np.cumsum(per_day)
+        cumulative_applications = [
+            CumulativeDataPoint(date=date.fromordinal(int(d)).isoformat(), total=int(t))
+            for d, t in zip(days, running)
+        ]
+
+        return DashboardStats(
+            total_sent=total_sent,
+            total_responses=total_responses,
+            response_rate=round(total_responses / total_sent * 100, 1) if total_sent > 0 else 0.0,
+            active_interviews=int(status_counts[_STATUS_CODE[ApplicationStatus.interview]]),
+            offers_received=int(status_counts[_STATUS_CODE[ApplicationStatus.offer]]),
+            status_breakdown={STATUSES[i]: int(n) for i, n in enumerate(status_counts) if n},
+            weekly_applications=weekly_applications,
+            cumulative_applications=cumulative_applications,
+            by_job_type={JOB_TYPES[i]: int(n) for i, n in enumerate(job_type_counts) if n},
+        )
+
+
+snapshot: Optional[ColumnarSnapshot] = None
+
+
+def enabled() -> bool:
+    return snapshot is not None
+
+
+def _record(session: Session, changes: List[ApplicationChange]):
+    # Defer until commit so a rolled-back write never reaches the snapshot
+    session.info.setdefault("analytics_changes", []).extend(changes)
+
+
+def _after_commit(session: Session):
+    changes = session.info.pop("analytics_changes", None)
+    if changes:
+        snapshot.apply(changes)
+
+
+def _after_rollback(session: Session):
+    session.info.pop("analytics_changes", None)
+
+
+def _on_remote_change(change: Change):
+    if change.remote:
+        snapshot.mark_stale()
+
+
+if settings.ANALYTICS_ENGINE == "numpy" and not available():
+    logger.warning("ANALYTICS_ENGINE=numpy but numpy is not installed; using the SQL rollups")
+elif settings.ANALYTICS_ENGINE == "numpy":
+    snapshot = ColumnarSnapshot()
+    history.add_handler(_record)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    bus.subscribe("applications", _on_remote_change)
@@ -0,0 +1,181 @@
+"""
+Hot/cold archival of applications and draft releases.
+
+A background pass moves cold rows, keeping their ids, into ArchivedApplication
+and ArchivedRelease, ARCHIVE_BATCH_SIZE rows per transaction:
+
+- applications sent more than ARCHIVE_APPLICATIONS_AFTER_DAYS ago, or in one
+  of ARCHIVE_TERMINAL_STATUSES and sent more than ARCHIVE_TERMINAL_AFTER_DAYS
+  ago, unless a recruiter contact still points at them;
+- drafts not edited for ARCHIVE_DRAFTS_AFTER_DAYS.
+
+Moves deliberately bypass the application history, so the daily, funnel and
+latency rollups keep counting archived applications and the dashboard, funnel
+and time series do not change. The public catalog reads through to the
+archive; the admin lists, exports and an owner's release list only do with
+include_archived=true. Opening or editing an archived row by id moves it back
+(restore), so nothing becomes unreachable. Passes only run with
+ARCHIVE_ENABLED (or POST /api/admin/archive).
+"""
+import asyncio
+import logging
+import random
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import DateTime, and_, delete, insert, literal, or_, union_all
+from sqlalchemy.sql import CompoundSelect, Select
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.bus import bus
+from app.core.config import settings
+from app.core.metrics import labels, registry
+from app.models import (
+    Application, ApplicationStatus, ArchivedApplication, ArchivedRelease, RecruiterContact, Release, VisibilityEnum,
+)
+
+ARCHIVE_TABLES = {Application: ArchivedApplication, Release: ArchivedRelease}
+
+logger = logging.getLogger(__name__)
+
+registry.counter("archive_rows_total", "Rows moved to the archive tables.")
+
+
+def terminal_statuses() -> List[ApplicationStatus]:
+    return [ApplicationStatus(s.strip()) for s in settings.ARCHIVE_TERMINAL_STATUSES.split(",") if s.strip()]
+
+
+def union(model, build: Callable[[type], Select]) -> CompoundSelect:
+    """`build(table)` over the hot table UNION ALL the same over its archive, for include_archived reads."""
+    return union_all(build(model), build(ARCHIVE_TABLES[model]))
+
+
+def _unarchive(session: Session, model, archived):
+    row = model(**archived.model_dump(exclude={"archived_at"}))
+    if hasattr(row, "updated_at"):
+        row.updated_at = datetime.utcnow()  # opened just now, so not stale again for a while
+    session.delete(archived)
+    session.add(row)
+    return row
+
+
+def restore(session: Session, model, row_id: int, **match):
+    """
+    Move an archived row back into its hot table and return it (committed), or
+    None if it is not archived or does not match `match` (e.g. user_id=owner).
+    """
+    archived = session.get(ARCHIVE_TABLES[model], row_id)
+    if archived is None or any(getattr(archived, key) != value for key, value in match.items()):
+        return None
+    row = _unarchive(session, model, archived)
+    session.commit()
+    session.refresh(row)
+    return row
+
+
+def restore_all(session: Session, model, ids: List[int]) -> List[int]:
+    """Move the archived rows among `ids` back into the hot table (the caller commits); returns their ids."""
+    archived = ARCHIVE_TABLES[model]
+    restored = [_unarchive(session, model, row).id for row in session.exec(
+        select(archived).where(archived.id.in_(ids))
+    ).all()]
+    session.flush()
+    return restored
+
+
+def _cold_applications(today: date):
+    cold = Application.date_sent < today - timedelta(days=settings.ARCHIVE_APPLICATIONS_AFTER_DAYS)
+    statuses = terminal_statuses()
+    if statuses:
+        cold = or_(cold, and_(
+            Application.status.in_(statuses),
+            Application.date_sent < today - timedelta(days=settings.ARCHIVE_TERMINAL_AFTER_DAYS),
+        ))
+    referenced = select(RecruiterContact.application_id).where(RecruiterContact.application_id.is_not(None))
+    return and_(cold, Application.id.not_in(referenced))
+
+
+def _stale_drafts(now: datetime):
+    return and_(
+        Release.visibility == VisibilityEnum.draft,
+        Release.updated_at < now - timedelta(days=settings.ARCHIVE_DRAFTS_AFTER_DAYS),
+    )
+
+
+def _move_batch(engine, model, condition) -> int:
+    archived = ARCHIVE_TABLES[model]
+    table = model.__table__
+    # Ids are never handed out twice (a sequence on Postgres, AUTOINCREMENT on SQLite), so a
+    # new row cannot take an archived row's id and inherit its funnel state
+    with Session(engine) as session:
+        ids = session.exec(
+            select(model.id).where(condition).order_by(model.id)
+            .limit(settings.ARCHIVE_BATCH_SIZE).with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            return 0
+        # Re-check the condition: a row may have been edited since it was selected
+        moving = and_(model.id.in_(ids), condition)
+        names = [column.name for column in table.columns]
+        session.exec(insert(archived).from_select(
+            names + ["archived_at"],
+            select(*table.columns, literal(datetime.utcnow(), DateTime).label("archived_at")).where(moving),
+        ))
+        moved = session.exec(delete(model).where(moving)).rowcount
+        session.commit()
+    return moved
+
+
+def _move(engine, model, condition) -> int:
+    total = 0
+    while True:
+        moved = _move_batch(engine, model, condition)
+        total += moved
+        if moved < settings.ARCHIVE_BATCH_SIZE:
+            return total
+
+
+def run_pass(engine, today: Optional[date] = None) -> Dict[str, int]:
+    """Move every currently cold row to the archive; returns rows moved per table."""
+    now = datetime.utcnow()
+    moved = {
+        "applications": _move(engine, Application, _cold_applications(today or now.date())),
+        "releases": _move(engine, Release, _stale_drafts(now)),
+    }
+    for table, count in moved.items():
+        if count:
+            registry.inc("archive_rows_total", labels(table=table), count)
+    if moved["applications"]:
+        bus.publish("applications")  # counts are unchanged, but lists and the catalog are not
+    if any(moved.values()):
+        logger.info("Archived %d applications and %d draft releases", moved["applications"], moved["releases"])
+    return moved
+
+
+# ── Background passes ─────────────────────────────────────────────────────────
+
+_task: Optional[asyncio.Task] = None
+
+
+async def _run(engine):
+    while True:
+        # Jittered so workers started together do not all scan at the same moment
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS * random.uniform(0.5, 1.0))
+        try:
+            await run_in_threadpool(run_pass, engine)
+        except Exception:
+            logger.exception("Archival pass failed")
+
+
+def start(engine):
+    """Schedule archival passes on the running event loop."""
+    global _task
+    _task = asyncio.get_running_loop().create_task(_run(engine))
+
+
+def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        _task = None
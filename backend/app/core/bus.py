@@ -0,0 +1,245 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Change(NamedTuple):
+    resource: str
+    version: int
+    remote: bool
+
+
+Listener = Callable[[Change], None]
+
+
+class _PostgresTransport:
+    """LISTEN/NOTIFY on a dedicated autocommit connection."""
+
+    def __init__(self, engine, channel: str):
+        self.engine = engine
+        self.channel = channel
+        self._conn = None
+        self.gap = False  # messages may have been missed (set on every new LISTEN connection)
+
+    def send(self, message: str) -> None:
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": message})
+            conn.commit()
+
+    def receive(self, timeout: float) -> List[str]:
+        import select
+
+        if self._conn is None:
+            raw = self.engine.raw_connection()
+            raw.detach()
+            self._conn = raw.driver_connection
+            self._conn.autocommit = True
+            self._conn.cursor().execute(f'LISTEN "{self.channel}"')
+            self.gap = True  # nothing sent while no connection was listening is ever delivered
+        if select.select([self._conn], [], [], timeout) == ([], [], []):
+            return []
+        self._conn.poll()
+        messages = [n.payload for n in self._conn.notifies]
+        self._conn.notifies.clear()
+        return messages
+
+    def close(self) -> None:
+        self.gap = True
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class _FileTransport:
+    """
+    Append-only log file shared by every worker on the host (SQLite deployments).
+    Writers append one JSON line under an exclusive flock; readers tail from
+    their last offset. The log is truncated once it grows past max_bytes; a
+    reader that had not caught up by then reports a gap.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1 << 20):
+        self.path = path
+        self.max_bytes = max_bytes
+        with open(self.path, "ab"):
+            pass
+        self._offset = os.path.getsize(self.path)
+        self.gap = True  # whatever changed before we started reading is unknown
+
+    def send(self, message: str) -> None:
+        import fcntl
+
+        with open(self.path, "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if f.tell() > self.max_bytes:
+                    f.truncate(0)
+                f.write(message.encode() + b"\n")
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def receive(self, timeout: float) -> List[str]:
+        import fcntl
+
+        time.sleep(timeout)
+        with open(self.path, "rb") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                size = os.fstat(f.fileno()).st_size
+                if size < self._offset:
+                    self._offset = 0  # truncated by a writer; lines we had not read are gone
+                    self.gap = True
+                f.seek(self._offset)
+                data = f.read()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        if data and not data.startswith(b"{"):
+            # Truncated and regrown past our offset since the last read: we landed mid-line
+            self.gap = True
+        complete = data.rfind(b"\n") + 1
+        self._offset += complete
+        return [line.decode() for line in data[:complete].splitlines() if line]
+
+    def close(self) -> None:
+        self.gap = True
+
+
+class InvalidationBus:
+    """
+    Broadcasts "resource X changed at version N" to every worker process.
+
+    Local listeners are called synchronously on publish() and from a background
+    thread when another worker publishes. Every message from another worker
+    is dispatched: worker clocks are not comparable, so a peer's version is
+    only checked against the last one seen from that same peer (to skip
+    repeats). version(resource) is this worker's own counter and only moves
+    forward, so callers can key caches on it. Whenever messages may have
+    been missed (the listener connected or reconnected, or the file log was
+    truncated under it) every subscribed resource gets a remote change, so
+    caches resync instead of trusting state that silently went stale.
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex[:12]
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._seen: Dict[Tuple[str, str], int] = {}  # (origin, resource) -> last version received
+        self._listeners: Dict[str, List[Listener]] = defaultdict(list)
+        self._transport = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def version(self, resource: str) -> int:
+        return self._versions[resource]
+
+    def subscribe(self, resource: str, listener: Listener) -> None:
+        self._listeners[resource].append(listener)
+
+    def publish(self, resource: str) -> int:
+        """Bump the resource version, notify local listeners and broadcast to other workers."""
+        with self._lock:
+            version = max(time.time_ns(), self._versions[resource] + 1)
+            self._versions[resource] = version
+        self._dispatch(Change(resource, version, remote=False))
+        if self._transport is not None:
+            message = json.dumps({"o": self.origin, "r": resource, "v": version})
+            try:
+                self._transport.send(message)
+            except Exception:
+                logger.exception("Invalidation bus: failed to broadcast %s", resource)
+        return version
+
+    def _dispatch(self, change: Change) -> None:
+        for listener in self._listeners.get(change.resource, ()):
+            try:
+                listener(change)
+            except Exception:
+                logger.exception("Invalidation bus listener failed for %s", change.resource)
+
+    def _receive(self, message: str) -> None:
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        origin = data.get("o")
+        if origin == self.origin:
+            return  # our own echo; local listeners already ran in publish()
+        resource, version = data["r"], int(data["v"])
+        with self._lock:
+            if version <= self._seen.get((origin, resource), 0):
+                return
+            self._seen[(origin, resource)] = version
+            version = max(version, self._versions[resource] + 1)
+            self._versions[resource] = version
+        self._dispatch(Change(resource, version, remote=True))
+
+    def resync(self) -> None:
+        """Treat every subscribed resource as changed by another worker."""
+        for resource in list(self._listeners):
+            with self._lock:
+                version = max(time.time_ns(), self._versions[resource] + 1)
+                self._versions[resource] = version
+            self._dispatch(Change(resource, version, remote=True))
+
+    def start(self, engine) -> None:
+        """Pick a transport for the configured database and start listening."""
+        if self._thread is not None:
+            return
+        backend = settings.BUS_BACKEND
+        if backend == "auto":
+            dialect = engine.url.get_backend_name()
+            if dialect == "postgresql":
+                backend = "postgres"
+            elif dialect == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+                backend = "file"
+            else:
+                backend = "local"
+        if backend == "postgres":
+            self._transport = _PostgresTransport(engine, settings.BUS_CHANNEL)
+        elif backend == "file":
+            self._transport = _FileTransport(settings.BUS_FILE or f"{engine.url.database}.bus")
+        else:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def _listen(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                for message in self._transport.receive(settings.BUS_POLL_SECONDS):
+                    self._receive(message)
+                if self._transport.gap:
+                    self._transport.gap = False
+                    logger.info("Invalidation bus: possible gap in messages; resyncing caches")
+                    self.resync()
+                backoff = 0.5
+            except Exception:
+                logger.exception("Invalidation bus listener error; retrying in %.1fs", backoff)
+                self._transport.close()
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+bus = InvalidationBus()
@@ -8,6 +8,56 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     HIRING_ADMIN_KEY: str = "change-me-in-production"
+    STREAM_MAX_QUEUE: int = 64  # pending events per SSE client before it is dropped
+    STREAM_KEEPALIVE_SECONDS: int = 15
+    BUS_BACKEND: str = "auto"  # auto | postgres | file | local
+    BUS_CHANNEL: str = "hirefred_invalidation"
+    BUS_FILE: Optional[str] = None  # defaults to "<sqlite db>.bus"
+    BUS_POLL_SECONDS: float = 0.25
+    METRICS_MULTIPROC_DIR: Optional[str] = None  # shared dir so /metrics covers every worker
+    METRICS_FLUSH_SECONDS: float = 5.0
+    QUERY_LOG_MODE: str = "off"  # off | debug | sampled | raise (tests)
+    SLOW_QUERY_MS: float = 100.0
+    QUERY_LOG_SAMPLE_RATE: float = 0.05  # fraction of requests inspected in sampled mode
+    N_PLUS_ONE_THRESHOLD: int = 5  # identical statements per request before flagging
+    EXPORT_CHUNK_SIZE: int = 2000  # rows fetched per server-side cursor batch
+    ANALYTICS_ENGINE: str = "sql"  # sql (daily rollups) | numpy (in-memory columnar snapshot)
+    SLUG_INDEX_MAX_EXACT: int = 200_000  # published releases kept as an exact slug -> id map
+    SLUG_BLOOM_FP_RATE: float = 0.01  # false-positive rate of the bloom filter used above that
+    SLUG_INDEX_MAX_AGE_SECONDS: int = 300  # rebuild the slug index in the background once it is this old
+    MIGRATION_BATCH_SIZE: int = 1000  # rows per committed transaction during backfills
+    PORT: int = 8080
+    WEB_CONCURRENCY: Optional[int] = None  # worker processes; sized from CPUs and memory when unset
+    WORKER_MEMORY_MB: int = 256  # memory budgeted per worker when sizing from the memory limit
+    MAX_REQUESTS: int = 10_000  # recycle a worker after this many requests (0 = never)
+    MAX_REQUESTS_JITTER: int = 1_000  # random extra requests so workers don't all restart at once
+    GRACEFUL_TIMEOUT: int = 30  # seconds a worker may drain in-flight requests after SIGTERM
+    ADMISSION_CONTROL: bool = True  # adaptive per-route-class concurrency limits (503 when exceeded)
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    IDEMPOTENCY_TTL_HOURS: int = 24  # how long a stored response can be replayed
+    IDEMPOTENCY_CACHE_SIZE: int = 1024  # responses kept in the in-memory LRU in front of the table
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 1_048_576  # larger responses are not stored
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0  # how long a duplicate waits for the original before 409
+    FEED_MAX_ENTRIES: int = 50  # newest published releases in the changelog feeds
+    FEED_BASE_URL: Optional[str] = None  # absolute API URL for feed links; defaults to the request's
+    FEED_MAX_AGE_SECONDS: int = 60
+    REVISION_SNAPSHOT_INTERVAL: int = 20  # full snapshot every N revisions; reads apply at most N - 1 deltas
+    REVISION_COMPRESSION: str = "zlib"  # zlib | zstd (requires the optional zstandard package)
+    WEBHOOK_DELIVERY: bool = True  # run the outbound webhook delivery loop in this process
+    WEBHOOK_CONCURRENCY: int = 32  # deliveries in flight per worker
+    WEBHOOK_MAX_PER_HOST: int = 4  # concurrent deliveries to any one host, per worker (and its pool size)
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_MAX_ATTEMPTS: int = 8
+    WEBHOOK_BACKOFF_SECONDS: float = 2.0  # first retry delay; doubles per attempt, with jitter
+    WEBHOOK_POLL_SECONDS: float = 5.0  # outbox poll interval when nothing woke the loop
+    WEBHOOK_ALLOW_PRIVATE: bool = False  # allow loopback/private/link-local targets (local development only)
+    ARCHIVE_ENABLED: bool = False  # move cold applications and drafts to the archive tables in the background
+    ARCHIVE_INTERVAL_SECONDS: int = 3600  # time between archival passes
+    ARCHIVE_BATCH_SIZE: int = 500  # rows moved per committed transaction
+    ARCHIVE_APPLICATIONS_AFTER_DAYS: int = 365  # archive any application sent longer ago than this
+    ARCHIVE_TERMINAL_STATUSES: str = "rejected,ghosted"  # comma-separated; archived sooner, see below
+    ARCHIVE_TERMINAL_AFTER_DAYS: int = 30  # archive applications in a terminal status sent longer ago than this
+    ARCHIVE_DRAFTS_AFTER_DAYS: int = 180  # archive drafts not edited for this long
 
     class Config:
         env_file = ".env"
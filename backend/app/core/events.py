@@ -0,0 +1,104 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, Deque, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+class Subscriber:
+    """One connected stream client with its own bounded queue of encoded frames."""
+
+    __slots__ = ("frames", "ready", "dropped", "_max_queue")
+
+    def __init__(self, max_queue: int):
+        self.frames: Deque[bytes] = deque()
+        self.ready = asyncio.Event()
+        self.dropped = False
+        self._max_queue = max_queue
+
+    def push(self, frame: bytes) -> bool:
+        """Queue a frame; returns False (and marks the client dropped) when the queue is full."""
+        if len(self.frames) >= self._max_queue:
+            self.dropped = True
+            self.frames.clear()
+            self.ready.set()
+            return False
+        self.frames.append(frame)
+        self.ready.set()
+        return True
+
+
+def encode_event(event: str, data: Any) -> bytes:
+    """Encode a Server-Sent Events frame."""
+    payload = json.dumps(data, separators=(",", ":"), default=str)
+    return f"event: {event}\ndata: {payload}\n\n".encode()
+
+
+class EventBroker:
+    """
+    In-process pub/sub for the live hiring stream.
+
+    Subscribers live on the event loop; publish() is safe to call from the
+    threadpool that runs the sync write endpoints. Each event is encoded once
+    and the same bytes are fanned out to every subscriber. A subscriber whose
+    queue is full is dropped instead of slowing everyone else down.
+    """
+
+    def __init__(self, max_queue: int = 64):
+        self.max_queue = max_queue
+        self.subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.dropped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self.subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """Register a new subscriber. Must be called from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        sub = Subscriber(self.max_queue)
+        self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self.subscribers.discard(sub)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Fan an event out to every subscriber. Thread-safe; no-op without subscribers."""
+        loop = self._loop
+        if loop is None or not self.subscribers or loop.is_closed():
+            return
+        frame = encode_event(event, data)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(frame)
+        else:
+            loop.call_soon_threadsafe(self._fanout, frame)
+
+    def _fanout(self, frame: bytes) -> None:
+        self.published += 1
+        slow = [sub for sub in self.subscribers if not sub.push(frame)]
+        for sub in slow:
+            self.subscribers.discard(sub)
+        self.dropped += len(slow)
+
+
+broker = EventBroker(max_queue=settings.STREAM_MAX_QUEUE)
+
+registry.gauge("hiring_stream_subscribers", "Connected /api/hiring/stream clients.")
+registry.counter("hiring_stream_dropped_total", "Stream clients dropped for falling behind.")
+
+
+def _collect_stream_metrics():
+    registry.set("hiring_stream_subscribers", "", broker.subscriber_count)
+    registry.set("hiring_stream_dropped_total", "", broker.dropped)
+
+
+registry.add_collector(_collect_stream_metrics)
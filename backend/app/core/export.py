@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from app.core.config import settings
+
+# (column name, kind) where kind is one of: int, str, date, datetime, bool
+Columns = Sequence[Tuple[str, str]]
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _row_chunks(engine, statement) -> Iterator[List[tuple]]:
+    """Stream rows from a server-side cursor, EXPORT_CHUNK_SIZE at a time."""
+    with Session(engine) as session:
+        result = session.exec(statement.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE))
+        for partition in result.partitions():
+            yield partition
+
+
+def _csv(columns: Columns, chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    for rows in chunks:
+        writer.writerows([_plain(v) for v in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _ndjson(columns: Columns, chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    names = [name for name, _ in columns]
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(names, (_plain(v) for v in row))), separators=(",", ":")) + "\n" for row in rows
+        ).encode()
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file object whose contents are drained after each Parquet row group."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def _parquet(columns: Columns, chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"int": pa.int64(), "str": pa.string(), "date": pa.date32(), "datetime": pa.timestamp("us"), "bool": pa.bool_()}
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in chunks:
+            arrays = [
+                pa.array([v.value if isinstance(v, Enum) else v for v in values], type=field.type)
+                for values, field in zip(zip(*rows), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_response(engine, statement, columns: Columns, fmt: str, name: str) -> StreamingResponse:
+    """Stream `statement` (selecting `columns` in order) as CSV, NDJSON or Parquet."""
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of: {', '.join(FORMATS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires the optional pyarrow package")
+
+    encoder = {"csv": _csv, "ndjson": _ndjson, "parquet": _parquet}[fmt]
+    media_type, extension = FORMATS[fmt]
+    filename = f"{name}-{date.today().isoformat()}.{extension}"
+    return StreamingResponse(
+        encoder(columns, _row_chunks(engine, statement)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
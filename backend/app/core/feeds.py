@@ -0,0 +1,193 @@
+"""
+RSS 2.0, Atom and JSON Feed renderings of the public changelog.
+
+Each feed is kept as pre-serialized bytes with its ETag. Entries are rendered
+once into per-format fragments, so a publish, unpublish or edit of one
+release re-renders only that entry and re-joins the fragments; edits to
+drafts leave the feeds (and their ETags) untouched. Changes made by other
+workers arrive over the invalidation bus and trigger a full reload on the
+next read.
+"""
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from email.utils import formatdate
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from sqlmodel import Session, select
+
+from app.core.bus import Change, bus
+from app.core.config import settings
+from app.models import Release, VisibilityEnum
+
+FORMATS = {
+    "xml": "application/rss+xml; charset=utf-8",
+    "atom": "application/atom+xml; charset=utf-8",
+    "json": "application/feed+json; charset=utf-8",
+}
+
+
+class RenderedFeed(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: str  # HTTP date
+
+
+class _Entry(NamedTuple):
+    sort_key: Tuple[datetime, int]
+    updated: datetime
+    fragments: Dict[str, bytes]
+
+
+def _iso(moment: datetime) -> str:
+    return moment.replace(microsecond=0).isoformat() + "Z"
+
+
+def _http_date(moment: datetime) -> str:
+    return formatdate((moment - datetime(1970, 1, 1)).total_seconds(), usegmt=True)
+
+
+def _render_entry(release: Release, base_url: str) -> _Entry:
+    published = release.published_at or release.updated_at
+    url = f"{base_url}/public/releases/{release.slug}"
+    title = f"{release.title} ({release.version})"
+    return _Entry(
+        sort_key=(release.published_at or datetime.min, release.id),
+        updated=max(published, release.updated_at),
+        fragments={
+            "xml": (
+                f"<item><title>{escape(title)}</title><link>{escape(url)}</link>"
+                f'<guid isPermaLink="true">{escape(url)}</guid>'
+                f"<pubDate>{_http_date(published)}</pubDate>"
+                f"<description>{escape(release.content_md)}</description></item>"
+            ).encode(),
+            "atom": (
+                f"<entry><title>{escape(title)}</title><id>{escape(url)}</id>"
+                f'<link href="{escape(url)}"/>'
+                f"<published>{_iso(published)}</published><updated>{_iso(release.updated_at)}</updated>"
+                f'<content type="text">{escape(release.content_md)}</content></entry>'
+            ).encode(),
+            "json": json.dumps({
+                "id": url,
+                "url": url,
+                "title": title,
+                "content_text": release.content_md,
+                "date_published": _iso(published),
+                "date_modified": _iso(release.updated_at),
+            }).encode(),
+        },
+    )
+
+
+class FeedCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._base_url: Optional[str] = None
+        self._entries: Optional[Dict[int, _Entry]] = None  # None: reload on the next read
+        self._truncated = False  # more published releases exist beyond the newest FEED_MAX_ENTRIES
+        self._feeds: Dict[str, RenderedFeed] = {}
+        self._previous: Dict[str, RenderedFeed] = {}  # kept so unchanged bytes keep their Last-Modified
+
+    def get(self, fmt: str, engine, base_url: str) -> RenderedFeed:
+        base_url = settings.FEED_BASE_URL or base_url.rstrip("/")
+        with self._lock:
+            if self._entries is None or self._base_url != base_url:
+                self._load(engine, base_url)
+            feed = self._feeds.get(fmt)
+            if feed is None:
+                feed = self._feeds[fmt] = self._assemble(fmt)
+            return feed
+
+    def _load(self, engine, base_url: str):
+        with Session(engine) as session:
+            releases = session.exec(
+                select(Release)
+                .where(Release.visibility == VisibilityEnum.published)
+                .order_by(Release.published_at.desc(), Release.id.desc())
+                .limit(settings.FEED_MAX_ENTRIES + 1)
+            ).all()
+        self._base_url = base_url
+        self._truncated = len(releases) > settings.FEED_MAX_ENTRIES
+        self._entries = {r.id: _render_entry(r, base_url) for r in releases[:settings.FEED_MAX_ENTRIES]}
+        self._changed()
+
+    def _changed(self):
+        self._previous.update(self._feeds)
+        self._feeds = {}
+
+    def _assemble(self, fmt: str) -> RenderedFeed:
+        entries: List[_Entry] = sorted(self._entries.values(), key=lambda e: e.sort_key, reverse=True)
+        items = [entry.fragments[fmt] for entry in entries]
+        updated = max((entry.updated for entry in entries), default=datetime(1970, 1, 1))
+        title = escape(settings.PROJECT_NAME)
+        feed_url = f"{self._base_url}/public/releases/feed.{fmt}"
+        home_url = f"{self._base_url}/public/releases"
+        if fmt == "xml":
+            body = (
+                f'<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel>'
+                f"<title>{title}</title><link>{escape(home_url)}</link>"
+                f"<description>{title} release notes</description>"
+                f"<lastBuildDate>{_http_date(updated)}</lastBuildDate>"
+            ).encode() + b"".join(items) + b"</channel></rss>\n"
+        elif fmt == "atom":
+            body = (
+                f'<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">'
+                f"<title>{title}</title><id>{escape(feed_url)}</id>"
+                f'<link rel="self" href="{escape(feed_url)}"/><link href="{escape(home_url)}"/>'
+                f"<updated>{_iso(updated)}</updated>"
+            ).encode() + b"".join(items) + b"</feed>\n"
+        else:
+            header = json.dumps({
+                "version": "https://jsonfeed.org/version/1.1",
+                "title": settings.PROJECT_NAME,
+                "home_page_url": home_url,
+                "feed_url": feed_url,
+            })
+            body = header[:-1].encode() + b', "items": [' + b", ".join(items) + b"]}\n"
+
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        previous = self._previous.get(fmt)
+        if previous is not None and previous.etag == etag:
+            return previous
+        return RenderedFeed(body, etag, formatdate(time.time(), usegmt=True))
+
+    def release_changed(self, release: Release, deleted: bool = False):
+        """Fold one committed release write into the cached entries."""
+        with self._lock:
+            if self._entries is None:
+                return
+            listed = release.id in self._entries
+            published = not deleted and release.visibility == VisibilityEnum.published
+            if not listed and not published:
+                return  # draft edits never reach the feeds
+            if not published:
+                del self._entries[release.id]
+                if self._truncated:
+                    # An older release moves into the window; only the database knows which
+                    self._entries = None
+                    return
+            else:
+                self._entries[release.id] = _render_entry(release, self._base_url)
+                if len(self._entries) > settings.FEED_MAX_ENTRIES:
+                    oldest = min(self._entries, key=lambda i: self._entries[i].sort_key)
+                    del self._entries[oldest]
+                    self._truncated = True
+            self._changed()
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+
+
+feeds = FeedCache()
+
+
+def _on_remote_change(change: Change):
+    if change.remote:
+        feeds.invalidate()
+
+
+bus.subscribe("releases", _on_remote_change)
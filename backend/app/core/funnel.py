@@ -0,0 +1,186 @@
+"""
+Hiring funnel and response-latency rollups, maintained incrementally from the
+application history (see app.core.history).
+
+Each application contributes +1 to FunnelRollup(job_type, cohort week, stage)
+for every stage it has ever reached, and +1 to one ResponseLatencyRollup
+bucket once its first response has been observed. A change subtracts the old
+contribution and adds the new one, so reads never touch Application rows.
+"""
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlmodel import Session, select
+
+from app.core import history
+from app.core.history import ApplicationChange, Snapshot
+from app.core.rollups import apply_deltas
+from app.models import (
+    Application, ApplicationFunnel, ApplicationStatus, ArchivedApplication, CohortFunnel, FunnelCounts, FunnelRollup,
+    FunnelStats, ResponseLatencyRollup,
+)
+
+STAGES = ("applied", "responded", "interview", "offer")
+_BIT = {stage: 1 << i for i, stage in enumerate(STAGES)}
+
+# A status implies every earlier stage: an offer was also a response and an interview
+_STATUS_STAGES = {
+    ApplicationStatus.applied: ("applied",),
+    ApplicationStatus.no_response: ("applied",),
+    ApplicationStatus.ghosted: ("applied",),
+    ApplicationStatus.master: ("applied",),
+    ApplicationStatus.response: ("applied", "responded"),
+    ApplicationStatus.rejected: ("applied", "responded"),
+    ApplicationStatus.phone_screen: ("applied", "responded"),
+    ApplicationStatus.interview: ("applied", "responded", "interview"),
+    ApplicationStatus.offer: STAGES,
+}
+_STATUS_MASK = {status: sum(_BIT[s] for s in stages) for status, stages in _STATUS_STAGES.items()}
+
+CHUNK_SIZE = 500
+
+
+def cohort(d: date) -> str:
+    return d.strftime("%G-W%V")
+
+
+def _contribute(funnel: Counter, latency: Counter, snap: Snapshot, state: ApplicationFunnel, sign: int):
+    week = cohort(snap.date_sent)
+    for stage in STAGES:
+        if state.reached & _BIT[stage]:
+            funnel[(snap.job_type, week, stage)] += sign
+    if state.response_days is not None:
+        latency[(snap.job_type, state.response_days)] += sign
+
+
+def _chunks(values: List) -> Iterable[List]:
+    for i in range(0, len(values), CHUNK_SIZE):
+        yield values[i:i + CHUNK_SIZE]
+
+
+def apply_changes(session: Session, changes: List[ApplicationChange], today: Optional[date] = None):
+    """History handler: fold a batch of application changes into the rollups."""
+    today = today or date.today()
+    ids = sorted({c.application_id for c in changes})
+    states: Dict[int, ApplicationFunnel] = {}
+    for chunk in _chunks(ids):
+        states.update(
+            (s.application_id, s)
+            for s in session.exec(select(ApplicationFunnel).where(ApplicationFunnel.application_id.in_(chunk))).all()
+        )
+
+    funnel: Counter = Counter()
+    latency: Counter = Counter()
+    for change in changes:
+        state = states.get(change.application_id)
+        if state is not None and change.before is not None:
+            _contribute(funnel, latency, change.before, state, -1)
+        if change.after is None:
+            if state is not None:
+                session.delete(state)
+                del states[change.application_id]
+            continue
+        if state is None:
+            state = states[change.application_id] = ApplicationFunnel(application_id=change.application_id)
+            session.add(state)
+
+        newly_reached = _STATUS_MASK[change.after.status] & ~state.reached
+        # Days to response are only known when the transition is observed, not for rows created as answered
+        if newly_reached & _BIT["responded"] and change.kind == "updated":
+            state.response_days = max(0, (today - change.after.date_sent).days)
+        state.reached |= newly_reached
+        _contribute(funnel, latency, change.after, state, +1)
+
+    session.flush()
+    apply_deltas(session, FunnelRollup, ["job_type", "cohort", "stage"], funnel)
+    apply_deltas(session, ResponseLatencyRollup, ["job_type", "days"], latency)
+
+
+history.add_handler(apply_changes)
+
+
+def rebuild_if_empty(engine):
+    """Seed the rollups from current statuses (hot and archived) for applications that predate the event log."""
+    with Session(engine) as session:
+        if session.exec(select(ApplicationFunnel.application_id).limit(1)).first() is not None:
+            return
+        for model in (Application, ArchivedApplication):
+            last_id = 0
+            while True:
+                rows = session.exec(
+                    select(model.id, model.status, model.job_type, model.date_sent)
+                    .where(model.id > last_id).order_by(model.id).limit(CHUNK_SIZE)
+                ).all()
+                if not rows:
+                    break
+                apply_changes(session, [
+                    ApplicationChange(row[0], "created", None, Snapshot(ApplicationStatus(row[1]), row[2], row[3]))
+                    for row in rows
+                ])
+                session.commit()
+                last_id = rows[-1][0]
+
+
+def _counts(by_stage: Dict[str, int], model=FunnelCounts, **extra) -> FunnelCounts:
+    def rate(a: str, b: str) -> float:
+        return round(by_stage.get(b, 0) / by_stage[a] * 100, 1) if by_stage.get(a) else 0.0
+
+    return model(
+        **{stage: by_stage.get(stage, 0) for stage in STAGES},
+        applied_to_responded=rate("applied", "responded"),
+        responded_to_interview=rate("responded", "interview"),
+        interview_to_offer=rate("interview", "offer"),
+        applied_to_offer=rate("applied", "offer"),
+        **extra,
+    )
+
+
+def _median(histogram: Dict[int, int]) -> Optional[float]:
+    total = sum(histogram.values())
+    if not total:
+        return None
+
+    def nth(n: int) -> int:
+        seen = 0
+        for days in sorted(histogram):
+            seen += histogram[days]
+            if seen > n:
+                return days
+
+    return (nth((total - 1) // 2) + nth(total // 2)) / 2
+
+
+def funnel_stats(session: Session, weeks: int = 26, today: Optional[date] = None) -> FunnelStats:
+    """Read-only view over the rollup tables."""
+    today = today or date.today()
+    first_cohort = cohort(today - timedelta(weeks=weeks - 1))
+
+    overall: Counter = Counter()
+    by_job_type: Dict[str, Counter] = {}
+    by_cohort: Dict[str, Counter] = {}
+    for job_type, week, stage, count in session.exec(
+        select(FunnelRollup.job_type, FunnelRollup.cohort, FunnelRollup.stage, FunnelRollup.count)
+    ).all():
+        overall[stage] += count
+        by_job_type.setdefault(job_type.value, Counter())[stage] += count
+        if week >= first_cohort:
+            by_cohort.setdefault(week, Counter())[stage] += count
+
+    latency: Dict[str, Dict[int, int]] = {}
+    for job_type, days, count in session.exec(
+        select(ResponseLatencyRollup.job_type, ResponseLatencyRollup.days, ResponseLatencyRollup.count)
+    ).all():
+        if count:
+            latency.setdefault(job_type.value, {})[days] = count
+    all_latency: Counter = Counter()
+    for histogram in latency.values():
+        all_latency.update(histogram)
+
+    return FunnelStats(
+        overall=_counts(overall),
+        by_job_type={job_type: _counts(counts) for job_type, counts in sorted(by_job_type.items())},
+        by_cohort=[_counts(by_cohort[week], CohortFunnel, week=week) for week in sorted(by_cohort)],
+        median_days_to_response=_median(all_latency),
+        median_days_to_response_by_job_type={job_type: _median(h) for job_type, h in sorted(latency.items())},
+    )
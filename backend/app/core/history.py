@@ -0,0 +1,60 @@
+"""
+Append-only application history.
+
+Every write path calls record() inside its own transaction, before commit, so
+the event log and anything derived from it commit or roll back with the write.
+Derived state (funnel rollups, analytics) registers a handler instead of being
+called from each endpoint.
+"""
+from datetime import date
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from sqlmodel import Session
+
+from app.models import Application, ApplicationEvent, ApplicationStatus, JobType
+
+
+class Snapshot(NamedTuple):
+    status: ApplicationStatus
+    job_type: JobType
+    date_sent: date
+
+
+class ApplicationChange(NamedTuple):
+    application_id: int
+    kind: str  # created | updated | deleted
+    before: Optional[Snapshot]
+    after: Optional[Snapshot]
+
+
+Handler = Callable[[Session, List[ApplicationChange]], None]
+
+_handlers: List[Handler] = []
+
+
+def snapshot(app: Application) -> Snapshot:
+    return Snapshot(ApplicationStatus(app.status), JobType(app.job_type), app.date_sent)
+
+
+def add_handler(handler: Handler):
+    """Run `handler(session, changes)` for every recorded batch, inside the writing transaction."""
+    _handlers.append(handler)
+
+
+def record(session: Session, changes: Iterable[ApplicationChange]):
+    changes = list(changes)
+    if not changes:
+        return
+    session.add_all(
+        ApplicationEvent(
+            application_id=c.application_id,
+            kind=c.kind,
+            from_status=c.before.status if c.before else None,
+            to_status=c.after.status if c.after else None,
+            job_type=(c.after or c.before).job_type,
+            date_sent=(c.after or c.before).date_sent,
+        )
+        for c in changes
+    )
+    for handler in _handlers:
+        handler(session, changes)
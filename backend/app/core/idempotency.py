@@ -0,0 +1,322 @@
+"""
+Idempotency-Key support for POST, PUT and PATCH requests.
+
+The first request carrying a given key runs normally and its response is
+stored (IdempotencyRecord, with an in-memory LRU in front). A retry with the
+same key gets the stored response back, marked Idempotent-Replayed, without
+the handler running again; a retry that arrives while the first one is
+still running waits for it. Reusing a key with a different query string or
+body is a 422.
+
+Keys are scoped to the method, path and caller (Authorization / X-Admin-Key),
+kept for IDEMPOTENCY_TTL_HOURS, and 5xx responses are never stored, so a
+failed request can simply be retried with the same key.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import labels, registry
+from app.models import IdempotencyRecord
+
+METHODS = ("POST", "PUT", "PATCH")
+# Login/register responses carry tokens, which should not sit in a table
+EXCLUDED_PATHS = ("/auth/",)
+ABANDONED_AFTER = timedelta(minutes=5)  # a claim this old belongs to a worker that died mid-request
+POLL_SECONDS = 0.1
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: Optional[int]  # None: the original request is still running
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+class _LRU:
+    """Stored responses by key, each with the time its record expires (IDEMPOTENCY_TTL_HOURS)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._items: "OrderedDict[str, Tuple[StoredResponse, datetime]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        item, expires_at = entry
+        if expires_at <= datetime.utcnow():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return item
+
+    def put(self, key: str, item: StoredResponse, created_at: datetime):
+        self._items[key] = (item, _expires_at(created_at))
+        self._items.move_to_end(key)
+        while len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+
+def _expires_at(created_at: datetime) -> datetime:
+    return created_at + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+
+
+def storage_key(method: str, path: str, caller: bytes, idempotency_key: bytes) -> str:
+    return hashlib.sha256(b"\0".join([method.encode(), path.encode(), caller, idempotency_key])).hexdigest()
+
+
+def fingerprint(query_string: bytes, body: bytes) -> str:
+    """What a retry must repeat exactly: the query string and the body."""
+    return hashlib.sha256(query_string + b"\0" + body).hexdigest()
+
+
+def _stored(record: IdempotencyRecord) -> StoredResponse:
+    return StoredResponse(
+        record.fingerprint,
+        record.status_code,
+        [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(record.headers)],
+        record.body or b"",
+    )
+
+
+# ── Table access (runs on the threadpool) ─────────────────────────────────────
+
+class Store:
+    def __init__(self, engine):
+        self.engine = engine
+        self._last_purge = 0.0
+
+    def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        """Insert an in-progress claim; returns the existing record instead if the key is taken."""
+        self._maybe_purge()
+        with Session(self.engine) as session:
+            for _ in range(2):
+                session.add(IdempotencyRecord(key=key, fingerprint=fingerprint))
+                try:
+                    session.commit()
+                    return None
+                except IntegrityError:
+                    session.rollback()
+                existing = session.get(IdempotencyRecord, key)
+                if existing is None:
+                    continue  # released in between; claim again
+                abandoned = existing.status_code is None and existing.created_at < datetime.utcnow() - ABANDONED_AFTER
+                if abandoned or _expires_at(existing.created_at) <= datetime.utcnow():
+                    # Expired keys are free again even before the hourly purge removes them
+                    session.delete(existing)
+                    session.commit()
+                    continue
+                session.expunge(existing)
+                return existing
+            return session.get(IdempotencyRecord, key)
+
+    def load(self, key: str) -> Optional[IdempotencyRecord]:
+        with Session(self.engine) as session:
+            record = session.get(IdempotencyRecord, key)
+            if record is not None:
+                session.expunge(record)
+            return record
+
+    def complete(self, key: str, response: StoredResponse):
+        with Session(self.engine) as session:
+            record = session.get(IdempotencyRecord, key)
+            if record is None:
+                return
+            record.status_code = response.status_code
+            record.headers = json.dumps([[n.decode("latin-1"), v.decode("latin-1")] for n, v in response.headers])
+            record.body = response.body
+            session.add(record)
+            session.commit()
+
+    def release(self, key: str):
+        with Session(self.engine) as session:
+            session.exec(delete(IdempotencyRecord).where(IdempotencyRecord.key == key))
+            session.commit()
+
+    def _maybe_purge(self):
+        now = time.monotonic()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        cutoff = datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+        with Session(self.engine) as session:
+            session.exec(delete(IdempotencyRecord).where(IdempotencyRecord.created_at < cutoff))
+            session.commit()
+
+
+registry.counter("idempotency_requests_total", "Requests with an Idempotency-Key by outcome.")
+
+
+def _count(result: str):
+    registry.inc("idempotency_requests_total", labels(result=result))
+
+
+async def _send_json(send, status_code: int, detail: str):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _replay(send, response: StoredResponse):
+    await send({
+        "type": "http.response.start",
+        "status": response.status_code,
+        "headers": response.headers + [(b"idempotent-replayed", b"true")],
+    })
+    await send({"type": "http.response.body", "body": response.body})
+
+
+class IdempotencyMiddleware:
+    """Pure ASGI middleware; requests without an Idempotency-Key header pass straight through."""
+
+    def __init__(self, app, engine):
+        self.app = app
+        self.store = Store(engine)
+        self.cache = _LRU(settings.IDEMPOTENCY_CACHE_SIZE)
+        # Requests of this worker currently running under a key; duplicates wait on the event
+        self._running: Dict[str, asyncio.Event] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in METHODS or scope["path"].startswith(EXCLUDED_PATHS):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(b"idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > 255:
+            await _send_json(send, 400, "Idempotency-Key must be at most 255 characters")
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        request_fingerprint = fingerprint(scope.get("query_string", b""), body)
+        caller = headers.get(b"authorization", b"") + b"\0" + headers.get(b"x-admin-key", b"")
+        key = storage_key(scope["method"], scope["path"], caller, idempotency_key)
+
+        received_at = datetime.utcnow()  # before the claim, so a cached response never outlives its record
+        stored = await self._lookup(key, request_fingerprint)
+        if stored is None:
+            await self._run(scope, receive, body, send, key, request_fingerprint, received_at)
+        elif stored.fingerprint != request_fingerprint:
+            _count("mismatch")
+            await _send_json(send, 422, "Idempotency-Key was already used with a different query string or body")
+        elif stored.status_code is None:
+            _count("conflict")
+            await _send_json(send, 409, "A request with this Idempotency-Key is still in progress")
+        else:
+            _count("replayed")
+            await _replay(send, stored)
+
+    async def _lookup(self, key: str, fingerprint: str):
+        """
+        The stored response for `key`, a StoredResponse with status_code None if
+        the original is still running past IDEMPOTENCY_WAIT_SECONDS, or None once
+        this request holds the claim and should run the handler.
+        """
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            running = self._running.get(key)
+            if running is not None:
+                try:
+                    await asyncio.wait_for(running.wait(), max(deadline - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    return StoredResponse(fingerprint, None, [], b"")
+                continue
+
+            self._running[key] = event = asyncio.Event()
+            try:
+                record = await run_in_threadpool(self.store.claim, key, fingerprint)
+                while record is not None and record.status_code is None:
+                    # Claimed by another worker: poll until it finishes
+                    if record.fingerprint != fingerprint:
+                        return StoredResponse(record.fingerprint, None, [], b"")
+                    if time.monotonic() > deadline:
+                        return StoredResponse(fingerprint, None, [], b"")
+                    await asyncio.sleep(POLL_SECONDS)
+                    record = await run_in_threadpool(self.store.load, key)
+                    if record is None:
+                        record = await run_in_threadpool(self.store.claim, key, fingerprint)
+            except BaseException:
+                self._running.pop(key, None)
+                event.set()
+                raise
+            if record is None:
+                return None  # ours; _run clears _running when the response is done
+            self._running.pop(key, None)
+            event.set()
+            stored = _stored(record)
+            self.cache.put(key, stored, record.created_at)
+            return stored
+
+    async def _run(self, scope, receive, body: bytes, send, key: str, request_fingerprint: str, received_at: datetime):
+        start: dict = {}
+        chunks: List[bytes] = []
+        size = 0
+        sent_body = False
+
+        async def receive_once():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture(message):
+            nonlocal size
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if size <= settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                    chunks.append(message.get("body", b""))
+            await send(message)
+
+        stored = None
+        try:
+            await self.app(scope, receive_once, capture)
+            status_code = start.get("status", 500)
+            if status_code < 500 and size <= settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                stored = StoredResponse(
+                    request_fingerprint, status_code, list(start.get("headers", [])), b"".join(chunks),
+                )
+        finally:
+            try:
+                if stored is not None:
+                    await run_in_threadpool(self.store.complete, key, stored)
+                    self.cache.put(key, stored, received_at)
+                    _count("stored")
+                else:
+                    await run_in_threadpool(self.store.release, key)
+                    _count("not_stored")
+            finally:
+                event = self._running.pop(key, None)
+                if event is not None:
+                    event.set()
@@ -0,0 +1,399 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+RETIRED_FILE = "retired.json"  # counters and histograms of exited workers, in METRICS_MULTIPROC_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def merge(snapshots: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Sum snapshots series by series (histograms slot by slot) into a new snapshot."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snap in snapshots:
+        for name, series in snap.items():
+            target = merged.setdefault(name, {})
+            for key, value in series.items():
+                if isinstance(value, list):
+                    current = target.get(key)
+                    target[key] = value[:] if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    target[key] = target.get(key, 0.0) + value
+    return merged
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def labels(**values: Any) -> str:
+    """Render a Prometheus label set; the rendered string doubles as the storage key."""
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in values.items())
+
+
+class Registry:
+    """
+    Per-worker metric store.
+
+    Values are plain dicts keyed by metric name and rendered label string.
+    inc() and observe() run on every request and every SQL statement, from
+    the event loop and from threadpool threads, so they take no lock: each
+    thread writes only its own shard, and snapshot() sums the shards (copying
+    a dict or list is atomic under the GIL). A shard whose thread has ended
+    is folded into one retired shard. set() is rare (gauges refreshed by
+    collectors) and last-write-wins, so it keeps a single locked dict. Each
+    worker process only ever writes its own registry. With
+    METRICS_MULTIPROC_DIR set, every worker periodically dumps its snapshot
+    there and /metrics merges the files of all live workers plus the
+    counters and histograms retired from workers that have exited.
+    """
+
+    def __init__(self):
+        self._meta: Dict[str, Tuple[str, str, Optional[Tuple[float, ...]]]] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[str, Dict[str, Any]]]] = []
+        self._retired: Dict[str, Dict[str, Any]] = {}  # shards of threads that have ended
+        self._set_values: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()  # guards the shard list and set(), never inc()/observe()
+
+    def _declare(self, name: str, kind: str, help: str, buckets=None) -> None:
+        self._meta[name] = (kind, help, tuple(buckets) if buckets else None)
+
+    def counter(self, name: str, help: str) -> None:
+        self._declare(name, "counter", help)
+
+    def gauge(self, name: str, help: str) -> None:
+        self._declare(name, "gauge", help)
+
+    def histogram(self, name: str, help: str, buckets=LATENCY_BUCKETS) -> None:
+        self._declare(name, "histogram", help, buckets)
+
+    def _shard(self) -> Dict[str, Dict[str, Any]]:
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = self._local.values = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def inc(self, name: str, label_str: str = "", value: float = 1.0) -> None:
+        series = self._shard().setdefault(name, {})
+        series[label_str] = series.get(label_str, 0.0) + value
+
+    def set(self, name: str, label_str: str, value: float) -> None:
+        with self._lock:
+            self._set_values.setdefault(name, {})[label_str] = value
+
+    def observe(self, name: str, label_str: str, value: float) -> None:
+        buckets = self._meta[name][2]
+        series = self._shard().setdefault(name, {})
+        hist = series.get(label_str)
+        if hist is None:
+            # one slot per bucket, +Inf, then the running sum
+            hist = series[label_str] = [0] * (len(buckets) + 1) + [0.0]
+        hist[bisect_left(buckets, value)] += 1
+        hist[-1] += value
+
+    def reset(self) -> None:
+        """Drop every recorded value, e.g. those a forked worker inherited from its parent."""
+        with self._lock:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retired.clear()
+            self._set_values.clear()
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before a snapshot is taken."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        for collector in self._collectors:
+            collector()
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    # Nothing writes this shard any more
+                    self._retired = merge([self._retired, shard])
+            self._shards = live
+            shards = [self._retired] + [
+                {name: dict(series) for name, series in list(shard.items())} for _, shard in live
+            ]
+            set_values = {name: dict(series) for name, series in self._set_values.items()}
+        snapshot = merge(shards)
+        for name, series in set_values.items():
+            snapshot.setdefault(name, {}).update(series)
+        for name in self._meta:
+            snapshot.setdefault(name, {})
+        return snapshot
+
+    def render(self, snapshots: List[Dict[str, Dict[str, Any]]]) -> str:
+        merged = merge(snapshots)
+        lines: List[str] = []
+        for name, (kind, help, buckets) in self._meta.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in sorted(merged.get(name, {}).items()):
+                if kind != "histogram":
+                    lines.append(f"{name}{{{key}}} {value:g}" if key else f"{name} {value:g}")
+                    continue
+                sep = "," if key else ""
+                cumulative = 0
+                for bound, count in zip(buckets, value):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{key}{sep}le="{bound:g}"}} {cumulative}')
+                cumulative += value[len(buckets)]
+                lines.append(f'{name}_bucket{{{key}{sep}le="+Inf"}} {cumulative}')
+                lines.append(f"{name}_sum{{{key}}} {value[-1]:g}" if key else f"{name}_sum {value[-1]:g}")
+                lines.append(f"{name}_count{{{key}}} {cumulative}" if key else f"{name}_count {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    # ── Multiprocess support ──────────────────────────────────────────────────
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(settings.METRICS_MULTIPROC_DIR, f"{pid}.json")
+
+    def flush(self) -> None:
+        """Atomically write this worker's snapshot to the shared directory."""
+        _write_json(self._snapshot_path(os.getpid()), self.snapshot())
+
+    def worker_snapshots(self) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """{pid: snapshot} for this worker (current) and every other live worker (as last flushed)."""
+        snapshots = {os.getpid(): self.snapshot()}
+        if settings.METRICS_MULTIPROC_DIR:
+            own = self._snapshot_path(os.getpid())
+            for path in glob.glob(os.path.join(settings.METRICS_MULTIPROC_DIR, "*.json")):
+                try:
+                    pid = int(os.path.basename(path).split(".")[0])
+                except ValueError:
+                    continue  # the retired aggregate
+                if path == own:
+                    continue
+                if not _pid_alive(pid):
+                    self._retire(path)
+                    continue
+                try:
+                    with open(path) as f:
+                        snapshots[pid] = json.load(f)
+                except (OSError, ValueError):
+                    continue
+        return snapshots
+
+    def _retired_path(self) -> str:
+        return os.path.join(settings.METRICS_MULTIPROC_DIR, RETIRED_FILE)
+
+    def _retire(self, path: str) -> None:
+        """
+        Fold an exited worker's counters and histograms into the retired
+        aggregate and drop its file, so totals in /metrics never go down when
+        workers are recycled; its gauges describe a process that is gone.
+        """
+        import fcntl
+
+        with open(os.path.join(settings.METRICS_MULTIPROC_DIR, "retired.lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(path) as f:
+                        dead = json.load(f)
+                except FileNotFoundError:
+                    return  # another worker retired it first
+                except (OSError, ValueError):
+                    dead = {}
+                monotonic = {
+                    name: series for name, series in dead.items() if self._meta.get(name, ("gauge",))[0] != "gauge"
+                }
+                _write_json(self._retired_path(), merge([_read_json(self._retired_path()), monotonic]))
+                os.remove(path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def collect_all(self) -> str:
+        """Render metrics for this worker merged with every other live worker and the retired ones."""
+        snapshots = list(self.worker_snapshots().values())
+        if settings.METRICS_MULTIPROC_DIR:
+            snapshots.append(_read_json(self._retired_path()))
+        return self.render(snapshots)
+
+    def start_flusher(self) -> None:
+        if not settings.METRICS_MULTIPROC_DIR:
+            return
+        os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+
+        def run():
+            while True:
+                try:
+                    self.flush()
+                except Exception:
+                    # Keep flushing: a dead flusher would leave this worker's numbers stale in /metrics
+                    logger.exception("Flushing metrics to %s failed", settings.METRICS_MULTIPROC_DIR)
+                time.sleep(settings.METRICS_FLUSH_SECONDS)
+
+        threading.Thread(target=run, name="metrics-flusher", daemon=True).start()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_json(path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+registry = Registry()
+registry.counter("http_requests_total", "HTTP requests by route, method and status.")
+registry.gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+registry.histogram("http_request_duration_seconds", "HTTP request latency by route.")
+registry.histogram("http_response_size_bytes", "HTTP response body size by route.", SIZE_BUCKETS)
+registry.histogram("threadpool_wait_seconds", "Time from request arrival until its first threadpool task starts.")
+registry.histogram("db_queries_per_request", "Database statements issued per request.", COUNT_BUCKETS)
+registry.histogram("db_time_per_request_seconds", "Time spent in database statements per request.")
+registry.counter("db_queries_total", "Database statements executed, including outside requests.")
+registry.gauge("process_resident_memory_bytes", "Resident memory of each worker process.")
+registry.gauge("process_start_time_seconds", "Unix time each worker process started.")
+
+_process_started = time.time()
+
+
+def after_fork() -> None:
+    """Start a forked worker's metrics from zero, with its own start time."""
+    global _process_started
+    _process_started = time.time()
+    registry.reset()
+
+
+def _resident_memory() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        # Peak rather than current RSS where /proc is unavailable (kilobytes on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _collect_process() -> None:
+    pid = labels(pid=os.getpid())
+    registry.set("process_resident_memory_bytes", pid, _resident_memory())
+    registry.set("process_start_time_seconds", pid, _process_started)
+
+
+registry.add_collector(_collect_process)
+
+
+# ── Per-request accounting ────────────────────────────────────────────────────
+
+class RequestStats:
+    __slots__ = ("start", "queries", "db_seconds", "queue_wait")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.queue_wait: Optional[float] = None
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def mark_threadpool_start() -> None:
+    """Record threadpool wait for the current request the first time it runs on a worker thread."""
+    stats = current_request.get()
+    if stats is not None and stats.queue_wait is None:
+        stats.queue_wait = time.perf_counter() - stats.start
+
+
+def instrument_engine(engine) -> None:
+    """Count statements and time spent in the database via cursor execute events."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        registry.inc("db_queries_total")
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, size and DB usage per route template."""
+
+    def __init__(self, app, on_first_request: Optional[Callable[[], None]] = None):
+        self.app = app
+        self.on_first_request = on_first_request
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(time.perf_counter())
+        token = current_request.set(stats)
+        registry.inc("http_requests_in_flight")
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - stats.start
+            current_request.reset(token)
+            registry.inc("http_requests_in_flight", value=-1)
+            route = scope.get("route")
+            route_label = labels(route=getattr(route, "path", "unmatched"), method=scope["method"])
+            registry.inc("http_requests_total", f'{route_label},status="{status_code}"')
+            registry.observe("http_request_duration_seconds", route_label, elapsed)
+            registry.observe("http_response_size_bytes", route_label, size)
+            registry.observe("db_queries_per_request", route_label, stats.queries)
+            registry.observe("db_time_per_request_seconds", route_label, stats.db_seconds)
+            if stats.queue_wait is not None:
+                registry.observe("threadpool_wait_seconds", route_label, stats.queue_wait)
+            if self.on_first_request is not None:
+                callback, self.on_first_request = self.on_first_request, None
+                callback()
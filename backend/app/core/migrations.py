@@ -0,0 +1,234 @@
+"""
+Versioned schema management.
+
+Boot costs a single query when the database is already at SCHEMA_VERSION.
+Otherwise the upgrade runs create_all plus the online migrations that
+create_all cannot express. Every step is idempotent and commits in small
+id-range batches, so it can run against a live database without holding long
+table locks.
+"""
+import logging
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import Date, inspect, text
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlmodel import Session, SQLModel, select
+
+from app.core.config import settings
+from app.models import Application, ArchivedApplication, ArchivedRelease, Release, SchemaVersion
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a table, column or index is added or changed
+SCHEMA_VERSION = 6
+
+# SQLite tables whose ids must never be reused, with the archive table whose ids they must stay above
+AUTOINCREMENT_TABLES = [(Application, ArchivedApplication), (Release, ArchivedRelease)]
+
+# (table, column, fallback column used when the stored value is not a valid date)
+DATE_COLUMNS = [
+    ("application", "date_sent", "created_at"),
+    ("recruitercontact", "last_contact_date", None),
+]
+
+
+def _to_date(value: Any, fallback: Any) -> date:
+    """Parse a legacy free-form value the way the dashboard used to (date.fromisoformat)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        pass
+    if isinstance(fallback, datetime):
+        return fallback.date()
+    if fallback:
+        try:
+            return date.fromisoformat(str(fallback)[:10])
+        except ValueError:
+            pass
+    return date.today()
+
+
+def _batches(engine, table: str, column: str, fallback: Optional[str], where: str = "1 = 1"):
+    """Yield (connection, rows) per committed batch of (id, value, fallback), walking the primary key."""
+    last_id = 0
+    select_fallback = fallback or "NULL"
+    while True:
+        with engine.begin() as conn:
+            rows: List[tuple] = conn.execute(
+                text(f"SELECT id, {column}, {select_fallback} FROM {table} "
+                     f"WHERE id > :last_id AND {where} ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": settings.MIGRATION_BATCH_SIZE},
+            ).all()
+            if not rows:
+                return
+            yield conn, rows
+            last_id = rows[-1][0]
+
+
+def _normalize_in_place(engine, table: str, column: str, fallback: Optional[str]) -> int:
+    """
+    SQLite stores DATE as ISO text, so existing rows only need their invalid
+    values rewritten for the column to read back as dates.
+    """
+    fixed = 0
+    for conn, rows in _batches(engine, table, column, fallback):
+        updates = []
+        for row_id, value, fallback_value in rows:
+            parsed = _to_date(value, fallback_value).isoformat()
+            if value != parsed:
+                updates.append({"id": row_id, "value": parsed})
+        if updates:
+            conn.execute(text(f"UPDATE {table} SET {column} = :value WHERE id = :id"), updates)
+            fixed += len(updates)
+    return fixed
+
+
+def _convert_with_shadow(engine, table: str, column: str, fallback: Optional[str]) -> int:
+    """
+    Backfill a shadow DATE column in batches, then swap it in with one short
+    transaction that first catches up rows written while the backfill ran.
+    """
+    shadow = f"{column}__date"
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {shadow} DATE"))
+
+    converted = 0
+    for conn, rows in _batches(engine, table, column, fallback, where=f"{shadow} IS NULL"):
+        conn.execute(
+            text(f"UPDATE {table} SET {shadow} = :value WHERE id = :id"),
+            [{"id": row_id, "value": _to_date(value, fb)} for row_id, value, fb in rows],
+        )
+        converted += len(rows)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE"))
+        late = conn.execute(
+            text(f"SELECT id, {column}, {fallback or 'NULL'} FROM {table} WHERE {shadow} IS NULL")
+        ).all()
+        if late:
+            conn.execute(
+                text(f"UPDATE {table} SET {shadow} = :value WHERE id = :id"),
+                [{"id": row_id, "value": _to_date(value, fb)} for row_id, value, fb in late],
+            )
+        conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+        conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN {shadow} TO {column}"))
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+    return converted + len(late)
+
+
+def _create_index(engine, table: str, column: str):
+    index = f"ix_{table}_{column}"
+    if engine.dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} ({column})"))
+    else:
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})"))
+
+
+def migrate_date_columns(engine):
+    """Convert the legacy free-form date strings to native, indexed DATE columns."""
+    inspector = inspect(engine)
+    for table, column, fallback in DATE_COLUMNS:
+        if not inspector.has_table(table):
+            continue
+        if engine.dialect.name == "sqlite":
+            changed = _normalize_in_place(engine, table, column, fallback)
+        else:
+            columns = {c["name"]: c["type"] for c in inspector.get_columns(table)}
+            if isinstance(columns.get(column), Date):
+                changed = 0
+            else:
+                with engine.connect() as lock:
+                    # One worker migrates; the others wait here and then find nothing to do
+                    lock.execute(text("SELECT pg_advisory_lock(hashtext(:key))"), {"key": f"{table}.{column}"})
+                    try:
+                        columns = {c["name"]: c["type"] for c in inspect(engine).get_columns(table)}
+                        changed = 0 if isinstance(columns.get(column), Date) else \
+                            _convert_with_shadow(engine, table, column, fallback)
+                    finally:
+                        lock.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": f"{table}.{column}"})
+                        lock.commit()
+        _create_index(engine, table, column)
+        if changed:
+            logger.info("Migrated %d %s.%s values to DATE", changed, table, column)
+
+
+def _rebuild_with_autoincrement(engine, model, archived) -> bool:
+    """
+    SQLite can only add AUTOINCREMENT by rebuilding the table, so this copies
+    it in one transaction (SQLite deployments are single-host and small).
+    """
+    table = model.__table__
+    quote = engine.dialect.identifier_preparer.quote
+    name, shadow = quote(table.name), quote(f"{table.name}__new")
+    with engine.begin() as conn:
+        sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table.name}
+        ).scalar()
+        if sql is None or "AUTOINCREMENT" in sql.upper():
+            return False
+        ddl = str(CreateTable(table).compile(dialect=engine.dialect))
+        conn.execute(text(ddl.replace(f"CREATE TABLE {name} (", f"CREATE TABLE {shadow} (", 1)))
+        columns = ", ".join(quote(column.name) for column in table.columns)
+        conn.execute(text(f"INSERT INTO {shadow} ({columns}) SELECT {columns} FROM {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        conn.execute(text(f"ALTER TABLE {shadow} RENAME TO {name}"))
+        for index in table.indexes:
+            index.create(conn)
+        # Ids handed out before, now only left in the archive, must not come back either
+        conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name})
+        conn.execute(text(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT :name, MAX("
+            f"(SELECT COALESCE(MAX(id), 0) FROM {name}), "
+            f"(SELECT COALESCE(MAX(id), 0) FROM {quote(archived.__table__.name)}))"
+        ), {"name": table.name})
+    return True
+
+
+def migrate_autoincrement(engine):
+    """Stop SQLite from reusing the ids of deleted (or archived) rows; Postgres sequences never do."""
+    if engine.dialect.name != "sqlite":
+        return
+    for model, archived in AUTOINCREMENT_TABLES:
+        if _rebuild_with_autoincrement(engine, model, archived):
+            logger.info("Rebuilt %s with AUTOINCREMENT ids", model.__tablename__)
+
+
+def current_version(engine) -> Optional[int]:
+    try:
+        with Session(engine) as session:
+            return session.exec(select(SchemaVersion.version)).first()
+    except (OperationalError, ProgrammingError):
+        return None  # no schemaversion table yet
+
+
+def ensure_schema(engine) -> bool:
+    """Bring the database up to SCHEMA_VERSION; returns True when an upgrade ran."""
+    version = current_version(engine)
+    if version is not None and version >= SCHEMA_VERSION:
+        return False
+
+    from app.core import funnel, rollups
+
+    logger.info("Upgrading database schema from version %s to %d", version, SCHEMA_VERSION)
+    SQLModel.metadata.create_all(engine)
+    migrate_date_columns(engine)
+    migrate_autoincrement(engine)
+    # Derived tables created by this upgrade start empty; seed them from applications
+    rollups.rebuild_if_empty(engine)
+    funnel.rebuild_if_empty(engine)
+    with Session(engine) as session:
+        row = session.get(SchemaVersion, 1) or SchemaVersion(version=SCHEMA_VERSION)
+        row.version = SCHEMA_VERSION
+        row.applied_at = datetime.utcnow()
+        session.add(row)
+        session.commit()
+    return True
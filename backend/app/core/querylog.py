@@ -0,0 +1,192 @@
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Collapse expanded IN lists so "IN (?, ?)" and "IN (?, ?, ?)" share a shape
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))+\s*\)")
+# ... and tuple IN lists, once their rows are collapsed: "IN ((?), (?))" or SQLite's "IN (VALUES (?), (?))"
+_IN_ROWS = re.compile(r"(\bIN\s*\(\s*(?:VALUES\s*)?)\(\?\)(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_IN_KEYWORD = re.compile(r"\bIN\s*$", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryPatternError(RuntimeError):
+    """Raised in QUERY_LOG_MODE=raise when a request repeats the same statement shape."""
+
+
+def statement_shape(statement: str) -> str:
+    return _normalize(statement)[0]
+
+
+def _normalize(statement: str) -> Tuple[str, int]:
+    """Shape of a statement and the number of keys in its longest IN (...) list."""
+    widest = 0
+
+    def values(match) -> str:
+        nonlocal widest
+        if _IN_KEYWORD.search(match.string, max(0, match.start() - 8), match.start()):
+            widest = max(widest, match.group(0).count(",") + 1)
+        return "(?)"
+
+    def rows(match) -> str:
+        nonlocal widest
+        widest = max(widest, match.group(0).count("(?)"))
+        return match.group(1) + "(?)"
+
+    shape = _IN_LIST.sub(values, _WHITESPACE.sub(" ", statement).strip())
+    return _IN_ROWS.sub(rows, shape), widest
+
+
+def _short(value: Any, limit: int = 300) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class _RequestQueries:
+    __slots__ = ("scope", "shapes", "repeats")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.shapes: Counter = Counter()  # every execution
+        self.repeats: Counter = Counter()  # executions that may be one per item (not chunks of a batch)
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", self.scope.get("path", "?"))
+
+
+_current: ContextVar[Optional[_RequestQueries]] = ContextVar("querylog_request", default=None)
+
+
+class QueryReport:
+    """Recent slow statements and repeated statement shapes, for the admin endpoint."""
+
+    def __init__(self, max_slow: int = 100):
+        self.slow: deque = deque(maxlen=max_slow)
+        self.repeats: Dict[str, Dict[str, Any]] = {}
+        self.totals: Dict[str, List[int]] = {}  # shape -> [executions, requests]
+        self.requests_inspected = 0
+        self._lock = threading.Lock()
+
+    def record_slow(self, statement: str, parameters: Any, elapsed_ms: float, route: str) -> None:
+        self.slow.append({
+            "statement": statement,
+            "parameters": _short(parameters),
+            "ms": round(elapsed_ms, 2),
+            "route": route,
+            "at": time.time(),
+        })
+
+    def record_request(self, shapes: Counter, repeats: Counter, route: str) -> None:
+        """Fold one request's statement shapes into the totals and flag repeats."""
+        with self._lock:
+            self.requests_inspected += 1
+            for shape, count in shapes.items():
+                total = self.totals.setdefault(shape, [0, 0])
+                total[0] += count
+                total[1] += 1
+            for shape, count in repeats.items():
+                if count < settings.N_PLUS_ONE_THRESHOLD:
+                    continue
+                entry = self.repeats.setdefault(shape, {"requests": 0, "max_repeats": 0, "routes": set()})
+                entry["requests"] += 1
+                entry["max_repeats"] = max(entry["max_repeats"], count)
+                entry["routes"].add(route)
+
+    def summary(self) -> dict:
+        with self._lock:
+            repeats = sorted(
+                ({"shape": shape, **entry, "routes": sorted(entry["routes"])} for shape, entry in self.repeats.items()),
+                key=lambda r: (r["requests"], r["max_repeats"]),
+                reverse=True,
+            )
+            # Statements run on nearly every request (e.g. the auth user lookup) show up here
+            top = sorted(self.totals.items(), key=lambda item: item[1][0], reverse=True)[:20]
+        return {
+            "mode": settings.QUERY_LOG_MODE,
+            "slow_query_ms": settings.SLOW_QUERY_MS,
+            "n_plus_one_threshold": settings.N_PLUS_ONE_THRESHOLD,
+            "requests_inspected": self.requests_inspected,
+            "repeated_statements": repeats,
+            "top_statements": [
+                {"shape": shape, "executions": executions, "requests": requests} for shape, (executions, requests) in top
+            ],
+            "slow_queries": list(self.slow),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.slow.clear()
+            self.repeats.clear()
+            self.totals.clear()
+            self.requests_inspected = 0
+
+
+report = QueryReport()
+
+
+def instrument_engine(engine) -> None:
+    """Attach the slow-query log and repeated-statement detector to an engine."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("querylog_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["querylog_start"].pop()) * 1000
+        request = _current.get()
+        if request is None and settings.QUERY_LOG_MODE == "sampled":
+            return
+        route = request.route if request is not None else "-"
+
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            report.record_slow(statement, parameters, elapsed_ms, route)
+            logger.warning("Slow query (%.1f ms) on %s: %s params=%s", elapsed_ms, route, statement, _short(parameters))
+
+        if request is None or executemany:
+            return
+        shape, keys = _normalize(statement)
+        request.shapes[shape] += 1
+        if keys >= settings.N_PLUS_ONE_THRESHOLD:
+            return  # one chunk of a set-based batch, not a per-item lookup
+        request.repeats[shape] += 1
+        if request.repeats[shape] == settings.N_PLUS_ONE_THRESHOLD:
+            logger.warning("Repeated statement on %s (%d+ times): %s", route, settings.N_PLUS_ONE_THRESHOLD, shape)
+            if settings.QUERY_LOG_MODE == "raise":
+                raise QueryPatternError(
+                    f"{route} issued the same statement {settings.N_PLUS_ONE_THRESHOLD} times: {shape}"
+                )
+
+
+class QueryLogMiddleware:
+    """Scopes statement tracking to a request; in sampled mode only a fraction of requests are inspected."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (
+            settings.QUERY_LOG_MODE == "sampled" and random.random() >= settings.QUERY_LOG_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = _RequestQueries(scope)
+        token = _current.set(request)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            report.record_request(request.shapes, request.repeats, request.route)
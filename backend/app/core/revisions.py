@@ -0,0 +1,168 @@
+"""
+Revision history of release content.
+
+Every REVISION_SNAPSHOT_INTERVAL-th revision stores the full content; the
+ones in between store a line-based edit script against the revision before
+them. Both are compressed. Reading any revision therefore costs one snapshot
+plus at most REVISION_SNAPSHOT_INTERVAL - 1 small deltas, while long
+changelogs with small edits take a fraction of the space of full copies
+(see benchmarks/revisions.py).
+"""
+import difflib
+import json
+import logging
+import zlib
+from typing import List, Optional, Tuple, Union
+
+from sqlalchemy import delete, update
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.models import Release, ReleaseRevision
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+logger = logging.getLogger(__name__)
+
+# A delta is a list of ops: [start, end] copies lines start:end of the previous revision, a string inserts text
+Delta = List[Union[List[int], str]]
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd().ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 9)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd().ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def codec() -> str:
+    if settings.REVISION_COMPRESSION == "zstd":
+        if _zstd() is not None:
+            return "zstd"
+        logger.warning("REVISION_COMPRESSION=zstd but zstandard is not installed; using zlib")
+    return "zlib"
+
+
+def make_delta(old: str, new: str) -> Delta:
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops: Delta = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(old: str, delta: Delta) -> str:
+    old_lines = old.splitlines(keepends=True)
+    return "".join("".join(old_lines[op[0]:op[1]]) if isinstance(op, list) else op for op in delta)
+
+
+def encode(kind: str, content: str, previous: Optional[str], codec_name: str) -> bytes:
+    if kind == SNAPSHOT:
+        raw = content.encode()
+    else:
+        raw = json.dumps(make_delta(previous, content), separators=(",", ":")).encode()
+    return compress(raw, codec_name)
+
+
+def latest_number(session: Session, release_id: int) -> int:
+    return session.exec(
+        select(func.max(ReleaseRevision.number)).where(ReleaseRevision.release_id == release_id)
+    ).one() or 0
+
+
+def _lock_release(session: Session, release_id: int):
+    """Serialize revision writers of one release until the caller commits."""
+    if session.get_bind().dialect.name == "sqlite":
+        # No row locks in SQLite: any write takes the database write lock, so touch the row
+        session.exec(update(Release).where(Release.id == release_id).values(id=Release.id))
+    else:
+        session.exec(select(Release.id).where(Release.id == release_id).with_for_update())
+
+
+def record(session: Session, release_id: int, content: str, previous: Optional[str] = None):
+    """
+    Add the next revision of a release's content (the caller commits).
+    `previous` is the content being replaced; a release without history gets
+    it stored as revision 1 first, so edits to older releases keep their baseline.
+    The release row stays locked until commit, so concurrent edits get
+    consecutive numbers instead of colliding on the same one, and the delta
+    is built against the latest stored revision (which a concurrent edit may
+    have written after the caller read `previous`), never against `previous`.
+    """
+    _lock_release(session, release_id)
+    number = latest_number(session, release_id)
+    if number == 0:
+        if previous is not None:
+            _add(session, release_id, 1, previous, None)
+            number = 1
+        base = previous
+    else:
+        base = load(session, release_id, number)[1]
+    _add(session, release_id, number + 1, content, base)
+
+
+def _add(session: Session, release_id: int, number: int, content: str, previous: Optional[str]):
+    kind = SNAPSHOT if previous is None or (number - 1) % settings.REVISION_SNAPSHOT_INTERVAL == 0 else DELTA
+    codec_name = codec()
+    session.add(ReleaseRevision(
+        release_id=release_id,
+        number=number,
+        kind=kind,
+        codec=codec_name,
+        data=encode(kind, content, previous, codec_name),
+        size=len(content.encode()),
+    ))
+
+
+def load(session: Session, release_id: int, number: int) -> Optional[Tuple[ReleaseRevision, str]]:
+    """A revision and its content, rebuilt from the nearest snapshot, or None if it does not exist."""
+    base = session.exec(
+        select(func.max(ReleaseRevision.number)).where(
+            ReleaseRevision.release_id == release_id,
+            ReleaseRevision.number <= number,
+            ReleaseRevision.kind == SNAPSHOT,
+        )
+    ).one()
+    if base is None:
+        return None
+    chain = session.exec(
+        select(ReleaseRevision)
+        .where(ReleaseRevision.release_id == release_id, ReleaseRevision.number.between(base, number))
+        .order_by(ReleaseRevision.number)
+    ).all()
+    if not chain or chain[-1].number != number:
+        return None
+    content = decompress(chain[0].data, chain[0].codec).decode()
+    for revision in chain[1:]:
+        content = apply_delta(content, json.loads(decompress(revision.data, revision.codec)))
+    return chain[-1], content
+
+
+def diff(old: str, new: str, from_number: int, to_number: int) -> str:
+    return "".join(difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True),
+        fromfile=f"revision {from_number}", tofile=f"revision {to_number}",
+    ))
+
+
+def delete_all(session: Session, release_id: int):
+    session.exec(delete(ReleaseRevision).where(ReleaseRevision.release_id == release_id))
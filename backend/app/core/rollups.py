@@ -0,0 +1,136 @@
+"""
+Pre-aggregated application counts per day x status x job_type.
+
+DailyRollup is kept current from the application history (see
+app.core.history). Dashboard and time-series reads are composed from it, so
+their cost depends on the number of days in range, not on the number of
+applications.
+"""
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select
+
+from app.core import archive, history
+from app.core.history import ApplicationChange
+from app.models import Application, DailyRollup, Timeseries, TimeseriesPoint
+
+GRANULARITIES = ("day", "week", "month")
+GROUP_BY = ("status", "job_type")
+
+# INSERT ... ON CONFLICT DO UPDATE per supported dialect
+UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def apply_deltas(session: Session, model, key_names: List[str], deltas: Counter):
+    """Add `deltas` ({key tuple: n}) to the `count` column of a rollup table keyed by `key_names`."""
+    deltas = {key: n for key, n in deltas.items() if n}
+    if not deltas:
+        return
+    # One upsert (count = count + n) per key, so concurrent writers neither lose an update nor
+    # collide inserting the same new key; sorted so they lock keys in the same order
+    table = model.__table__
+    statement = UPSERT[session.get_bind().dialect.name](table)
+    statement = statement.on_conflict_do_update(
+        index_elements=key_names, set_={"count": table.c.count + statement.excluded.count},
+    )
+    session.connection().execute(
+        statement,
+        [{**dict(zip(key_names, key)), "count": n} for key, n in sorted(deltas.items())],
+    )
+
+
+def apply_changes(session: Session, changes: List[ApplicationChange]):
+    """History handler: move each changed application between day/status/job_type buckets."""
+    deltas: Counter = Counter()
+    for change in changes:
+        if change.before is not None:
+            deltas[(change.before.date_sent, change.before.status, change.before.job_type)] -= 1
+        if change.after is not None:
+            deltas[(change.after.date_sent, change.after.status, change.after.job_type)] += 1
+    apply_deltas(session, DailyRollup, ["day", "status", "job_type"], deltas)
+
+
+history.add_handler(apply_changes)
+
+
+def rebuild_if_empty(engine):
+    """Build the rollups with one INSERT ... SELECT (hot and archived applications) when the table is new."""
+    with Session(engine) as session:
+        if session.exec(select(DailyRollup.day).limit(1)).first() is not None:
+            return
+        # Archived applications still count
+        rows = archive.union(Application, lambda m: select(m.date_sent, m.status, m.job_type)).subquery()
+        session.exec(insert(DailyRollup).from_select(
+            ["day", "status", "job_type", "count"],
+            select(rows.c.date_sent, rows.c.status, rows.c.job_type, func.count())
+            .group_by(rows.c.date_sent, rows.c.status, rows.c.job_type),
+        ))
+        session.commit()
+
+
+def counts_by(session: Session, column_name: str, start: Optional[date] = None, end: Optional[date] = None) -> Dict:
+    """{value: applications} for one rollup column, optionally limited to a date_sent range."""
+    column = getattr(DailyRollup, column_name)
+    statement = select(column, func.sum(DailyRollup.count)).group_by(column).having(func.sum(DailyRollup.count) > 0)
+    if start:
+        statement = statement.where(DailyRollup.day >= start)
+    if end:
+        statement = statement.where(DailyRollup.day <= end)
+    return dict(session.exec(statement).all())
+
+
+def period_label(day: date, granularity: str) -> str:
+    if granularity == "week":
+        return day.strftime("%G-W%V")
+    if granularity == "month":
+        return day.strftime("%Y-%m")
+    return day.isoformat()
+
+
+def _periods(start: date, end: date, granularity: str) -> Iterator[str]:
+    if granularity == "day":
+        step = timedelta(days=1)
+    elif granularity == "week":
+        start -= timedelta(days=start.weekday())
+        step = timedelta(weeks=1)
+    else:
+        while start <= end:
+            yield period_label(start, granularity)
+            start = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return
+    while start <= end:
+        yield period_label(start, granularity)
+        start += step
+
+
+def timeseries(session: Session, start: date, end: date, granularity: str = "week",
+               group_by: Optional[str] = None) -> Timeseries:
+    """Applications per period in [start, end], zero-filled, optionally split by status or job_type."""
+    columns: Tuple = (DailyRollup.day,) if group_by is None else (DailyRollup.day, getattr(DailyRollup, group_by))
+    rows = session.exec(
+        select(*columns, func.sum(DailyRollup.count))
+        .where(DailyRollup.day >= start, DailyRollup.day <= end)
+        .group_by(*columns)
+    ).all()
+
+    buckets: Dict[str, Counter] = {period: Counter() for period in _periods(start, end, granularity)}
+    for row in rows:
+        day, count = row[0], row[-1]
+        if count:
+            key = row[1].value if group_by else "total"
+            buckets[period_label(day, granularity)][key] += count
+
+    return Timeseries(
+        start=start,
+        end=end,
+        granularity=granularity,
+        group_by=group_by,
+        points=[
+            TimeseriesPoint(period=period, total=sum(counts.values()), counts=dict(counts) if group_by else {})
+            for period, counts in buckets.items()
+        ],
+    )
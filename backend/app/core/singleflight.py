@@ -0,0 +1,82 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.metrics import labels, registry
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical computations into one.
+
+    The first caller for a key runs the computation; callers arriving while it
+    is in flight block until it finishes and get the same result (or
+    exception). Nothing is cached afterwards, so include a data version in the
+    key and results can never outlive the data they were computed from.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.computations = 0
+        self.shared = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.computations += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def group(name: str) -> SingleFlight:
+    """Get or create the named single-flight group."""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+registry.counter("singleflight_computations_total", "Computations actually run per single-flight group.")
+registry.counter("singleflight_shared_total", "Requests served from another request's in-flight computation.")
+
+
+def _collect():
+    for name, flight in _groups.items():
+        key = labels(group=name)
+        registry.set("singleflight_computations_total", key, flight.computations)
+        registry.set("singleflight_shared_total", key, flight.shared)
+
+
+registry.add_collector(_collect)
@@ -0,0 +1,169 @@
+"""
+In-memory index of published release slugs for /public/releases/{slug}.
+
+Up to SLUG_INDEX_MAX_EXACT published releases the index maps slug -> id
+exactly: hits resolve straight to a primary key and misses are answered
+without touching the database. Larger catalogs keep only a bloom filter,
+which still turns away (nearly) every unknown slug while positives fall back
+to the slug query.
+
+Misses are trusted without a query, so the index must not drift: other
+workers' writes arrive over the invalidation bus (which also triggers a
+rebuild whenever it may have missed messages), and as a backstop an index
+older than SLUG_INDEX_MAX_AGE_SECONDS is rebuilt in the background.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Set
+
+from sqlmodel import Session, select
+
+from app.core.bus import Change, bus
+from app.core.config import settings
+from app.core.metrics import labels, registry
+from app.db import engine
+from app.models import Release, VisibilityEnum
+
+UNKNOWN = object()  # lookup result: the index cannot tell, ask the database
+
+
+class BloomFilter:
+    """Fixed-size bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class SlugIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Optional[Dict[str, int]] = None
+        self._bloom: Optional[BloomFilter] = None
+        # Slugs published by more than one release, and those of them whose entry was removed
+        self._shared: Set[str] = set()
+        self._unsure: Set[str] = set()
+        self._ready = False
+        self._dirty = False  # a local write landed while a rebuild was reading
+        self._built_at = 0.0
+        self._refreshing = False
+
+    def rebuild(self, engine):
+        while True:
+            with self._lock:
+                self._dirty = False
+            with Session(engine) as session:
+                rows = session.exec(
+                    select(Release.slug, Release.id)
+                    .where(Release.visibility == VisibilityEnum.published, Release.slug.is_not(None))
+                    .order_by(Release.id.desc())
+                ).all()
+            if len(rows) <= settings.SLUG_INDEX_MAX_EXACT:
+                # Descending ids, so the lowest id wins when published slugs collide
+                ids, bloom = dict(rows), None
+                shared = {slug for slug, count in Counter(slug for slug, _ in rows).items() if count > 1}
+            else:
+                ids, bloom, shared = None, BloomFilter(2 * len(rows), settings.SLUG_BLOOM_FP_RATE), set()
+                for slug, _ in rows:
+                    bloom.add(slug)
+            with self._lock:
+                if self._dirty:
+                    continue
+                self._ids, self._bloom = ids, bloom
+                self._shared, self._unsure = shared, set()
+                self._ready = True
+                self._built_at = time.monotonic()
+                return
+
+    def _refresh(self):
+        try:
+            self.rebuild(engine)
+        finally:
+            self._refreshing = False
+
+    def _maybe_refresh(self):
+        if self._refreshing or time.monotonic() - self._built_at < settings.SLUG_INDEX_MAX_AGE_SECONDS:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="slug-index-refresh", daemon=True).start()
+
+    def lookup(self, slug: str):
+        """Release id for a published slug, None if it is certainly not published, or UNKNOWN."""
+        if self._ready:
+            self._maybe_refresh()
+        if not self._ready:
+            result = UNKNOWN
+        elif self._ids is not None:
+            result = UNKNOWN if slug in self._unsure else self._ids.get(slug)
+        else:
+            result = UNKNOWN if slug in self._bloom else None
+        registry.inc("slug_index_lookups_total", labels(
+            result="fallback" if result is UNKNOWN else "miss" if result is None else "hit"
+        ))
+        return result
+
+    def discard(self, slug: Optional[str], release_id: int):
+        if not slug:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._ids is not None and self._ids.get(slug) == release_id:
+                del self._ids[slug]
+                if slug in self._shared:
+                    self._unsure.add(slug)
+            # Bloom filters cannot forget; the stale positive just falls back to the database
+
+    def add(self, slug: Optional[str], release_id: int):
+        if not slug:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._ids is not None:
+                # An unsure slug may still belong to a lower id; it keeps using the database
+                if slug not in self._unsure:
+                    current = self._ids.get(slug)
+                    if current is not None and current != release_id:
+                        self._shared.add(slug)
+                    self._ids[slug] = release_id if current is None else min(current, release_id)
+            elif self._bloom is not None:
+                self._bloom.add(slug)
+
+    def invalidate(self):
+        with self._lock:
+            self._ready = False
+
+
+index = SlugIndex()
+
+registry.counter("slug_index_lookups_total", "Public slug lookups by outcome (hit, miss without a query, fallback).")
+
+
+def _on_remote_change(change: Change):
+    """Another worker changed releases: fall back to the database until the rebuild lands."""
+    if change.remote:
+        index.invalidate()
+        index.rebuild(engine)
+
+
+bus.subscribe("releases", _on_remote_change)
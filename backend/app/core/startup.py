@@ -0,0 +1,72 @@
+"""
+Startup profiling.
+
+Each boot records how long its phases took, measured from the first import of
+the app package, plus the time until the first response was sent. The report
+is logged once startup completes, exported as gauges and served at
+/api/admin/startup, together with which of the lazily imported dependencies
+have been loaded so far.
+"""
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from app import STARTED
+from app.core.metrics import labels, registry
+
+# Imported on first use only; loaded here means something pulled them in at boot
+LAZY_MODULES = ("jose", "passlib", "smtplib", "email.mime", "numpy", "pyarrow")
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.ready: Optional[float] = None
+        self.first_request: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def mark_ready(self):
+        # Exported here rather than per phase: a preloading server imports in the parent
+        # process, and the gauges belong to the worker that finished starting up
+        self.ready = time.perf_counter() - STARTED
+        for name, seconds in self.phases.items():
+            registry.set("app_startup_phase_seconds", labels(phase=name, pid=os.getpid()), seconds)
+        registry.set("app_startup_seconds", labels(pid=os.getpid()), self.ready)
+        logger.info(
+            "Started in %.0f ms (%s)", self.ready * 1000,
+            ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()),
+        )
+
+    def mark_first_request(self):
+        if self.first_request is None:
+            self.first_request = time.perf_counter() - STARTED
+            registry.set("app_time_to_first_request_seconds", labels(pid=os.getpid()), self.first_request)
+
+    def report(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "ready_ms": round(self.ready * 1000, 1) if self.ready is not None else None,
+            "first_request_ms": round(self.first_request * 1000, 1) if self.first_request is not None else None,
+            "modules_loaded": len(sys.modules),
+            "lazy_modules": {name: name in sys.modules for name in LAZY_MODULES},
+        }
+
+
+profile = StartupProfile()
+
+registry.gauge("app_startup_phase_seconds", "Duration of each startup phase of this worker.")
+registry.gauge("app_startup_seconds", "Time from the first app import until startup completed.")
+registry.gauge("app_time_to_first_request_seconds", "Time from the first app import until the first response was sent.")
@@ -0,0 +1,381 @@
+"""
+Outbound webhooks.
+
+Events are written to the WebhookDelivery outbox inside the transaction that
+causes them, so a delivery exists if and only if the change committed. A
+background loop on each worker's event loop claims due rows (a short lease
+via a conditional UPDATE, so workers never send the same attempt twice) and
+POSTs them over keep-alive connections pooled per target host. A worker only
+claims as many rows for a host as it can send right away, so none waits past
+its lease. WEBHOOK_MAX_PER_HOST is a per-worker cap: a host can see up to
+workers x WEBHOOK_MAX_PER_HOST concurrent requests in total.
+
+Every request carries X-Webhook-Id, X-Webhook-Event and
+X-Webhook-Signature: "t=<unix time>,v1=<hex HMAC-SHA256 of '<t>.<body>'>"
+keyed with the subscription secret. 2xx marks a delivery done; network
+errors, timeouts, 408, 429 and 5xx are retried with jittered exponential
+backoff up to WEBHOOK_MAX_ATTEMPTS; any other response (redirects included,
+they are never followed) fails it for good.
+
+Targets must resolve to public addresses only (unless WEBHOOK_ALLOW_PRIVATE):
+the URL is checked when the subscription is created and the host is resolved
+and checked again before every attempt, which then connects to that checked
+address, so a DNS answer that changes in between cannot point it inwards.
+Connections are pooled per host name, never per address, so a TLS connection
+verified for one name is never reused for another name on the same address.
+"""
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import random
+import socket
+import time
+from collections import Counter, OrderedDict
+from functools import partial
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import SplitResult, urlsplit
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import labels, registry
+from app.models import WebhookDelivery, WebhookSubscription
+
+MAX_BACKOFF_SECONDS = 3600
+RETRY_STATUSES = {408, 429}
+CLAIM_WINDOW = 4  # due rows read per free slot, so rows of busy hosts can be skipped
+MAX_CLIENTS = 256  # per-host clients kept open; idle ones past this are closed
+
+logger = logging.getLogger(__name__)
+
+registry.counter("webhook_attempts_total", "Webhook delivery attempts by outcome (delivered, retry, failed).")
+registry.histogram("webhook_attempt_duration_seconds", "Duration of webhook delivery attempts.")
+registry.gauge("webhook_in_flight", "Webhook deliveries currently being sent by this worker.")
+
+
+class UnsafeURL(ValueError):
+    """A webhook URL that is malformed or points at a non-public address."""
+
+
+def _check_address(address: str):
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    if (ip.is_loopback or ip.is_private or ip.is_link_local or ip.is_multicast or ip.is_reserved
+            or ip.is_unspecified or not ip.is_global):
+        raise UnsafeURL(f"Webhook host resolves to a non-public address ({ip})")
+
+
+def parse_url(url: str) -> Tuple[SplitResult, int]:
+    """The split URL and its port; raises UnsafeURL unless it is an absolute http(s) URL."""
+    try:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError as e:
+        raise UnsafeURL(f"Invalid webhook URL: {e}")
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise UnsafeURL("Webhook URL must be an absolute http(s) URL")
+    if parts.username or parts.password:
+        raise UnsafeURL("Webhook URL must not contain credentials")
+    return parts, port
+
+
+def check_addresses(addresses: List[str]) -> str:
+    """The first address to connect to, once every one of them is checked."""
+    if not addresses:
+        raise UnsafeURL("Webhook host does not resolve")
+    if not settings.WEBHOOK_ALLOW_PRIVATE:
+        for address in addresses:
+            _check_address(address)
+    return addresses[0]
+
+
+def host_key(url: str) -> str:
+    """Scheme and netloc of a webhook URL: the unit of per-host limits and connection pools."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+def validate_url(url: str) -> str:
+    """Resolve a webhook URL's host (blocking) and reject anything but public addresses."""
+    parts, port = parse_url(url)
+    try:
+        infos = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        raise UnsafeURL("Webhook host does not resolve")
+    return check_addresses([info[4][0] for info in infos])
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def enqueue(session: Session, user_id: int, event: str, data: dict) -> int:
+    """Add an outbox row per active subscription of `user_id` (the caller commits)."""
+    subscriptions = session.exec(
+        select(WebhookSubscription.id).where(
+            WebhookSubscription.user_id == user_id, WebhookSubscription.is_active == True  # noqa: E712
+        )
+    ).all()
+    payload = json.dumps({"event": event, "created_at": datetime.utcnow().isoformat() + "Z", "data": data},
+                         default=str)
+    session.add_all(
+        WebhookDelivery(subscription_id=subscription_id, event=event, payload=payload)
+        for subscription_id in subscriptions
+    )
+    return len(subscriptions)
+
+
+def backoff(attempts: int) -> float:
+    """Delay before attempt `attempts + 1`: exponential, capped, with jitter in [50%, 100%]."""
+    delay = min(MAX_BACKOFF_SECONDS, settings.WEBHOOK_BACKOFF_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class _Claimed:
+    __slots__ = ("id", "event", "payload", "attempts", "url", "secret", "host")
+
+    def __init__(self, delivery: WebhookDelivery, subscription: WebhookSubscription):
+        self.id = delivery.id
+        self.event = delivery.event
+        self.payload = delivery.payload.encode()
+        self.attempts = delivery.attempts + 1
+        self.url = subscription.url
+        self.secret = subscription.secret
+        self.host = host_key(subscription.url)
+
+
+class DeliveryEngine:
+    def __init__(self, engine):
+        self.engine = engine
+        self._clients: "OrderedDict[str, object]" = OrderedDict()  # host_key -> httpx.AsyncClient
+        self._busy: Counter = Counter()  # host_key -> deliveries in flight
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    # ── Outbox access (threadpool) ────────────────────────────────────────────
+
+    def _claim(self, limit: int, busy: Optional[Dict[str, int]] = None) -> List[_Claimed]:
+        """
+        Lease up to `limit` due rows, skipping rows of hosts that already have
+        WEBHOOK_MAX_PER_HOST deliveries in flight (`busy`) or claimed here.
+        """
+        busy = Counter(busy or {})
+        now = datetime.utcnow()
+        # Long enough for every attempt to finish; a worker that dies mid-send is retried after it
+        lease = now + timedelta(seconds=settings.WEBHOOK_TIMEOUT_SECONDS * 3)
+        claimed = []
+        with Session(self.engine) as session:
+            # Rows that used up their attempts without being finished (the worker died or the
+            # attempt crashed) are never claimed again
+            session.exec(
+                update(WebhookDelivery)
+                .where(WebhookDelivery.status == "pending", WebhookDelivery.next_attempt_at <= now,
+                       WebhookDelivery.attempts >= settings.WEBHOOK_MAX_ATTEMPTS)
+                .values(status="failed", last_error="Attempts exhausted without a result")
+            )
+            rows = session.exec(
+                select(WebhookDelivery, WebhookSubscription)
+                .join(WebhookSubscription, WebhookSubscription.id == WebhookDelivery.subscription_id)
+                .where(WebhookDelivery.status == "pending", WebhookDelivery.next_attempt_at <= now,
+                       WebhookDelivery.attempts < settings.WEBHOOK_MAX_ATTEMPTS)
+                .order_by(WebhookDelivery.next_attempt_at)
+                .limit(limit * CLAIM_WINDOW)
+            ).all()
+            for delivery, subscription in rows:
+                if len(claimed) == limit:
+                    break
+                # Taken before the UPDATE, which also bumps attempts on the loaded row
+                candidate = _Claimed(delivery, subscription)
+                if busy[candidate.host] >= settings.WEBHOOK_MAX_PER_HOST:
+                    continue  # left for a later poll or another worker instead of queueing past its lease
+                won = session.exec(
+                    update(WebhookDelivery)
+                    .where(WebhookDelivery.id == delivery.id, WebhookDelivery.status == "pending",
+                           WebhookDelivery.next_attempt_at == delivery.next_attempt_at)
+                    .values(next_attempt_at=lease, attempts=WebhookDelivery.attempts + 1)
+                ).rowcount
+                if won:
+                    claimed.append(candidate)
+                    busy[candidate.host] += 1
+            session.commit()
+        return claimed
+
+    def _finish(self, delivery: _Claimed, status: str, response_status: Optional[int], error: Optional[str],
+                retry_after: Optional[float] = None):
+        values = {"status": status, "response_status": response_status, "last_error": error}
+        if status == "delivered":
+            values["delivered_at"] = datetime.utcnow()
+        elif status == "pending":
+            delay = max(backoff(delivery.attempts), retry_after or 0)
+            values["next_attempt_at"] = datetime.utcnow() + timedelta(seconds=delay)
+        with Session(self.engine) as session:
+            session.exec(update(WebhookDelivery).where(WebhookDelivery.id == delivery.id).values(**values))
+            session.commit()
+
+    # ── Delivery ──────────────────────────────────────────────────────────────
+
+    async def _client_for(self, host: str):
+        """The connection pool of one target host (created on first use)."""
+        import httpx
+
+        client = self._clients.get(host)
+        if client is None:
+            client = self._clients[host] = httpx.AsyncClient(
+                timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=settings.WEBHOOK_MAX_PER_HOST,
+                                    max_keepalive_connections=settings.WEBHOOK_MAX_PER_HOST),
+                follow_redirects=False,
+            )
+            excess = len(self._clients) - MAX_CLIENTS
+            if excess > 0:
+                # Least recently used first; clients with deliveries in flight stay
+                for idle in [key for key in self._clients if key not in self._busy][:excess]:
+                    await self._clients.pop(idle).aclose()
+        self._clients.move_to_end(host)
+        return client
+
+    async def _send(self, delivery: _Claimed, headers: Dict[str, str]):
+        """POST to the checked address of the URL's host, keeping Host and TLS SNI on the name."""
+        parts, port = parse_url(delivery.url)
+        infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+        address = check_addresses([info[4][0] for info in infos])
+        host = f"[{address}]" if ":" in address else address
+        url = parts._replace(netloc=f"{host}:{port}").geturl()
+        extensions = {"sni_hostname": parts.hostname} if parts.scheme == "https" else {}
+        # Pooled by host name: a connection to this address verified for another name is never reused
+        client = await self._client_for(delivery.host)
+        return await client.post(
+            url, content=delivery.payload, headers={**headers, "Host": parts.netloc}, extensions=extensions,
+        )
+
+    async def _deliver(self, delivery: _Claimed):
+        import httpx
+
+        response_status = retry_after = None
+        error = None
+        permanent = False
+        start = time.perf_counter()
+        registry.inc("webhook_in_flight")
+        try:
+            timestamp = int(time.time())
+            headers = {
+                "Content-Type": "application/json",
+                "User-Agent": f"{settings.PROJECT_NAME}-Webhooks",
+                "X-Webhook-Id": str(delivery.id),
+                "X-Webhook-Event": delivery.event,
+                "X-Webhook-Signature": sign(delivery.secret, timestamp, delivery.payload),
+            }
+            response = await self._send(delivery, headers)
+            response_status = response.status_code
+            if response.headers.get("retry-after", "").isdigit():
+                retry_after = float(response.headers["retry-after"])
+        except UnsafeURL as e:
+            error, permanent = str(e), True
+        except (httpx.HTTPError, OSError) as e:
+            error = f"{type(e).__name__}: {e}"[:500]
+        except Exception as e:
+            # Anything else (a malformed URL or header) will fail the same way next time
+            logger.exception("Webhook delivery %s crashed", delivery.id)
+            error, permanent = f"{type(e).__name__}: {e}"[:500], True
+        finally:
+            registry.inc("webhook_in_flight", value=-1)
+            registry.observe("webhook_attempt_duration_seconds", "", time.perf_counter() - start)
+
+        if response_status is not None and 200 <= response_status < 300:
+            outcome = "delivered"
+        elif not permanent and (response_status is None or response_status >= 500
+                                or response_status in RETRY_STATUSES) \
+                and delivery.attempts < settings.WEBHOOK_MAX_ATTEMPTS:
+            outcome = "retry"
+        else:
+            outcome = "failed"
+        if response_status is not None and outcome != "delivered":
+            error = f"HTTP {response_status}"
+            if 300 <= response_status < 400:
+                error += " (redirects are not followed)"
+        registry.inc("webhook_attempts_total", labels(outcome=outcome))
+        await run_in_threadpool(
+            self._finish, delivery, "pending" if outcome == "retry" else outcome, response_status, error, retry_after,
+        )
+
+    async def _run(self):
+        while True:
+            capacity = settings.WEBHOOK_CONCURRENCY - len(self._tasks)
+            claimed = []
+            if capacity > 0:
+                try:
+                    claimed = await run_in_threadpool(self._claim, capacity, dict(self._busy))
+                except Exception:
+                    logger.exception("Webhook outbox poll failed")
+            for delivery in claimed:
+                self._busy[delivery.host] += 1
+                task = asyncio.create_task(self._deliver(delivery))
+                self._tasks.add(task)
+                task.add_done_callback(partial(self._done, delivery.host))
+            if len(claimed) == capacity and capacity > 0:
+                continue  # more may be due right away
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.WEBHOOK_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def _done(self, host: str, task: asyncio.Task):
+        self._tasks.discard(task)
+        self._busy[host] -= 1
+        if self._busy[host] <= 0:
+            del self._busy[host]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Webhook delivery crashed", exc_info=task.exception())
+        self._wake.set()  # a slot freed up
+
+    def start(self):
+        """Start the delivery loop on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._runner = self._loop.create_task(self._run())
+
+    def wake(self):
+        """Check the outbox now (safe to call from any thread, e.g. right after a commit)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def stop(self, grace: float = 5.0):
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        if self._tasks:
+            # Unfinished attempts keep their lease and are retried once it expires
+            await asyncio.wait(self._tasks, timeout=grace)
+            for task in self._tasks:
+                task.cancel()
+        while self._clients:
+            await self._clients.popitem()[1].aclose()
+        self._runner = self._loop = None
+
+
+delivery = None  # DeliveryEngine, created by start()
+
+
+def start(engine):
+    global delivery
+    delivery = DeliveryEngine(engine)
+    delivery.start()
+
+
+def wake():
+    if delivery is not None:
+        delivery.wake()
@@ -1,12 +1,19 @@
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import Session, create_engine
 from app.core.config import settings
+from app.core import querylog
+from app.core.metrics import instrument_engine, mark_threadpool_start
+from app.core.migrations import ensure_schema
 
 connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 engine = create_engine(settings.DATABASE_URL, echo=False, connect_args=connect_args)
+instrument_engine(engine)
+if settings.QUERY_LOG_MODE != "off":
+    querylog.instrument_engine(engine)
 
 def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+    ensure_schema(engine)
 
 def get_session():
+    mark_threadpool_start()
     with Session(engine) as session:
         yield session
@@ -1,10 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from app.core.startup import profile
 
 try:
-    from app.core.config import settings
-    from app.db import create_db_and_tables
-    from app.routers import auth, releases, public, portfolio, hiring
+    with profile.phase("imports"):
+        from app.core.config import settings
+        from app.db import create_db_and_tables, engine
+        from app.core import analytics, archive
+        from app.core import webhooks
+        from app.core.bus import bus
+        from app.core.slugs import index as slug_index
+        from app.core.admission import AdmissionMiddleware
+        from app.core.idempotency import IdempotencyMiddleware
+        from app.core.metrics import MetricsMiddleware, registry
+        from app.core.querylog import QueryLogMiddleware
+        from app.routers import auth, releases, public, portfolio, hiring, admin, webhooks as webhooks_router
 except Exception as e:
     import sys
     print(f"Import error: {e}", file=sys.stderr)
@@ -16,6 +28,13 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Adaptive load shedding (innermost, so rejections still carry CORS headers and are counted)
+if settings.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionMiddleware)
+
+# Idempotency-Key replays (outside admission control, so a replay is never shed)
+app.add_middleware(IdempotencyMiddleware, engine=engine)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -33,17 +52,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Slow-query log and repeated-statement detector (opt-in)
+if settings.QUERY_LOG_MODE != "off":
+    app.add_middleware(QueryLogMiddleware)
+
+# Request metrics (outermost so it sees every response)
+app.add_middleware(MetricsMiddleware, on_first_request=profile.mark_first_request)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(releases.router)
 app.include_router(public.router)
 app.include_router(portfolio.router)
 app.include_router(hiring.router)
+app.include_router(admin.router)
+app.include_router(webhooks_router.router)
 
 @app.on_event("startup")
 def on_startup():
-    create_db_and_tables()
+    with profile.phase("schema"):
+        create_db_and_tables()
+    if analytics.enabled():
+        with profile.phase("analytics"):
+            analytics.snapshot.load(engine)
+    with profile.phase("slug_index"):
+        slug_index.rebuild(engine)
+    with profile.phase("bus"):
+        bus.start(engine)
+    if settings.WEBHOOK_DELIVERY:
+        webhooks.start(engine)
+    if settings.ARCHIVE_ENABLED:
+        archive.start(engine)
+    registry.start_flusher()
+    profile.mark_ready()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    archive.stop()
+    if webhooks.delivery is not None:
+        await webhooks.delivery.stop()
+    bus.stop()
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "service": settings.PROJECT_NAME}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.collect_all(), media_type="text/plain; version=0.0.4")
@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Dict, Optional, List
 from sqlmodel import SQLModel, Field, Relationship
 from enum import Enum
 
@@ -33,6 +33,8 @@ class ReleaseBase(SQLModel):
     visibility: VisibilityEnum = Field(default=VisibilityEnum.draft)
 
 class Release(ReleaseBase, table=True):
+    # Ids are never reused, so none can collide with an archived release (see app.core.archive)
+    __table_args__ = {"sqlite_autoincrement": True}
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     slug: Optional[str] = Field(default=None, index=True)
@@ -74,6 +76,92 @@ class ReleasePublic(SQLModel):
     content_md: str
     published_at: Optional[datetime]
 
+class ReleaseRevision(SQLModel, table=True):
+    release_id: int = Field(primary_key=True)
+    number: int = Field(primary_key=True)  # 1-based, per release
+    kind: str  # snapshot (full content) | delta (edit script against the previous revision)
+    codec: str = "zlib"  # compression of data: zlib | zstd
+    data: bytes
+    size: int  # uncompressed content length
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class ReleaseRevisionInfo(SQLModel):
+    number: int
+    kind: str
+    size: int
+    stored_bytes: int
+    created_at: datetime
+
+class ReleaseRevisionRead(SQLModel):
+    number: int
+    created_at: datetime
+    content_md: str
+
+class ReleaseRevisionDiff(SQLModel):
+    from_revision: int
+    to_revision: int
+    diff: str  # unified diff of content_md
+
+# ── Webhooks ───────────────────────────────────────────────────────────────────
+
+class WebhookSubscription(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    url: str
+    secret: str  # HMAC-SHA256 signing key, shown once at creation
+    is_active: bool = True
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class WebhookSubscriptionCreate(SQLModel):
+    url: str = Field(max_length=2000)
+
+class WebhookSubscriptionRead(SQLModel):
+    id: int
+    url: str
+    is_active: bool
+    created_at: datetime
+
+class WebhookSubscriptionCreated(WebhookSubscriptionRead):
+    secret: str
+
+class WebhookDelivery(SQLModel, table=True):
+    """Outbox row, written in the same transaction as the event it announces."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    subscription_id: int = Field(index=True)
+    event: str
+    payload: str  # JSON body, fixed at enqueue time so every attempt signs the same bytes
+    status: str = Field(default="pending", index=True)  # pending | delivered | failed
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    response_status: Optional[int] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    delivered_at: Optional[datetime] = None
+
+class WebhookDeliveryRead(SQLModel):
+    id: int
+    event: str
+    status: str
+    attempts: int
+    next_attempt_at: datetime
+    response_status: Optional[int]
+    last_error: Optional[str]
+    created_at: datetime
+    delivered_at: Optional[datetime]
+
+# ── Archive ────────────────────────────────────────────────────────────────────
+# Cold rows moved out of the hot tables by app.core.archive; ids are kept
+
+class ArchivedRelease(ReleaseBase, table=True):
+    id: int = Field(primary_key=True)
+    user_id: int = Field(index=True)
+    slug: Optional[str] = None
+    published_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class Token(SQLModel):
     access_token: str
     token_type: str = "bearer"
@@ -83,6 +171,25 @@ class LoginRequest(SQLModel):
     password: str
 
 
+# ── Schema ──────────────────────────────────────────────────────────────────────
+
+class SchemaVersion(SQLModel, table=True):
+    id: int = Field(default=1, primary_key=True)
+    version: int
+    applied_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# ── Idempotency ────────────────────────────────────────────────────────────────
+
+class IdempotencyRecord(SQLModel, table=True):
+    key: str = Field(primary_key=True, max_length=64)  # sha256 of method, path, caller and Idempotency-Key
+    fingerprint: str = Field(max_length=64)  # sha256 of the request body
+    status_code: Optional[int] = None  # None while the first request is still running
+    headers: Optional[str] = None  # JSON list of [name, value] pairs
+    body: Optional[bytes] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
 # ── Hiring Progress Models ─────────────────────────────────────────────────────
 
 class ApplicationStatus(str, Enum):
@@ -102,20 +209,32 @@ class JobType(str, Enum):
     freelance = "freelance"
 
 class Application(SQLModel, table=True):
+    __table_args__ = {"sqlite_autoincrement": True}  # ids are never reused, as for Release
     id: Optional[int] = Field(default=None, primary_key=True)
     company: str = Field(max_length=200)
     role: str = Field(max_length=200)
     job_type: JobType = Field(default=JobType.fulltime)
-    date_sent: str  # ISO "YYYY-MM-DD"
+    date_sent: date = Field(index=True)
     status: ApplicationStatus = Field(default=ApplicationStatus.applied)
     notes: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class ArchivedApplication(SQLModel, table=True):
+    id: int = Field(primary_key=True)
+    company: str = Field(max_length=200)
+    role: str = Field(max_length=200)
+    job_type: JobType = Field(default=JobType.fulltime)
+    date_sent: date = Field(index=True)
+    status: ApplicationStatus = Field(default=ApplicationStatus.applied)
+    notes: Optional[str] = None
+    created_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+
 class ApplicationCreate(SQLModel):
     company: str
     role: str
     job_type: JobType = JobType.fulltime
-    date_sent: str
+    date_sent: date
     status: ApplicationStatus = ApplicationStatus.applied
     notes: Optional[str] = None
 
@@ -123,7 +242,7 @@ class ApplicationUpdate(SQLModel):
     company: Optional[str] = None
     role: Optional[str] = None
     job_type: Optional[JobType] = None
-    date_sent: Optional[str] = None
+    date_sent: Optional[date] = None
     status: Optional[ApplicationStatus] = None
     notes: Optional[str] = None
 
@@ -132,7 +251,7 @@ class ApplicationRead(SQLModel):
     company: str
     role: str
     job_type: JobType
-    date_sent: str
+    date_sent: date
     status: ApplicationStatus
     notes: Optional[str]
     created_at: datetime
@@ -143,7 +262,7 @@ class RecruiterContact(SQLModel, table=True):
     name: str = Field(max_length=200)
     company: str = Field(max_length=200)
     role: str = Field(max_length=200)
-    last_contact_date: str  # ISO "YYYY-MM-DD"
+    last_contact_date: date = Field(index=True)
     status: str = Field(default="active", max_length=100)
     note: Optional[str] = None
 
@@ -152,7 +271,7 @@ class RecruiterContactCreate(SQLModel):
     name: str
     company: str
     role: str
-    last_contact_date: str
+    last_contact_date: date
     status: str = "active"
     note: Optional[str] = None
 
@@ -161,7 +280,7 @@ class RecruiterContactUpdate(SQLModel):
     name: Optional[str] = None
     company: Optional[str] = None
     role: Optional[str] = None
-    last_contact_date: Optional[str] = None
+    last_contact_date: Optional[date] = None
     status: Optional[str] = None
     note: Optional[str] = None
 
@@ -171,7 +290,7 @@ class RecruiterContactRead(SQLModel):
     name: str
     company: str
     role: str
-    last_contact_date: str
+    last_contact_date: date
     status: str
     note: Optional[str]
 
@@ -185,6 +304,44 @@ class StatusBannerUpdate(SQLModel):
     message: Optional[str] = None
     is_active: Optional[bool] = None
 
+class StatusBannerRead(SQLModel):
+    id: int
+    message: str
+    is_active: bool
+    updated_at: datetime
+
+class BatchOp(str, Enum):
+    update = "update"
+    delete = "delete"
+
+class ApplicationBatchItem(SQLModel):
+    id: int
+    op: BatchOp = BatchOp.update
+    patch: Optional[ApplicationUpdate] = None
+
+class ApplicationBatch(SQLModel):
+    items: List[ApplicationBatchItem] = Field(max_length=5000)
+
+class RecruiterContactBatchItem(SQLModel):
+    id: int
+    op: BatchOp = BatchOp.update
+    patch: Optional[RecruiterContactUpdate] = None
+
+class RecruiterContactBatch(SQLModel):
+    items: List[RecruiterContactBatchItem] = Field(max_length=5000)
+
+class BatchItemResult(SQLModel):
+    id: int
+    op: BatchOp
+    status: str  # updated | deleted | not_found | invalid
+    detail: Optional[str] = None
+
+class BatchResult(SQLModel):
+    updated: int
+    deleted: int
+    failed: int
+    results: List[BatchItemResult]
+
 class WeeklyDataPoint(SQLModel):
     week: str
     count: int
@@ -203,3 +360,77 @@ class DashboardStats(SQLModel):
     weekly_applications: List[WeeklyDataPoint]
     cumulative_applications: List[CumulativeDataPoint]
     by_job_type: dict
+
+class HiringOverview(SQLModel):
+    dashboard: Optional[DashboardStats] = None
+    contacts: Optional[List[RecruiterContactRead]] = None
+    banner: Optional[StatusBannerRead] = None
+    catalog: Optional[List[ApplicationRead]] = None
+
+# ── Application History & Funnel ───────────────────────────────────────────────
+
+class ApplicationEvent(SQLModel, table=True):
+    # No foreign key: events outlive the application they describe
+    id: Optional[int] = Field(default=None, primary_key=True)
+    application_id: int = Field(index=True)
+    kind: str = Field(max_length=20)  # created | updated | deleted
+    from_status: Optional[ApplicationStatus] = None
+    to_status: Optional[ApplicationStatus] = None
+    job_type: JobType
+    date_sent: date
+    occurred_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+class ApplicationFunnel(SQLModel, table=True):
+    # Stages an application has ever reached (bitmask) and its observed days to first response
+    application_id: int = Field(primary_key=True)
+    reached: int = 0
+    response_days: Optional[int] = None
+
+class FunnelRollup(SQLModel, table=True):
+    job_type: JobType = Field(primary_key=True)
+    cohort: str = Field(primary_key=True, max_length=10)  # ISO week of date_sent, "YYYY-Www"
+    stage: str = Field(primary_key=True, max_length=20)
+    count: int = 0
+
+class ResponseLatencyRollup(SQLModel, table=True):
+    job_type: JobType = Field(primary_key=True)
+    days: int = Field(primary_key=True)
+    count: int = 0
+
+class DailyRollup(SQLModel, table=True):
+    day: date = Field(primary_key=True)  # date_sent
+    status: ApplicationStatus = Field(primary_key=True)
+    job_type: JobType = Field(primary_key=True)
+    count: int = 0
+
+class FunnelCounts(SQLModel):
+    applied: int = 0
+    responded: int = 0
+    interview: int = 0
+    offer: int = 0
+    applied_to_responded: float = 0.0
+    responded_to_interview: float = 0.0
+    interview_to_offer: float = 0.0
+    applied_to_offer: float = 0.0
+
+class CohortFunnel(FunnelCounts):
+    week: str
+
+class FunnelStats(SQLModel):
+    overall: FunnelCounts
+    by_job_type: Dict[str, FunnelCounts]
+    by_cohort: List[CohortFunnel]
+    median_days_to_response: Optional[float]
+    median_days_to_response_by_job_type: Dict[str, Optional[float]]
+
+class TimeseriesPoint(SQLModel):
+    period: str  # "YYYY-MM-DD", "YYYY-Www" or "YYYY-MM"
+    total: int
+    counts: Dict[str, int]
+
+class Timeseries(SQLModel):
+    start: date
+    end: date
+    granularity: str
+    group_by: Optional[str]
+    points: List[TimeseriesPoint]
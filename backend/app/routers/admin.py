@@ -0,0 +1,58 @@
+import os
+import time
+
+from fastapi import APIRouter, Depends
+
+from app.core import archive
+from app.core.metrics import labels, registry
+from app.core.querylog import report
+from app.core.startup import profile
+from app.db import engine
+from app.routers.hiring import verify_admin_key
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(verify_admin_key)])
+
+
+@router.get("/queries")
+def get_query_report():
+    """Slow statements and repeated statement shapes seen by the query log."""
+    return report.summary()
+
+
+@router.delete("/queries", status_code=204)
+def reset_query_report():
+    report.reset()
+
+
+@router.get("/startup")
+def get_startup_report():
+    """Startup phase timings, time to first request and which lazy imports are loaded."""
+    return profile.report()
+
+
+@router.get("/workers")
+def get_worker_stats():
+    """
+    Per-process stats for every live worker. Other workers report what they
+    last flushed to METRICS_MULTIPROC_DIR, so their numbers can lag by up to
+    METRICS_FLUSH_SECONDS.
+    """
+    workers = []
+    for pid, snapshot in sorted(registry.worker_snapshots().items()):
+        key = labels(pid=pid)
+        started = snapshot.get("process_start_time_seconds", {}).get(key)
+        workers.append({
+            "pid": pid,
+            "current": pid == os.getpid(),
+            "requests": int(sum(snapshot.get("http_requests_total", {}).values())),
+            "in_flight": int(sum(snapshot.get("http_requests_in_flight", {}).values())),
+            "rss_bytes": int(snapshot.get("process_resident_memory_bytes", {}).get(key, 0)),
+            "uptime_seconds": round(time.time() - started, 1) if started else None,
+        })
+    return {"workers": workers}
+
+
+@router.post("/archive")
+def run_archive_pass():
+    """Run an archival pass now instead of waiting for the background one; returns rows moved per table."""
+    return archive.run_pass(engine)
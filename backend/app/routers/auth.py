@@ -10,6 +10,7 @@ from app.core.security import (
     create_access_token,
     get_current_user,
 )
+from app.core.bus import bus
 from app.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -34,6 +35,7 @@ def register(user_data: UserCreate, session: Session = Depends(get_session)):
     session.add(user)
     session.commit()
     session.refresh(user)
+    bus.publish("users")
 
     return user
 
@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlmodel import Session, select
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
+from sqlmodel import Session, delete, select, update
 from typing import List, Optional, Any, Dict
 from collections import defaultdict, Counter
 from datetime import date, timedelta
 
-from app.db import get_session
+from app.db import engine, get_session
 from app.models import (
-    Application, ApplicationCreate, ApplicationUpdate, ApplicationRead,
+    Application, ApplicationCreate, ApplicationUpdate, ApplicationRead, ApplicationStatus, ArchivedApplication,
     RecruiterContact, RecruiterContactCreate, RecruiterContactUpdate, RecruiterContactRead,
     StatusBanner, StatusBannerUpdate,
-    WeeklyDataPoint, CumulativeDataPoint, DashboardStats,
+    ApplicationBatch, RecruiterContactBatch, BatchOp, BatchItemResult, BatchResult,
+    WeeklyDataPoint, CumulativeDataPoint, DashboardStats, HiringOverview, FunnelStats, Timeseries,
 )
 from app.core.config import settings
+from app.core.bus import Change, bus
+from app.core.events import broker, encode_event
+from app.core.export import export_response
+from app.core import analytics, archive, funnel, history, rollups
+from app.core.history import ApplicationChange, Snapshot
+from app.core.singleflight import group
 
 router = APIRouter(prefix="/api/hiring", tags=["hiring"])
 
+# Concurrent dashboard requests against the same data version share one computation
+_dashboard_flight = group("hiring_dashboard")
+
 
 def verify_admin_key(x_admin_key: Optional[str] = Header(default=None)):
     """Dependency that checks the X-Admin-Key header against the env var HIRING_ADMIN_KEY."""
@@ -25,6 +40,55 @@ def verify_admin_key(x_admin_key: Optional[str] = Header(default=None)):
         raise HTTPException(status_code=401, detail="Invalid admin key")
 
 
+def _application_changed(session: Session, op: str, app: Optional[Application] = None, app_id: Optional[int] = None):
+    """Broadcast an application change to other workers and live stream subscribers."""
+    bus.publish("applications")
+    if not broker.subscriber_count:
+        return
+    if app is not None:
+        broker.publish("application", {"op": op, "application": jsonable_encoder(ApplicationRead.model_validate(app))})
+    else:
+        broker.publish("application", {"op": op, "id": app_id})
+    _publish_stats(session)
+
+
+def _contact_changed(op: str, contact: Optional[RecruiterContact] = None, contact_id: Optional[int] = None):
+    bus.publish("contacts")
+    if not broker.subscriber_count:
+        return
+    if contact is not None:
+        broker.publish("contact", {"op": op, "contact": jsonable_encoder(RecruiterContactRead.model_validate(contact))})
+    else:
+        broker.publish("contact", {"op": op, "id": contact_id})
+
+
+def _publish_stats(session: Session):
+    if not broker.subscriber_count:
+        return
+    broker.publish("stats", jsonable_encoder(dashboard_stats(session)))
+
+
+def _publish_banner(banner: Optional[StatusBanner]):
+    if broker.subscriber_count:
+        broker.publish("banner", jsonable_encoder(banner) if banner and banner.is_active else None)
+
+
+def _on_remote_change(change: Change):
+    """Another worker committed a write: tell this worker's stream clients to refresh."""
+    if not change.remote or not broker.subscriber_count:
+        return
+    broker.publish("invalidate", {"resource": change.resource, "version": change.version})
+    with Session(engine) as session:
+        if change.resource == "applications":
+            _publish_stats(session)
+        elif change.resource == "banner":
+            _publish_banner(session.exec(select(StatusBanner).where(StatusBanner.is_active == True)).first())
+
+
+for _resource in ("applications", "contacts", "banner"):
+    bus.subscribe(_resource, _on_remote_change)
+
+
 # ── Public endpoints ───────────────────────────────────────────────────────────
 
 @router.get("/banner")
@@ -41,26 +105,157 @@ def list_contacts(session: Session = Depends(get_session)):
 
 @router.get("/dashboard")
 def get_dashboard(session: Session = Depends(get_session)):
-    apps = session.exec(select(Application)).all()
+    return _dashboard_flight.do(
+        bus.version("applications"),
+        lambda: dashboard_stats(session),
+    )
+
+
+@router.get("/funnel", response_model=FunnelStats)
+def get_funnel(
+    weeks: int = Query(default=26, ge=1, le=520, description="Weekly cohorts to return, counting back from this week"),
+    session: Session = Depends(get_session),
+):
+    """Stage counts, conversion rates and days to first response, read from the precomputed rollups."""
+    return funnel.funnel_stats(session, weeks)
+
 
-    total_sent = len(apps)
+@router.get("/timeseries", response_model=Timeseries)
+def get_timeseries(
+    start: Optional[date] = Query(default=None, alias="from", description="First date_sent (YYYY-MM-DD), default one year before `to`"),
+    end: Optional[date] = Query(default=None, alias="to", description="Last date_sent (YYYY-MM-DD), default today"),
+    granularity: str = Query(default="week", description="day, week or month"),
+    group_by: Optional[str] = Query(default=None, description="status or job_type"),
+    session: Session = Depends(get_session),
+):
+    """Applications per period over any date range, composed from the daily rollups."""
+    if granularity not in rollups.GRANULARITIES:
+        raise HTTPException(status_code=422, detail=f"granularity must be one of: {', '.join(rollups.GRANULARITIES)}")
+    if group_by is not None and group_by not in rollups.GROUP_BY:
+        raise HTTPException(status_code=422, detail=f"group_by must be one of: {', '.join(rollups.GROUP_BY)}")
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+    if granularity == "day" and (end - start).days > 3660:
+        raise HTTPException(status_code=422, detail="Daily granularity is limited to ten years; use week or month")
+    return rollups.timeseries(session, start, end, granularity, group_by)
+
+
+OVERVIEW_SECTIONS = ("dashboard", "contacts", "banner", "catalog")
+
+
+@router.get("/overview", response_model=HiringOverview, response_model_exclude_unset=True)
+def get_overview(
+    include: Optional[str] = Query(default=None, description="Comma-separated sections: " + ",".join(OVERVIEW_SECTIONS)),
+    session: Session = Depends(get_session),
+):
+    """
+    Everything the hiring progress page needs in one round trip.
+    The dashboard stats are aggregated in SQL; the catalog (hot and archived applications) is the only full read.
+    """
+    sections = set(OVERVIEW_SECTIONS) if not include else {s.strip() for s in include.split(",") if s.strip()}
+    unknown = sections - set(OVERVIEW_SECTIONS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown sections: {', '.join(sorted(unknown))}")
+
+    # One snapshot for every read below
+    if engine.dialect.name == "sqlite":
+        # pysqlite runs each SELECT in autocommit, so open the read transaction explicitly;
+        # it holds until the session closes (ROLLBACK), keeping writers' commits out of it
+        session.connection().exec_driver_sql("BEGIN")
+    else:
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    overview: Dict[str, Any] = {}
+    if "dashboard" in sections:
+        overview["dashboard"] = dashboard_stats(session)
+    if "catalog" in sections:
+        overview["catalog"] = _applications(session, include_archived=True)
+    if "contacts" in sections:
+        overview["contacts"] = session.exec(select(RecruiterContact)).all()
+    if "banner" in sections:
+        overview["banner"] = session.exec(select(StatusBanner).where(StatusBanner.is_active == True)).first()
+    return overview
+
+
+@router.get("/stream")
+async def stream_updates():
+    """
+    Server-Sent Events stream of live hiring updates.
+    Emits `application`, `contact`, `stats` and `banner` events as writes commit.
+    """
+    sub = broker.subscribe()
+
+    async def frames():
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(sub.ready.wait(), timeout=settings.STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                sub.ready.clear()
+                if sub.dropped:
+                    yield encode_event("dropped", {"reason": "slow consumer"})
+                    return
+                chunk = b"".join(sub.frames)
+                sub.frames.clear()
+                yield chunk
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def compute_dashboard_stats(apps: List[Application]) -> DashboardStats:
+    """Dashboard stats from already-loaded rows."""
+    return build_dashboard_stats(
+        Counter(a.status for a in apps),
+        Counter(a.job_type for a in apps),
+        Counter(a.date_sent for a in apps),
+    )
+
+
+def dashboard_stats(session: Session) -> DashboardStats:
+    """Dashboard stats from the columnar snapshot when enabled, else from the daily rollups."""
+    if analytics.enabled():
+        return analytics.snapshot.dashboard_stats(engine)
+    return query_dashboard_stats(session)
+
+
+def query_dashboard_stats(session: Session) -> DashboardStats:
+    """Dashboard stats from the daily rollups; no Application rows are loaded."""
+    return build_dashboard_stats(
+        rollups.counts_by(session, "status"),
+        rollups.counts_by(session, "job_type"),
+        rollups.counts_by(session, "day"),
+    )
+
+
+def build_dashboard_stats(
+    status_counts: Dict[str, int],
+    job_type_counts: Dict[str, int],
+    day_counts: Dict[date, int],
+) -> DashboardStats:
+    total_sent = sum(status_counts.values())
     response_statuses = {"response", "interview", "offer", "rejected"}
-    total_responses = sum(1 for a in apps if a.status in response_statuses)
+    total_responses = sum(n for s, n in status_counts.items() if s in response_statuses)
     response_rate = round(total_responses / total_sent * 100, 1) if total_sent > 0 else 0.0
-    active_interviews = sum(1 for a in apps if a.status == "interview")
-    offers_received = sum(1 for a in apps if a.status == "offer")
+    active_interviews = status_counts.get("interview", 0)
+    offers_received = status_counts.get("offer", 0)
 
-    status_breakdown = dict(Counter(a.status for a in apps))
+    status_breakdown = dict(status_counts)
 
     # Weekly applications — last 8 ISO weeks
     weekly: defaultdict[str, int] = defaultdict(int)
-    for a in apps:
-        try:
-            d = date.fromisoformat(a.date_sent)
-            week_label = d.strftime("%Y-W%V")
-            weekly[week_label] += 1
-        except ValueError:
-            pass
+    for d, n in day_counts.items():
+        weekly[d.strftime("%Y-W%V")] += n
 
     today = date.today()
     last_8_weeks = [
@@ -72,17 +267,14 @@ def get_dashboard(session: Session = Depends(get_session)):
         for w in last_8_weeks
     ]
 
-    # Cumulative applications sorted by date
-    sorted_dates = sorted(
-        (a.date_sent for a in apps if a.date_sent),
-        key=lambda d: d
-    )
-    cumulative_applications = [
-        CumulativeDataPoint(date=d, total=i + 1)
-        for i, d in enumerate(sorted_dates)
-    ]
+    # Cumulative applications, one point per day with applications
+    cumulative_applications = []
+    total = 0
+    for d in sorted(day_counts):
+        total += day_counts[d]
+        cumulative_applications.append(CumulativeDataPoint(date=d.isoformat(), total=total))
 
-    by_job_type = dict(Counter(a.job_type for a in apps))
+    by_job_type = dict(job_type_counts)
 
     return DashboardStats(
         total_sent=total_sent,
@@ -99,18 +291,83 @@ def get_dashboard(session: Session = Depends(get_session)):
 
 # ── Protected endpoints ────────────────────────────────────────────────────────
 
+def _applications(session: Session, include_archived: bool):
+    if not include_archived:
+        return session.exec(select(Application).order_by(Application.date_sent.desc())).all()
+    rows = archive.union(Application, lambda m: select(*(getattr(m, name) for name in ApplicationRead.model_fields)))
+    return [dict(row._mapping) for row in session.exec(rows.order_by(rows.selected_columns.date_sent.desc()))]
+
+
 @router.get("/applications/public", response_model=List[ApplicationRead])
 def list_applications_public(session: Session = Depends(get_session)):
-    """Public read-only list of all applications (used by the CV Catalog on the dashboard)."""
-    return session.exec(select(Application).order_by(Application.date_sent.desc())).all()
+    """Public read-only list of all applications, archived ones included (used by the CV Catalog on the dashboard)."""
+    return _applications(session, include_archived=True)
 
 
 @router.get("/applications", response_model=List[ApplicationRead])
 def list_applications(
+    include_archived: bool = Query(default=False, description="Also return archived applications"),
     session: Session = Depends(get_session),
     _: None = Depends(verify_admin_key),
 ):
-    return session.exec(select(Application).order_by(Application.date_sent.desc())).all()
+    return _applications(session, include_archived)
+
+
+APPLICATION_EXPORT_COLUMNS = [
+    ("id", "int"), ("company", "str"), ("role", "str"), ("job_type", "str"), ("date_sent", "date"),
+    ("status", "str"), ("notes", "str"), ("created_at", "datetime"),
+]
+CONTACT_EXPORT_COLUMNS = [
+    ("id", "int"), ("application_id", "int"), ("name", "str"), ("company", "str"), ("role", "str"),
+    ("last_contact_date", "date"), ("status", "str"), ("note", "str"),
+]
+
+
+@router.get("/applications/export")
+def export_applications(
+    format: str = Query(default="csv", description="csv, ndjson or parquet"),
+    date_from: Optional[date] = Query(default=None, description="Earliest date_sent (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(default=None, description="Latest date_sent (YYYY-MM-DD)"),
+    status: Optional[ApplicationStatus] = None,
+    include_archived: bool = Query(default=False, description="Also return archived applications"),
+    _: None = Depends(verify_admin_key),
+):
+    """Stream every matching application in constant memory."""
+    def build(model):
+        statement = select(*(getattr(model, name) for name, kind in APPLICATION_EXPORT_COLUMNS))
+        if date_from:
+            statement = statement.where(model.date_sent >= date_from)
+        if date_to:
+            statement = statement.where(model.date_sent <= date_to)
+        if status:
+            statement = statement.where(model.status == status)
+        return statement
+
+    if include_archived:
+        statement = archive.union(Application, build)
+        statement = statement.order_by(statement.selected_columns.id)
+    else:
+        statement = build(Application).order_by(Application.id)
+    return export_response(engine, statement, APPLICATION_EXPORT_COLUMNS, format, "applications")
+
+
+@router.get("/contacts/export")
+def export_contacts(
+    format: str = Query(default="csv", description="csv, ndjson or parquet"),
+    date_from: Optional[date] = Query(default=None, description="Earliest last_contact_date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(default=None, description="Latest last_contact_date (YYYY-MM-DD)"),
+    status: Optional[str] = None,
+    _: None = Depends(verify_admin_key),
+):
+    """Stream every matching recruiter contact in constant memory."""
+    statement = select(*(getattr(RecruiterContact, name) for name, kind in CONTACT_EXPORT_COLUMNS))
+    if date_from:
+        statement = statement.where(RecruiterContact.last_contact_date >= date_from)
+    if date_to:
+        statement = statement.where(RecruiterContact.last_contact_date <= date_to)
+    if status:
+        statement = statement.where(RecruiterContact.status == status)
+    return export_response(engine, statement.order_by(RecruiterContact.id), CONTACT_EXPORT_COLUMNS, format, "contacts")
 
 
 @router.post("/applications", response_model=ApplicationRead, status_code=201)
@@ -121,8 +378,11 @@ def create_application(
 ):
     app = Application(**data.model_dump())
     session.add(app)
+    session.flush()
+    history.record(session, [ApplicationChange(app.id, "created", None, history.snapshot(app))])
     session.commit()
     session.refresh(app)
+    _application_changed(session, "created", app)
     return app
 
 
@@ -133,14 +393,19 @@ def update_application(
     session: Session = Depends(get_session),
     _: None = Depends(verify_admin_key),
 ):
-    app = session.get(Application, app_id)
+    app = session.get(Application, app_id) or archive.restore(session, Application, app_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
-    for field, value in data.model_dump(exclude_unset=True).items():
+    patch = data.model_dump(exclude_unset=True)
+    _reject_nulls(Application, patch)
+    before = history.snapshot(app)
+    for field, value in patch.items():
         setattr(app, field, value)
     session.add(app)
+    history.record(session, [ApplicationChange(app.id, "updated", before, history.snapshot(app))])
     session.commit()
     session.refresh(app)
+    _application_changed(session, "updated", app)
     return app
 
 
@@ -150,11 +415,13 @@ def delete_application(
     session: Session = Depends(get_session),
     _: None = Depends(verify_admin_key),
 ):
-    app = session.get(Application, app_id)
+    app = session.get(Application, app_id) or archive.restore(session, Application, app_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
+    history.record(session, [ApplicationChange(app_id, "deleted", history.snapshot(app), None)])
     session.delete(app)
     session.commit()
+    _application_changed(session, "deleted", app_id=app_id)
 
 
 @router.post("/contacts", response_model=RecruiterContactRead, status_code=201)
@@ -167,6 +434,7 @@ def create_contact(
     session.add(contact)
     session.commit()
     session.refresh(contact)
+    _contact_changed("created", contact)
     return contact
 
 
@@ -180,14 +448,157 @@ def update_contact(
     contact = session.get(RecruiterContact, contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
-    for field, value in data.model_dump(exclude_unset=True).items():
+    patch = data.model_dump(exclude_unset=True)
+    _reject_nulls(RecruiterContact, patch)
+    for field, value in patch.items():
         setattr(contact, field, value)
     session.add(contact)
     session.commit()
     session.refresh(contact)
+    _contact_changed("updated", contact)
     return contact
 
 
+BATCH_CHUNK_SIZE = 500  # ids per IN (...) list, well under SQLite's bound-parameter limit
+
+
+def _null_fields(model, patch: Dict[str, Any]) -> List[str]:
+    """Fields of `patch` set to null that the table does not allow to be null."""
+    return sorted(
+        name for name, value in patch.items()
+        if value is None and name in model.__table__.columns and not model.__table__.columns[name].nullable
+    )
+
+
+def _reject_nulls(model, patch: Dict[str, Any]):
+    nulls = _null_fields(model, patch)
+    if nulls:
+        raise HTTPException(status_code=422, detail=f"{', '.join(nulls)} cannot be null")
+
+
+def _apply_batch(session: Session, model, items) -> BatchResult:
+    """
+    Apply update/delete ops with set-based statements; the caller commits.
+    Updates carrying identical patches share one UPDATE ... WHERE id IN (...).
+    """
+    def chunks(ids: List[int]):
+        for i in range(0, len(ids), BATCH_CHUNK_SIZE):
+            yield ids[i:i + BATCH_CHUNK_SIZE]
+
+    existing = set()
+    for chunk in chunks(list({item.id for item in items})):
+        existing.update(session.exec(select(model.id).where(model.id.in_(chunk))).all())
+
+    results: List[BatchItemResult] = []
+    updates: Dict[tuple, List[int]] = defaultdict(list)
+    deletes: List[int] = []
+    seen = set()
+    for item in items:
+        result = BatchItemResult(id=item.id, op=item.op, status="invalid")
+        results.append(result)
+        if item.id in seen:
+            result.detail = "Duplicate id in batch"
+            continue
+        seen.add(item.id)
+        if item.id not in existing:
+            result.status = "not_found"
+        elif item.op == BatchOp.delete:
+            deletes.append(item.id)
+            result.status = "deleted"
+        else:
+            patch = item.patch.model_dump(exclude_unset=True) if item.patch else {}
+            if not patch:
+                result.detail = "Update requires a non-empty patch"
+                continue
+            nulls = _null_fields(model, patch)
+            if nulls:
+                result.detail = f"{', '.join(nulls)} cannot be null"
+                continue
+            updates[tuple(sorted(patch.items()))].append(item.id)
+            result.status = "updated"
+
+    for patch, ids in updates.items():
+        for chunk in chunks(ids):
+            session.exec(update(model).where(model.id.in_(chunk)).values(dict(patch)))
+    for chunk in chunks(deletes):
+        session.exec(delete(model).where(model.id.in_(chunk)))
+
+    updated = sum(len(ids) for ids in updates.values())
+    return BatchResult(
+        updated=updated,
+        deleted=len(deletes),
+        failed=len(results) - updated - len(deletes),
+        results=results,
+    )
+
+
+@router.patch("/applications:batch", response_model=BatchResult)
+def batch_applications(
+    batch: ApplicationBatch,
+    session: Session = Depends(get_session),
+    _: None = Depends(verify_admin_key),
+):
+    """
+    Update or delete many applications in one round trip and one transaction.
+    Archived applications are moved back first, as a single update or delete does.
+    """
+    ids = sorted({item.id for item in batch.items})
+    before: Dict[int, Snapshot] = {}
+    for i in range(0, len(ids), BATCH_CHUNK_SIZE):
+        archive.restore_all(session, Application, ids[i:i + BATCH_CHUNK_SIZE])
+        before.update(
+            (row[0], Snapshot(*row[1:]))
+            for row in session.exec(
+                select(Application.id, Application.status, Application.job_type, Application.date_sent)
+                .where(Application.id.in_(ids[i:i + BATCH_CHUNK_SIZE]))
+            ).all()
+        )
+
+    result = _apply_batch(session, Application, batch.items)
+    changes = []
+    for item, item_result in zip(batch.items, result.results):
+        if item_result.status == "deleted":
+            changes.append(ApplicationChange(item.id, "deleted", before[item.id], None))
+        elif item_result.status == "updated":
+            patch = item.patch.model_dump(exclude_unset=True)
+            after = before[item.id]._replace(**{
+                k: v for k, v in patch.items() if k in Snapshot._fields and v is not None
+            })
+            changes.append(ApplicationChange(item.id, "updated", before[item.id], after))
+    history.record(session, changes)
+    session.commit()
+    if result.updated or result.deleted:
+        bus.publish("applications")
+        if broker.subscriber_count:
+            broker.publish("application", {
+                "op": "batch",
+                "updated": [r.id for r in result.results if r.status == "updated"],
+                "deleted": [r.id for r in result.results if r.status == "deleted"],
+            })
+            _publish_stats(session)
+    return result
+
+
+@router.patch("/contacts:batch", response_model=BatchResult)
+def batch_contacts(
+    batch: RecruiterContactBatch,
+    session: Session = Depends(get_session),
+    _: None = Depends(verify_admin_key),
+):
+    """Update or delete many recruiter contacts in one round trip and one transaction."""
+    result = _apply_batch(session, RecruiterContact, batch.items)
+    session.commit()
+    if result.updated or result.deleted:
+        bus.publish("contacts")
+        if broker.subscriber_count:
+            broker.publish("contact", {
+                "op": "batch",
+                "updated": [r.id for r in result.results if r.status == "updated"],
+                "deleted": [r.id for r in result.results if r.status == "deleted"],
+            })
+    return result
+
+
 @router.post("/applications/bulk-import", status_code=200)
 def bulk_import_applications(
     payload: Dict[str, Any],
@@ -197,7 +608,8 @@ def bulk_import_applications(
     """
     Import a cv_catalog.json payload. Accepts { cvs: [...] }.
     Each CV entry is mapped to an Application row.
-    Skips entries that already exist (matched by company + role + date_sent).
+    Skips entries that already exist (matched by company + role + date_sent)
+    and entries whose created_date is not a valid YYYY-MM-DD date.
     Returns { imported, skipped }.
     """
     cvs = payload.get("cvs", [])
@@ -223,13 +635,36 @@ def bulk_import_applications(
         "CSM - Scaled": "fulltime",
     }
 
-    imported = 0
+    imported: List[Application] = []
     skipped = 0
 
+    entries = []
     for cv in cvs:
         company = (cv.get("company") or "").strip() or "Master CV"
         role = cv.get("role", "").strip()
-        date_sent = cv.get("created_date", "").strip()
+        try:
+            date_sent = date.fromisoformat(cv.get("created_date", "").strip())
+        except ValueError:
+            date_sent = None
+        if not role or not date_sent:
+            skipped += 1
+            continue
+        entries.append((cv, company, role, date_sent))
+
+    # Duplicates (same company + role + date_sent, archived or not): one set-based lookup per table and chunk
+    keys = sorted({(company, role, date_sent) for _, company, role, date_sent in entries})
+    existing = set()
+    chunk_size = BATCH_CHUNK_SIZE // 3  # three bound parameters per key
+    for model in (Application, ArchivedApplication):
+        columns = (model.company, model.role, model.date_sent)
+        for i in range(0, len(keys), chunk_size):
+            existing.update(
+                tuple(row) for row in session.exec(
+                    select(*columns).where(tuple_(*columns).in_(keys[i:i + chunk_size]))
+                ).all()
+            )
+
+    for cv, company, role, date_sent in entries:
         raw_status = cv.get("status", "applied")
         role_type = cv.get("role_type", "")
         language = cv.get("language", "")
@@ -237,22 +672,10 @@ def bulk_import_applications(
         notes_raw = cv.get("notes", "")
         industry = cv.get("industry", "")
 
-        if not role or not date_sent:
-            skipped += 1
-            continue
-
-        # Check for duplicate: same company + role + date_sent
-        existing = session.exec(
-            select(Application).where(
-                Application.company == company,
-                Application.role == role,
-                Application.date_sent == date_sent,
-            )
-        ).first()
-
-        if existing:
+        if (company, role, date_sent) in existing:
             skipped += 1
             continue
+        existing.add((company, role, date_sent))  # a repeat within the payload is a duplicate too
 
         status = STATUS_MAP.get(raw_status, "applied")
         job_type = JOB_TYPE_MAP.get(role_type, "fulltime")
@@ -278,10 +701,17 @@ def bulk_import_applications(
             notes=notes,
         )
         session.add(app)
-        imported += 1
+        imported.append(app)
 
+    session.flush()
+    history.record(session, (ApplicationChange(a.id, "created", None, history.snapshot(a)) for a in imported))
     session.commit()
-    return {"imported": imported, "skipped": skipped}
+    if imported:
+        bus.publish("applications")
+        if broker.subscriber_count:
+            broker.publish("application", {"op": "imported", "count": len(imported)})
+            _publish_stats(session)
+    return {"imported": len(imported), "skipped": skipped}
 
 
 @router.delete("/contacts/{contact_id}", status_code=204)
@@ -295,6 +725,7 @@ def delete_contact(
         raise HTTPException(status_code=404, detail="Contact not found")
     session.delete(contact)
     session.commit()
+    _contact_changed("deleted", contact_id=contact_id)
 
 
 @router.put("/banner")
@@ -314,4 +745,6 @@ def upsert_banner(
     session.add(banner)
     session.commit()
     session.refresh(banner)
+    bus.publish("banner")
+    _publish_banner(banner)
     return banner
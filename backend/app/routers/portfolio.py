@@ -3,10 +3,7 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import datetime
 import random
-import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
@@ -185,6 +182,11 @@ def send_contact_email(contact: dict) -> dict:
         if not smtp_user or not smtp_pass:
             return {"sent": False, "error": f"Missing credentials: user={bool(smtp_user)}, pass={bool(smtp_pass)}"}
 
+        # Imported here: only contact submissions need SMTP, not every cold start
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
         msg = MIMEMultipart()
         msg["From"] = smtp_user
         msg["To"] = recipient_email
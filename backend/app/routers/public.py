@@ -1,37 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 from typing import List
 
-from app.db import get_session
+from app.core.bus import bus
+from app.core.config import settings
+from app.core.feeds import FORMATS, feeds
+from app.core.slugs import UNKNOWN, index as slug_index
+from app.core.singleflight import group
+from app.db import engine, get_session
 from app.models import Release, ReleasePublic, VisibilityEnum
 
 router = APIRouter(prefix="/public", tags=["public"])
 
+_list_flight = group("public_releases")
+_release_flight = group("public_release")
+
 @router.get("/releases", response_model=List[ReleasePublic])
 def list_public_releases(
     limit: int = Query(default=50, le=100),
     offset: int = 0,
     session: Session = Depends(get_session)
 ):
-    statement = (
-        select(Release)
-        .where(Release.visibility == VisibilityEnum.published)
-        .order_by(Release.published_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-    releases = session.exec(statement).all()
-    return releases
+    def load():
+        statement = (
+            select(Release)
+            .where(Release.visibility == VisibilityEnum.published)
+            .order_by(Release.published_at.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return [ReleasePublic.model_validate(r) for r in session.exec(statement).all()]
+
+    return _list_flight.do((limit, offset, bus.version("releases")), load)
+
+async def _feed(fmt: str, request: Request) -> Response:
+    feed = await run_in_threadpool(feeds.get, fmt, engine, str(request.base_url))
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": feed.last_modified,
+        "Cache-Control": f"public, max-age={settings.FEED_MAX_AGE_SECONDS}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = feed.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+    else:
+        not_modified = request.headers.get("if-modified-since") == feed.last_modified
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(feed.body, media_type=FORMATS[fmt], headers=headers)
+
+# Declared before /releases/{slug} so the feed paths are not taken for slugs
+@router.get("/releases/feed.xml", response_class=Response)
+async def releases_rss(request: Request):
+    return await _feed("xml", request)
+
+@router.get("/releases/feed.atom", response_class=Response)
+async def releases_atom(request: Request):
+    return await _feed("atom", request)
+
+@router.get("/releases/feed.json", response_class=Response)
+async def releases_json_feed(request: Request):
+    return await _feed("json", request)
 
 @router.get("/releases/{slug}", response_model=ReleasePublic)
 def get_public_release(slug: str, session: Session = Depends(get_session)):
-    statement = select(Release).where(
-        Release.slug == slug,
-        Release.visibility == VisibilityEnum.published
-    )
-    release = session.exec(statement).first()
-
-    if not release:
+    # Unknown slugs (crawlers, typos) are answered without a query
+    release_id = slug_index.lookup(slug)
+    if release_id is None:
         raise HTTPException(status_code=404, detail="Release not found")
 
-    return release
+    def load():
+        if release_id is UNKNOWN:
+            statement = select(Release).where(
+                Release.slug == slug,
+                Release.visibility == VisibilityEnum.published
+            )
+            release = session.exec(statement).first()
+        else:
+            release = session.get(Release, release_id)
+            if release and (release.slug != slug or release.visibility != VisibilityEnum.published):
+                release = None
+
+        if not release:
+            raise HTTPException(status_code=404, detail="Release not found")
+
+        return ReleasePublic.model_validate(release)
+
+    return _release_flight.do((slug, bus.version("releases")), load)
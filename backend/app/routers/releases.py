@@ -1,18 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 from datetime import datetime
 from typing import List, Optional
 import re
 
 from app.db import get_session
 from app.models import (
-    Release, ReleaseCreate, ReleaseRead, ReleaseUpdate,
-    User, VisibilityEnum
+    Release, ReleaseCreate, ReleasePublic, ReleaseRead, ReleaseRevision, ReleaseRevisionDiff, ReleaseRevisionInfo,
+    ReleaseRevisionRead, ReleaseUpdate, User, VisibilityEnum
 )
+from app.core.bus import bus
+from app.core import archive, revisions, webhooks
+from app.core.feeds import feeds
+from app.core.slugs import index as slug_index
 from app.core.security import get_current_user
 
 router = APIRouter(prefix="/releases", tags=["releases"])
 
+def _release_changed(release: Release, old_slug: Optional[str] = None, deleted: bool = False):
+    """Invalidate cached reads after a committed release write and keep the slug index and feeds current."""
+    bus.publish("releases")
+    feeds.release_changed(release, deleted)
+    slug_index.discard(old_slug, release.id)
+    slug_index.discard(release.slug, release.id)
+    if not deleted and release.visibility == VisibilityEnum.published:
+        slug_index.add(release.slug, release.id)
+
+def _find_release(session: Session, release_id: int, current_user: User) -> Optional[Release]:
+    """The release, moving it back from the archive first if it is one of the caller's archived drafts."""
+    return session.get(Release, release_id) or archive.restore(session, Release, release_id, user_id=current_user.id)
+
 def generate_slug(title: str, version: str) -> str:
     """Generate a URL-friendly slug from title and version."""
     combined = f"{title}-{version}".lower()
@@ -25,9 +42,22 @@ def list_releases(
     status: Optional[VisibilityEnum] = None,
     limit: int = Query(default=50, le=100),
     offset: int = 0,
+    include_archived: bool = Query(default=False, description="Also return drafts moved to the archive"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
+    if include_archived:
+        def build(model):
+            statement = select(*(getattr(model, name) for name in ReleaseRead.model_fields))
+            statement = statement.where(model.user_id == current_user.id)
+            if status:
+                statement = statement.where(model.visibility == status)
+            return statement
+
+        statement = archive.union(Release, build)
+        statement = statement.order_by(statement.selected_columns.created_at.desc()).offset(offset).limit(limit)
+        return [dict(row._mapping) for row in session.exec(statement)]
+
     statement = select(Release).where(Release.user_id == current_user.id)
 
     if status:
@@ -49,8 +79,11 @@ def create_release(
         slug=generate_slug(release_data.title, release_data.version)
     )
     session.add(release)
+    session.flush()
+    revisions.record(session, release.id, release.content_md)
     session.commit()
     session.refresh(release)
+    _release_changed(release)
     return release
 
 @router.get("/{release_id}", response_model=ReleaseRead)
@@ -59,7 +92,7 @@ def get_release(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    release = session.get(Release, release_id)
+    release = _find_release(session, release_id, current_user)
 
     if not release:
         raise HTTPException(status_code=404, detail="Release not found")
@@ -76,7 +109,7 @@ def update_release(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    release = session.get(Release, release_id)
+    release = _find_release(session, release_id, current_user)
 
     if not release:
         raise HTTPException(status_code=404, detail="Release not found")
@@ -85,6 +118,8 @@ def update_release(
         raise HTTPException(status_code=403, detail="Not authorized to modify this release")
 
     update_dict = release_data.model_dump(exclude_unset=True)
+    old_slug = release.slug
+    old_content = release.content_md
 
     for key, value in update_dict.items():
         setattr(release, key, value)
@@ -95,9 +130,13 @@ def update_release(
     if "title" in update_dict or "version" in update_dict:
         release.slug = generate_slug(release.title, release.version)
 
+    if release.content_md != old_content:
+        revisions.record(session, release.id, release.content_md, previous=old_content)
+
     session.add(release)
     session.commit()
     session.refresh(release)
+    _release_changed(release, old_slug)
     return release
 
 @router.delete("/{release_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -106,7 +145,7 @@ def delete_release(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    release = session.get(Release, release_id)
+    release = _find_release(session, release_id, current_user)
 
     if not release:
         raise HTTPException(status_code=404, detail="Release not found")
@@ -114,8 +153,10 @@ def delete_release(
     if release.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this release")
 
+    revisions.delete_all(session, release.id)
     session.delete(release)
     session.commit()
+    _release_changed(release, deleted=True)
 
 @router.post("/{release_id}/publish", response_model=ReleaseRead)
 def publish_release(
@@ -123,7 +164,7 @@ def publish_release(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    release = session.get(Release, release_id)
+    release = _find_release(session, release_id, current_user)
 
     if not release:
         raise HTTPException(status_code=404, detail="Release not found")
@@ -139,8 +180,14 @@ def publish_release(
         release.slug = generate_slug(release.title, release.version)
 
     session.add(release)
+    # Outbox rows commit (or roll back) together with the publish; delivery happens in the background
+    queued = webhooks.enqueue(session, current_user.id, "release.published",
+                              ReleasePublic.model_validate(release).model_dump(mode="json"))
     session.commit()
     session.refresh(release)
+    _release_changed(release)
+    if queued:
+        webhooks.wake()
     return release
 
 @router.post("/{release_id}/unpublish", response_model=ReleaseRead)
@@ -149,7 +196,7 @@ def unpublish_release(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    release = session.get(Release, release_id)
+    release = _find_release(session, release_id, current_user)
 
     if not release:
         raise HTTPException(status_code=404, detail="Release not found")
@@ -163,4 +210,65 @@ def unpublish_release(
     session.add(release)
     session.commit()
     session.refresh(release)
+    _release_changed(release)
     return release
+
+def _owned_release(release_id: int, session: Session, current_user: User) -> Release:
+    release = _find_release(session, release_id, current_user)
+    if not release:
+        raise HTTPException(status_code=404, detail="Release not found")
+    if release.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this release")
+    return release
+
+def _load_revision(session: Session, release_id: int, number: int):
+    loaded = revisions.load(session, release_id, number)
+    if loaded is None:
+        raise HTTPException(status_code=404, detail=f"Revision {number} not found")
+    return loaded
+
+@router.get("/{release_id}/revisions", response_model=List[ReleaseRevisionInfo])
+def list_revisions(
+    release_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    _owned_release(release_id, session, current_user)
+    rows = session.exec(
+        select(ReleaseRevision.number, ReleaseRevision.kind, ReleaseRevision.size,
+               func.length(ReleaseRevision.data), ReleaseRevision.created_at)
+        .where(ReleaseRevision.release_id == release_id)
+        .order_by(ReleaseRevision.number.desc())
+    ).all()
+    return [
+        ReleaseRevisionInfo(number=number, kind=kind, size=size, stored_bytes=stored, created_at=created_at)
+        for number, kind, size, stored, created_at in rows
+    ]
+
+@router.get("/{release_id}/revisions/diff", response_model=ReleaseRevisionDiff)
+def diff_revisions(
+    release_id: int,
+    from_revision: int = Query(alias="from", ge=1),
+    to_revision: int = Query(alias="to", ge=1),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    _owned_release(release_id, session, current_user)
+    _, old = _load_revision(session, release_id, from_revision)
+    _, new = _load_revision(session, release_id, to_revision)
+    return ReleaseRevisionDiff(
+        from_revision=from_revision,
+        to_revision=to_revision,
+        diff=revisions.diff(old, new, from_revision, to_revision),
+    )
+
+@router.get("/{release_id}/revisions/{number}", response_model=ReleaseRevisionRead)
+def get_revision(
+    release_id: int,
+    number: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    _owned_release(release_id, session, current_user)
+    revision, content = _load_revision(session, release_id, number)
+    return ReleaseRevisionRead(number=revision.number, created_at=revision.created_at, content_md=content)
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlmodel import Session, select
+from typing import List
+import secrets
+
+from app.db import get_session
+from app.models import (
+    User, WebhookDelivery, WebhookDeliveryRead, WebhookSubscription,
+    WebhookSubscriptionCreate, WebhookSubscriptionCreated, WebhookSubscriptionRead
+)
+from app.core import webhooks
+from app.core.security import get_current_user
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+def _owned_subscription(subscription_id: int, session: Session, current_user: User) -> WebhookSubscription:
+    subscription = session.get(WebhookSubscription, subscription_id)
+    if not subscription or subscription.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return subscription
+
+@router.post("", response_model=WebhookSubscriptionCreated, status_code=status.HTTP_201_CREATED)
+def create_webhook(
+    data: WebhookSubscriptionCreate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Subscribe a URL to release.published events; the signing secret is only returned here."""
+    try:
+        webhooks.validate_url(data.url)
+    except webhooks.UnsafeURL as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    subscription = WebhookSubscription(user_id=current_user.id, url=data.url, secret=secrets.token_hex(32))
+    session.add(subscription)
+    session.commit()
+    session.refresh(subscription)
+    return subscription
+
+@router.get("", response_model=List[WebhookSubscriptionRead])
+def list_webhooks(session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+    return session.exec(
+        select(WebhookSubscription)
+        .where(WebhookSubscription.user_id == current_user.id)
+        .order_by(WebhookSubscription.id)
+    ).all()
+
+@router.delete("/{subscription_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_webhook(
+    subscription_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Deactivated rather than deleted so its delivery log stays readable; pending deliveries are dropped
+    subscription = _owned_subscription(subscription_id, session, current_user)
+    subscription.is_active = False
+    session.add(subscription)
+    for delivery in session.exec(
+        select(WebhookDelivery).where(
+            WebhookDelivery.subscription_id == subscription_id, WebhookDelivery.status == "pending"
+        )
+    ).all():
+        delivery.status = "failed"
+        delivery.last_error = "Subscription deleted"
+        session.add(delivery)
+    session.commit()
+
+@router.get("/{subscription_id}/deliveries", response_model=List[WebhookDeliveryRead])
+def list_deliveries(
+    subscription_id: int,
+    limit: int = Query(default=50, le=200),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    _owned_subscription(subscription_id, session, current_user)
+    return session.exec(
+        select(WebhookDelivery)
+        .where(WebhookDelivery.subscription_id == subscription_id)
+        .order_by(WebhookDelivery.id.desc())
+        .limit(limit)
+    ).all()
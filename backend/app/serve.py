@@ -0,0 +1,139 @@
+"""
+Production launcher: gunicorn managing uvicorn workers.
+
+    python -m app.serve
+
+Workers default to the smaller of 2 x CPUs + 1 and the memory limit divided
+by WORKER_MEMORY_MB, both read from the container's cgroup where available;
+WEB_CONCURRENCY overrides the result. The app is imported once in the master
+and the workers fork from it, sharing its memory copy-on-write. Each worker
+exits and is replaced after MAX_REQUESTS (+ jitter) requests, and SIGTERM
+drains in-flight requests for up to GRACEFUL_TIMEOUT seconds.
+"""
+import glob
+import logging
+import os
+import tempfile
+from typing import Optional
+
+from gunicorn.app.base import BaseApplication
+
+try:
+    from uvicorn_worker import UvicornWorker as _UvicornWorker
+except ImportError:  # uvicorn < 0.30 still ships the worker itself
+    from uvicorn.workers import UvicornWorker as _UvicornWorker
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Worker(_UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        # Cancel requests still running (open SSE streams, mostly) before the master kills us
+        "timeout_graceful_shutdown": settings.GRACEFUL_TIMEOUT,
+    }
+
+
+def _cgroup_value(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_count() -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = _cgroup_value("/sys/fs/cgroup/cpu.max")  # "max 100000" or "<quota> <period>"
+    if quota and not quota.startswith("max"):
+        limit, period = quota.split()
+        cpus = min(cpus, max(1, int(limit) // int(period)))
+    return cpus
+
+
+def memory_limit() -> Optional[int]:
+    limit = _cgroup_value("/sys/fs/cgroup/memory.max")
+    if limit and limit != "max":
+        return int(limit)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError):
+        return None
+
+
+def worker_count() -> int:
+    if settings.WEB_CONCURRENCY:
+        return settings.WEB_CONCURRENCY
+    workers = 2 * cpu_count() + 1
+    memory = memory_limit()
+    if memory:
+        workers = min(workers, memory // (settings.WORKER_MEMORY_MB * 2**20))
+    return max(1, workers)
+
+
+def when_ready(server):
+    # Migrate once in the master so forked workers only pay the version check
+    from app.db import create_db_and_tables, engine
+
+    create_db_and_tables()
+    engine.dispose()
+
+
+def post_fork(server, worker):
+    from app.core import metrics
+    from app.db import engine
+
+    # Pooled connections opened in the master must not be shared with the workers
+    engine.dispose(close=False)
+    metrics.after_fork()
+
+
+class Server(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+
+        return app
+
+
+def options(workers: int) -> dict:
+    return {
+        "bind": f"0.0.0.0:{settings.PORT}",
+        "workers": workers,
+        "worker_class": "app.serve.Worker",
+        "preload_app": True,
+        "max_requests": settings.MAX_REQUESTS,
+        "max_requests_jitter": settings.MAX_REQUESTS_JITTER if settings.MAX_REQUESTS else 0,
+        # Give uvicorn's own graceful shutdown a head start before the master sends SIGKILL
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT + 5,
+        "keepalive": 5,
+        "accesslog": "-",
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+    }
+
+
+def main():
+    workers = worker_count()
+    if workers > 1 and not settings.METRICS_MULTIPROC_DIR:
+        # /metrics and /api/admin/workers need the workers' snapshots in one place
+        settings.METRICS_MULTIPROC_DIR = os.path.join(tempfile.gettempdir(), "hirefred-metrics")
+    # Snapshots left by a previous run would be read as live workers if their pids got reused
+    for path in glob.glob(os.path.join(settings.METRICS_MULTIPROC_DIR or "", "*.json")):
+        os.remove(path)
+    logger.info("Starting %d workers on port %d", workers, settings.PORT)
+    Server(options(workers)).run()
+
+
+if __name__ == "__main__":
+    main()
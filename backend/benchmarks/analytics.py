@@ -0,0 +1,134 @@
+"""
+Dashboard analytics at scale: ORM rows vs SQL rollups vs the NumPy columnar snapshot.
+
+    cd backend
+    python -m benchmarks.analytics --rows 1000000 --out bench-results/analytics.json
+
+Uses its own scratch SQLite database; the ORM path holds every Application
+object in memory at once, so budget a few GB of RAM at 1M rows.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, Tuple
+
+
+def _measure(fn: Callable[[], object], repeat: int = 3) -> Tuple[object, Dict[str, float]]:
+    """Median wall time over `repeat` runs plus the peak traced allocation of one extra run."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, {
+        "median_ms": round(sorted(timings)[len(timings) // 2] * 1000, 2),
+        "peak_alloc_mb": round(peak / 2**20, 2),
+    }
+
+
+def _populate(engine, rows: int, seed: int):
+    from sqlalchemy import insert
+
+    from app.models import Application, ApplicationStatus, JobType
+
+    rng = random.Random(seed)
+    statuses = list(ApplicationStatus)
+    job_types = list(JobType)
+    start = date(2026, 1, 1) - timedelta(days=3 * 365)
+    now = date(2026, 1, 1)
+    with engine.begin() as conn:
+        for offset in range(0, rows, 50_000):
+            conn.execute(insert(Application), [
+                {
+                    "company": "Company", "role": "Role",
+                    "job_type": rng.choice(job_types),
+                    "date_sent": start + timedelta(days=rng.randrange(3 * 365)),
+                    "status": rng.choice(statuses),
+                    "created_at": now,
+                }
+                for _ in range(min(50_000, rows - offset))
+            ])
+
+
+def run(rows: int, seed: int = 1234) -> Dict[str, Dict[str, float]]:
+    from sqlmodel import Session, select
+
+    from app.core import analytics, rollups
+    from app.db import create_db_and_tables, engine
+    from app.models import Application
+    from app.routers.hiring import compute_dashboard_stats, query_dashboard_stats
+
+    create_db_and_tables()
+    started = time.perf_counter()
+    _populate(engine, rows, seed)
+    rollups.rebuild_if_empty(engine)
+    results: Dict[str, Dict[str, float]] = {
+        "dataset": {"rows": rows, "seconds_to_generate": round(time.perf_counter() - started, 2)},
+    }
+
+    def orm():
+        with Session(engine) as session:
+            return compute_dashboard_stats(session.exec(select(Application)).all())
+
+    def sql_rollups():
+        with Session(engine) as session:
+            return query_dashboard_stats(session)
+
+    expected, results["orm_rows"] = _measure(orm, repeat=1)
+    got, results["sql_rollups"] = _measure(sql_rollups)
+    assert got == expected, "rollup stats differ from the ORM path"
+
+    if analytics.available():
+        snapshot = analytics.ColumnarSnapshot()
+        _, results["numpy_load"] = _measure(lambda: snapshot.load(engine), repeat=1)
+        results["numpy_load"]["resident_mb"] = round(snapshot.nbytes / 2**20, 2)
+        got, results["numpy_dashboard"] = _measure(lambda: snapshot.dashboard_stats(engine), repeat=5)
+        assert got == expected, "columnar stats differ from the ORM path"
+
+        from app.core.history import ApplicationChange, Snapshot
+        from app.models import ApplicationStatus, JobType
+
+        changes = [
+            ApplicationChange(i, "updated", None, Snapshot(ApplicationStatus.offer, JobType.contract, date(2025, 6, 1)))
+            for i in range(1, 1001)
+        ]
+        _, apply = _measure(lambda: snapshot.apply(changes))
+        results["numpy_apply_1000_updates"] = apply
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard analytics engines.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--out", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hirefred-analytics-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/analytics.db"
+    output = json.dumps(run(args.rows, args.seed), indent=2, sort_keys=True)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+        print(f"wrote {args.out}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Hot/cold archival: read costs before and after moving cold rows out.
+
+    cd backend
+    python -m benchmarks.archive --scale medium
+
+Populates a fresh database, times the routes that scan the hot tables (the
+catalog, the application list, the dashboard and an owner's release list),
+runs one archival pass as of the generated data's "today" and times them
+again, with and without include_archived. Aggregates are compared before
+and after to show archived rows still count.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import date
+from typing import Callable, Dict
+
+TODAY = date(2026, 1, 1)  # benchmarks.datagen's default "today"
+
+
+def _time(call: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def run(scale: str, repeat: int) -> Dict[str, object]:
+    from fastapi.testclient import TestClient
+    from sqlmodel import Session, func, select
+
+    from app.core import archive
+    from app.core.security import create_access_token
+    from app.db import create_db_and_tables, engine
+    from app.main import app
+    from app.models import Application, Release
+    from benchmarks import datagen
+
+    create_db_and_tables()
+    with Session(engine) as session:
+        datagen.populate(session, scale, today=TODAY)
+        owner = session.exec(select(Release.user_id).limit(1)).one()
+    admin = {"X-Admin-Key": "change-me-in-production"}
+    owner_headers = {"Authorization": f"Bearer {create_access_token({'sub': str(owner)})}"}
+    aggregates = ("/api/hiring/dashboard", "/api/hiring/funnel", "/api/hiring/timeseries?from=2020-01-01&granularity=month")
+
+    def routes(client, suffix=""):
+        return {
+            "catalog_ms": _time(lambda: client.get("/api/hiring/overview?include=catalog"), repeat),
+            f"applications{suffix}_ms": _time(
+                lambda: client.get(f"/api/hiring/applications{'?include_archived=true' if suffix else ''}", headers=admin),
+                repeat),
+            "dashboard_ms": _time(lambda: client.get("/api/hiring/dashboard"), repeat),
+            f"releases{suffix}_ms": _time(
+                lambda: client.get(f"/releases?limit=100{'&include_archived=true' if suffix else ''}",
+                                   headers=owner_headers), repeat),
+        }
+
+    with TestClient(app) as client:
+        before = routes(client)
+        totals = [client.get(path).json() for path in aggregates]
+        start = time.perf_counter()
+        moved = archive.run_pass(engine, today=TODAY)
+        pass_seconds = time.perf_counter() - start
+        after = routes(client)
+        after.update({k: v for k, v in routes(client, "_with_archived").items() if "with_archived" in k})
+        unchanged = totals == [client.get(path).json() for path in aggregates]
+
+    with Session(engine) as session:
+        hot = session.exec(select(func.count()).select_from(Application)).one()
+    return {
+        "scale": scale,
+        "moved": moved,
+        "hot_applications_left": hot,
+        "pass_seconds": round(pass_seconds, 2),
+        "aggregates_unchanged": unchanged,
+        "before": before,
+        "after": after,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure hot-table reads before and after an archival pass.")
+    parser.add_argument("--scale", default="small", choices=["small", "medium", "large"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hirefred-archive-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/archive.db"
+    os.environ.setdefault("ARCHIVE_ENABLED", "false")  # only the pass below runs
+    print(json.dumps(run(args.scale, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Diff two benchmark result files and flag regressions.
+
+    python -m benchmarks.compare base.json head.json --threshold 10
+
+Exits non-zero when any metric moved in the wrong direction by more than
+the threshold (percent).
+"""
+import argparse
+import json
+import sys
+from typing import Dict
+
+# Metric name suffixes where a larger number is better; everything else is a cost
+HIGHER_IS_BETTER = ("rps", "ops_per_sec")
+COMPARED = ("_ms", "_us", "_kb", "rps", "ops_per_sec", "bytes_per_subscriber")
+
+
+def flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and key.endswith(COMPARED):
+            flat[path] = float(value)
+    return flat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base_results = json.load(f)
+    with open(args.head) as f:
+        head_results = json.load(f)
+    base = flatten({k: v for k, v in base_results.items() if k not in ("meta", "dataset")})
+    head = flatten({k: v for k, v in head_results.items() if k not in ("meta", "dataset")})
+
+    print(f"base {base_results['meta']['commit']}  ->  head {head_results['meta']['commit']}")
+    regressions = 0
+    for name in sorted(base.keys() & head.keys()):
+        old, new = base[name], head[name]
+        if old == 0:
+            continue
+        change = (new - old) / old * 100
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -args.threshold:
+            flag = "  improved"
+        print(f"{name:60s} {old:>12.3f} {new:>12.3f} {change:>+8.1f}%{flag}")
+    for name in sorted(head.keys() - base.keys()):
+        print(f"{name:60s} {'-':>12s} {head[name]:>12.3f}      new")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
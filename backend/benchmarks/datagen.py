@@ -0,0 +1,138 @@
+"""
+Seeded synthetic data for benchmarks.
+
+Everything is derived from one random.Random(seed), so the same scale and
+seed always produce the same rows and results can be compared across commits.
+"""
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from sqlmodel import Session
+
+from app.core import funnel, rollups
+from app.models import (
+    Application, ApplicationStatus, JobType, RecruiterContact, Release, StatusBanner, User, VisibilityEnum,
+)
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"users": 10, "releases_per_user": 20, "applications": 2_000, "contacts": 300},
+    "medium": {"users": 50, "releases_per_user": 40, "applications": 20_000, "contacts": 2_000},
+    "large": {"users": 200, "releases_per_user": 50, "applications": 200_000, "contacts": 10_000},
+}
+
+WORDS = (
+    "fix add improve refactor api dashboard release performance cache query index stream user "
+    "security session token export import webhook feed latency throughput memory worker deploy "
+    "migration schema rollback build pipeline config endpoint payload retry backoff metric"
+).split()
+COMPANIES = [f"{prefix}{suffix}" for prefix in ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay",
+                                                "Stark", "Wayne", "Wonka", "Tyrell")
+             for suffix in ("", " Labs", " Inc", " Cloud", " AI")]
+ROLES = ["Customer Success Manager", "Senior CSM", "CSM - Scaled", "Account Manager", "Director of CS",
+         "Customer Program Manager", "Solutions Consultant"]
+# Rough shape of a real pipeline: most applications never hear back
+STATUS_WEIGHTS = {
+    ApplicationStatus.applied: 35, ApplicationStatus.no_response: 20, ApplicationStatus.ghosted: 10,
+    ApplicationStatus.rejected: 18, ApplicationStatus.response: 7, ApplicationStatus.phone_screen: 4,
+    ApplicationStatus.interview: 4, ApplicationStatus.offer: 1, ApplicationStatus.master: 1,
+}
+# Placeholder bcrypt hash; benchmarks never log these users in with a password
+PASSWORD_HASH = "$2b$12$benchmarkbenchmarkbenchOQ3H1t4uCk8zQYV2lJxqVwQ2m7WmS6"
+
+
+def markdown_body(rng: random.Random) -> str:
+    """A changelog entry; sizes are log-normal, mostly 1-10 KB with a long tail."""
+    target = int(min(rng.lognormvariate(8.2, 0.9), 200_000))
+    parts: List[str] = []
+    size = 0
+    while size < target:
+        if rng.random() < 0.15:
+            line = f"\n## {rng.choice(WORDS).title()} {rng.choice(WORDS)}\n"
+        else:
+            line = "- " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 18))) + "\n"
+        parts.append(line)
+        size += len(line)
+    return "".join(parts)
+
+
+def application_rows(rng: random.Random, count: int, start: date, days: int) -> List[dict]:
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    rows = []
+    for _ in range(count):
+        rows.append({
+            "company": rng.choice(COMPANIES),
+            "role": rng.choice(ROLES),
+            "job_type": rng.choices(list(JobType), weights=(8, 1, 1))[0],
+            "date_sent": start + timedelta(days=rng.randrange(days)),
+            "status": rng.choices(statuses, weights)[0],
+            "notes": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))) or None,
+        })
+    return rows
+
+
+def cv_payload(rng: random.Random, count: int, start: date, days: int) -> dict:
+    """A bulk-import payload in the cv_catalog.json shape."""
+    return {"cvs": [
+        {
+            "company": row["company"],
+            "role": row["role"],
+            "created_date": row["date_sent"].isoformat(),
+            "status": row["status"].value,
+            "role_type": "CSM",
+            "language": rng.choice(["EN", "FR"]),
+            "location_type": rng.choice(["Remote", "Hybrid", "On-site"]),
+        }
+        for row in application_rows(rng, count, start, days)
+    ]}
+
+
+def populate(session: Session, scale: str = "small", seed: int = 1234, today: date = date(2026, 1, 1)) -> Dict[str, int]:
+    """Fill an empty database; returns the row counts written."""
+    spec = SCALES[scale]
+    rng = random.Random(seed)
+    start = today - timedelta(days=3 * 365)
+
+    users = [User(email=f"user{i}@bench.local", password_hash=PASSWORD_HASH) for i in range(spec["users"])]
+    session.add_all(users)
+    session.flush()
+
+    releases = 0
+    for user in users:
+        for n in range(spec["releases_per_user"]):
+            published = rng.random() < 0.7
+            created = datetime.combine(start, datetime.min.time()) + timedelta(minutes=rng.randrange(3 * 365 * 1440))
+            session.add(Release(
+                user_id=user.id,
+                title=f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} release",
+                version=f"{n // 10}.{n % 10}.{rng.randint(0, 9)}",
+                content_md=markdown_body(rng),
+                visibility=VisibilityEnum.published if published else VisibilityEnum.draft,
+                slug=f"u{user.id}-release-{n}",
+                published_at=created if published else None,
+                created_at=created,
+                updated_at=created,
+            ))
+            releases += 1
+        session.flush()
+
+    for chunk_start in range(0, spec["applications"], 5_000):
+        chunk = min(5_000, spec["applications"] - chunk_start)
+        session.add_all(Application(**row) for row in application_rows(rng, chunk, start, 3 * 365))
+        session.flush()
+
+    for _ in range(spec["contacts"]):
+        session.add(RecruiterContact(
+            name=f"{rng.choice(['Alex', 'Sam', 'Jordan', 'Morgan', 'Casey'])} {rng.choice(['Lee', 'Roy', 'Diaz', 'Tran'])}",
+            company=rng.choice(COMPANIES),
+            role="Recruiter",
+            last_contact_date=start + timedelta(days=rng.randrange(3 * 365)),
+            status=rng.choice(["active", "waiting", "closed"]),
+        ))
+    session.add(StatusBanner(message="Open to offers", is_active=True))
+    session.commit()
+    # Rows were inserted directly rather than through the API, so derive the rollups now
+    rollups.rebuild_if_empty(session.get_bind())
+    funnel.rebuild_if_empty(session.get_bind())
+    return {"users": len(users), "releases": releases, "applications": spec["applications"], "contacts": spec["contacts"]}
@@ -0,0 +1,139 @@
+"""
+In-process ASGI load driver.
+
+Requests are fed straight into the ASGI app, with no sockets and no HTTP
+client library. Timings therefore cover the whole middleware, routing,
+dependency and serialization stack, without network noise.
+"""
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class Route:
+    """One request template hit by the load driver."""
+
+    def __init__(self, name: str, method: str, path: str, body: Optional[dict] = None,
+                 headers: Sequence[Tuple[str, str]] = ()):
+        self.name = name
+        self.method = method
+        self.path, _, self.query = path.partition("?")
+        self.body = json.dumps(body).encode() if body is not None else b""
+        self.headers = [(k.lower().encode(), v.encode()) for k, v in headers]
+        if body is not None:
+            self.headers.append((b"content-type", b"application/json"))
+
+
+async def call(app, route: Route) -> Tuple[int, int]:
+    """Issue one request; returns (status, response body bytes)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": route.method, "scheme": "http", "path": route.path, "raw_path": route.path.encode(),
+        "query_string": route.query.encode(), "root_path": "",
+        "headers": [(b"host", b"bench.local"), *route.headers],
+        "client": ("127.0.0.1", 50000), "server": ("bench.local", 80),
+    }
+    sent = False
+    status = 0
+    size = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": route.body, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size
+
+
+class Lifespan:
+    """Run the app's startup/shutdown handlers around a benchmark."""
+
+    def __init__(self, app):
+        self.app = app
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        self._task = None
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self.app({"type": "lifespan", "asgi": {"version": "3.0"}},
+                                                  self._inbox.get, self._outbox.put))
+        await self._inbox.put({"type": "lifespan.startup"})
+        message = await self._outbox.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"startup failed: {message}")
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._inbox.put({"type": "lifespan.shutdown"})
+        await self._outbox.get()
+        await self._task
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_route(app, route: Route, requests: int, concurrency: int, alloc_samples: int = 20) -> Dict[str, float]:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            status, _ = await call(app, route)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    await call(app, route)  # warm-up
+    wall = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall
+
+    # Allocation profile from a separate, sequential pass (tracemalloc skews timings)
+    tracemalloc.start()
+    peaks = []
+    for _ in range(alloc_samples):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        await call(app, route)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(requests / wall, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "peak_alloc_kb": round(sorted(peaks)[len(peaks) // 2] / 1024, 1),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+
+async def run(app, routes: Sequence[Route], requests: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    async with Lifespan(app):
+        for route in routes:
+            results[route.name] = await run_route(app, route, requests, concurrency)
+    return results
@@ -0,0 +1,101 @@
+"""
+Release revision storage: snapshot + delta chains vs full copies.
+
+    cd backend
+    python -m benchmarks.revisions --edits 500 --lines 400
+
+Simulates a long changelog edited many times (small line edits, inserts,
+deletions and appended entries), encodes every revision the way
+app.core.revisions stores them and reports stored bytes against raw and
+zlib-compressed full copies, plus write and worst-case read times.
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+WORDS = ("fix", "add", "improve", "remove", "support", "release", "api", "cache", "latency", "endpoint",
+         "feed", "import", "export", "dashboard", "worker", "query", "index", "migration", "bug", "docs")
+
+
+def _line(rng: random.Random) -> str:
+    return "- " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16))) + "\n"
+
+
+def _edit(rng: random.Random, lines: List[str]) -> List[str]:
+    lines = list(lines)
+    action = rng.random()
+    if action < 0.5:
+        lines[rng.randrange(len(lines))] = _line(rng)
+    elif action < 0.7:
+        lines.insert(rng.randrange(len(lines) + 1), _line(rng))
+    elif action < 0.8 and len(lines) > 1:
+        del lines[rng.randrange(len(lines))]
+    else:
+        lines[:0] = [f"## {rng.randint(1, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 50)}\n"] + \
+            [_line(rng) for _ in range(rng.randint(2, 6))]
+    return lines
+
+
+def run(edits: int, lines: int, interval: int, seed: int = 1234) -> Dict[str, object]:
+    from app.core import revisions
+
+    rng = random.Random(seed)
+    current = [_line(rng) for _ in range(lines)]
+    contents = ["".join(current)]
+    for _ in range(edits):
+        current = _edit(rng, current)
+        contents.append("".join(current))
+
+    started = time.perf_counter()
+    stored = []
+    for number, content in enumerate(contents, start=1):
+        previous = contents[number - 2] if number > 1 else None
+        kind = revisions.SNAPSHOT if previous is None or (number - 1) % interval == 0 else revisions.DELTA
+        stored.append((kind, revisions.encode(kind, content, previous, "zlib")))
+    write_ms = (time.perf_counter() - started) * 1000
+
+    def read(number: int) -> str:
+        base = max(i for i in range(number + 1) if stored[i][0] == revisions.SNAPSHOT)
+        content = revisions.decompress(stored[base][1], "zlib").decode()
+        for _, data in stored[base + 1:number + 1]:
+            content = revisions.apply_delta(content, json.loads(revisions.decompress(data, "zlib")))
+        return content
+
+    # The last revision before a snapshot is the longest chain
+    worst = max(range(len(contents)), key=lambda i: i - max(j for j in range(i + 1) if stored[j][0] == revisions.SNAPSHOT))
+    started = time.perf_counter()
+    assert read(worst) == contents[worst]
+    worst_read_ms = (time.perf_counter() - started) * 1000
+    assert all(read(i) == contents[i] for i in rng.sample(range(len(contents)), min(50, len(contents))))
+
+    raw = sum(len(c.encode()) for c in contents)
+    full_zlib = sum(len(revisions.compress(c.encode(), "zlib")) for c in contents)
+    chained = sum(len(data) for _, data in stored)
+    return {
+        "revisions": len(contents),
+        "final_content_bytes": len(contents[-1].encode()),
+        "snapshot_interval": interval,
+        "full_copies_bytes": raw,
+        "full_copies_zlib_bytes": full_zlib,
+        "snapshot_delta_bytes": chained,
+        "ratio_vs_full_copies": round(chained / raw, 4),
+        "ratio_vs_zlib_copies": round(chained / full_zlib, 4),
+        "write_ms_per_revision": round(write_ms / len(contents), 3),
+        "worst_case_read_ms": round(worst_read_ms, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark release revision storage.")
+    parser.add_argument("--edits", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=400)
+    parser.add_argument("--interval", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+    print(json.dumps(run(args.edits, args.lines, args.interval, args.seed), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Reproducible benchmark run against a throwaway SQLite database.
+
+    cd backend
+    python -m benchmarks.run --scale small --out bench-results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.compare bench-results/<old>.json bench-results/<new>.json
+
+The database is generated from a fixed seed, so two runs at the same scale
+see identical data and their JSON results can be diffed between commits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backend benchmark suite.")
+    parser.add_argument("--scale", default="small", choices=["small", "medium", "large"])
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route for the load driver")
+    # get_current_user checks out a pool connection on the event loop thread; past the
+    # pool size (5 + 10 overflow) authenticated routes block the loop, so stay below it
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", default="micro,load,stream",
+                        help="comma-separated suites to run (micro, load, stream, coldstart)")
+    parser.add_argument("--out", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+    suites = set(args.only.split(","))
+
+    # Settings are read at import time, so point the app at a scratch database first
+    workdir = tempfile.mkdtemp(prefix="hirefred-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["HIRING_ADMIN_KEY"] = admin_key = "bench-admin-key"
+
+    from sqlmodel import Session, select
+
+    from app.core.security import create_access_token
+    from app.db import create_db_and_tables, engine
+    from app.main import app
+    from app.models import Release, VisibilityEnum
+    from benchmarks import coldstart, datagen, load, micro, stream_fanout
+
+    create_db_and_tables()
+    started = time.perf_counter()
+    with Session(engine) as session:
+        dataset = datagen.populate(session, args.scale, args.seed)
+    dataset["seconds_to_generate"] = round(time.perf_counter() - started, 2)
+
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "seed": args.seed,
+            "timestamp": int(time.time()),
+        },
+        "dataset": dataset,
+    }
+
+    if "micro" in suites:
+        results["micro"] = micro.run(args.seed)
+
+    if "load" in suites:
+        with Session(engine) as session:
+            published_slug = session.exec(
+                select(Release.slug).where(Release.visibility == VisibilityEnum.published).order_by(Release.id)
+            ).first()
+        bearer = [("Authorization", f"Bearer {create_access_token({'sub': '1'})}")]
+        admin = [("X-Admin-Key", admin_key)]
+        routes = [
+            load.Route("health", "GET", "/health"),
+            load.Route("hiring_dashboard", "GET", "/api/hiring/dashboard"),
+            load.Route("hiring_contacts", "GET", "/api/hiring/contacts"),
+            load.Route("hiring_banner", "GET", "/api/hiring/banner"),
+            load.Route("hiring_catalog", "GET", "/api/hiring/applications/public"),
+            load.Route("hiring_overview", "GET", "/api/hiring/overview"),
+            load.Route("hiring_applications_admin", "GET", "/api/hiring/applications", headers=admin),
+            load.Route("public_releases", "GET", "/public/releases?limit=50"),
+            load.Route("public_release_hit", "GET", f"/public/releases/{published_slug}"),
+            load.Route("public_release_miss", "GET", "/public/releases/does-not-exist"),
+            load.Route("auth_me", "GET", "/auth/me", headers=bearer),
+            load.Route("releases_list", "GET", "/releases?limit=50", headers=bearer),
+        ]
+        results["load"] = asyncio.run(load.run(app, routes, args.requests, args.concurrency))
+
+    if "stream" in suites:
+        results["stream"] = asyncio.run(stream_fanout.run(subscribers=5000, events=20, max_queue=64))
+
+    if "coldstart" in suites:
+        results["coldstart"] = coldstart.run(os.environ["DATABASE_URL"])
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+        print(f"wrote {args.out}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Fan-out benchmark for the hiring SSE broker.
+
+Attaches N idle subscribers (each with a consumer task parked on its queue,
+like a real /api/hiring/stream connection) and measures memory per subscriber,
+publish cost and the time until every subscriber has received the event.
+
+    python -m benchmarks.stream_fanout --subscribers 5000 --events 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+
+from app.core.events import EventBroker
+
+
+async def run(subscribers: int, events: int, max_queue: int) -> dict:
+    broker = EventBroker(max_queue=max_queue)
+    received = 0
+    all_received = asyncio.Event()
+    target = 0
+
+    async def consumer(sub):
+        nonlocal received
+        while True:
+            await sub.ready.wait()
+            sub.ready.clear()
+            received += len(sub.frames)
+            sub.frames.clear()
+            if received >= target:
+                all_received.set()
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tasks = []
+    for _ in range(subscribers):
+        sub = broker.subscribe()
+        tasks.append(asyncio.create_task(consumer(sub)))
+    await asyncio.sleep(0)
+    idle, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    payload = {"op": "updated", "application": {"id": 1, "company": "Acme", "role": "CSM", "status": "interview"}}
+    publish_ms, delivery_ms = [], []
+    for _ in range(events):
+        target = received + subscribers
+        all_received.clear()
+        start = time.perf_counter()
+        broker.publish("application", payload)
+        publish_ms.append((time.perf_counter() - start) * 1000)
+        await all_received.wait()
+        delivery_ms.append((time.perf_counter() - start) * 1000)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        "subscribers": subscribers,
+        "events": events,
+        "idle_bytes_per_subscriber": round((idle - base) / subscribers, 1),
+        "publish_ms_p50": round(statistics.median(publish_ms), 3),
+        "delivery_ms_p50": round(statistics.median(delivery_ms), 3),
+        "delivery_ms_max": round(max(delivery_ms), 3),
+        "dropped": broker.dropped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--max-queue", type=int, default=64)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.subscribers, args.events, args.max_queue)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Webhook delivery against a local stand-in receiver.
+
+    cd backend
+    python -m benchmarks.webhooks --subscriptions 20 --releases 10 --fail-rate 0.2
+
+Starts a threaded HTTP receiver on localhost that verifies every signature,
+fails a fraction of requests with 503 to exercise retries and records the
+peak number of concurrent requests and the client ports (to show connection
+reuse). The app runs in-process with its delivery loop; each subscription
+points at the receiver, every release is published once, and the run waits
+until the outbox drains.
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class Receiver(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fail_rate: float, latency: float, seed: int):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.secrets: Dict[str, str] = {}  # path -> signing secret
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.received: List[dict] = []
+        self.bad_signatures = 0
+        self.failed = 0
+        self.ports = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server: Receiver = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.ports.add(self.client_address[1])
+            fail = server.rng.random() < server.fail_rate
+        try:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(server.latency)
+            parts = dict(p.split("=", 1) for p in self.headers["X-Webhook-Signature"].split(","))
+            expected = hmac.new(server.secrets[self.path].encode(), f"{parts['t']}.".encode() + body,
+                                hashlib.sha256).hexdigest()
+            with server.lock:
+                if not hmac.compare_digest(expected, parts["v1"]):
+                    server.bad_signatures += 1
+                elif fail:
+                    server.failed += 1
+                else:
+                    server.received.append({"id": self.headers["X-Webhook-Id"], "at": time.time(),
+                                            "payload": json.loads(body)})
+            status = 503 if fail else 204
+            self.send_response(status)
+            if fail:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+def run(subscriptions: int, releases: int, fail_rate: float, latency: float, seed: int = 1234) -> Dict[str, object]:
+    from fastapi.testclient import TestClient
+    from sqlmodel import Session, func, select
+
+    from app.core.security import create_access_token
+    from app.db import create_db_and_tables, engine
+    from app.main import app
+    from app.models import Release, User, WebhookDelivery
+    from benchmarks.datagen import PASSWORD_HASH
+
+    receiver = Receiver(fail_rate, latency, seed)
+    threading.Thread(target=receiver.serve_forever, daemon=True).start()
+
+    create_db_and_tables()
+    with Session(engine) as session:
+        user = User(email="webhooks@example.com", password_hash=PASSWORD_HASH)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        for i in range(releases):
+            session.add(Release(user_id=user.id, title=f"Release {i}", version=f"1.{i}", content_md="Notes"))
+        session.commit()
+        release_ids = session.exec(select(Release.id).where(Release.user_id == user.id)).all()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    with TestClient(app) as client:
+        for i in range(subscriptions):
+            created = client.post("/webhooks", json={"url": f"{receiver.url}/hook/{i}"}, headers=headers).json()
+            receiver.secrets[f"/hook/{i}"] = created["secret"]
+        published_at = {}
+        started = time.perf_counter()
+        for release_id in release_ids:
+            published_at[release_id] = time.time()
+            client.post(f"/releases/{release_id}/publish", headers=headers).raise_for_status()
+        publish_ms = (time.perf_counter() - started) * 1000 / len(release_ids)
+
+        expected = subscriptions * releases
+        deadline = time.time() + 120
+        while time.time() < deadline:
+            with Session(engine) as session:
+                pending = session.exec(
+                    select(func.count()).select_from(WebhookDelivery).where(WebhookDelivery.status == "pending")
+                ).one()
+            if not pending:
+                break
+            time.sleep(0.1)
+        drained = time.perf_counter() - started
+
+    with Session(engine) as session:
+        by_status = dict(session.exec(
+            select(WebhookDelivery.status, func.count()).group_by(WebhookDelivery.status)
+        ).all())
+        attempts = session.exec(select(func.sum(WebhookDelivery.attempts))).one()
+    receiver.shutdown()
+    lags = sorted(r["at"] - published_at[r["payload"]["data"]["id"]] for r in receiver.received)
+    return {
+        "deliveries_expected": expected,
+        "deliveries_by_status": by_status,
+        "attempts": attempts,
+        "receiver_failures_injected": receiver.failed,
+        "bad_signatures": receiver.bad_signatures,
+        "duplicates_received": len(receiver.received) - len({r["id"] for r in receiver.received}),
+        "peak_concurrent_requests": receiver.peak,
+        "connections_opened": len(receiver.ports),
+        "publish_ms_per_call": round(publish_ms, 2),
+        "seconds_to_drain": round(drained, 2),
+        "lag_p50_ms": round(statistics.median(lags) * 1000, 1) if lags else None,
+        "lag_max_ms": round(lags[-1] * 1000, 1) if lags else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise webhook delivery against a local receiver.")
+    parser.add_argument("--subscriptions", type=int, default=20)
+    parser.add_argument("--releases", type=int, default=10)
+    parser.add_argument("--fail-rate", type=float, default=0.2, help="fraction of requests answered with 503")
+    parser.add_argument("--latency", type=float, default=0.02, help="receiver think time per request (seconds)")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hirefred-webhooks-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/webhooks.db"
+    # Retries come due quickly so the run finishes in seconds
+    os.environ.setdefault("WEBHOOK_BACKOFF_SECONDS", "0.05")
+    os.environ.setdefault("WEBHOOK_POLL_SECONDS", "0.1")
+    os.environ["WEBHOOK_ALLOW_PRIVATE"] = "true"  # the receiver listens on localhost
+    print(json.dumps(run(args.subscriptions, args.releases, args.fail_rate, args.latency, args.seed),
+                     indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
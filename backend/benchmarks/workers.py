@@ -0,0 +1,122 @@
+"""
+Local check of the production launcher (app.serve) under load.
+
+    cd backend
+    python -m benchmarks.workers --workers 3 --requests 3000 --max-requests 500
+
+Starts `python -m app.serve` against a scratch SQLite database, drives
+GET /health over real sockets, then reads /api/admin/workers to report how
+requests spread over the workers and how many were recycled after
+--max-requests. Finally sends SIGTERM and times the graceful shutdown.
+
+Recycling can cost a few errors: a client that reuses a keep-alive
+connection just as its worker exits gets a reset, which load balancers retry.
+Run with --max-requests 0 for an error-free baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Set
+
+ADMIN_KEY = "bench-admin-key"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _drive(base: str, total: int, concurrency: int) -> Dict[str, object]:
+    import httpx
+
+    pids: Set[int] = set()
+    errors = 0
+    remaining = iter(range(total))
+
+    async with httpx.AsyncClient(base_url=base, timeout=30) as client:
+        async def one():
+            nonlocal errors
+            for _ in remaining:
+                try:
+                    (await client.get("/health")).raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+
+        async def watch():
+            # Sample the worker table while the load runs to catch recycled pids
+            while True:
+                response = await client.get("/api/admin/workers", headers={"X-Admin-Key": ADMIN_KEY})
+                pids.update(w["pid"] for w in response.json()["workers"])
+                await asyncio.sleep(0.2)
+
+        watcher = asyncio.create_task(watch())
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        watcher.cancel()
+        await asyncio.sleep(1.5)  # let every worker flush its snapshot once more
+        final = (await client.get("/api/admin/workers", headers={"X-Admin-Key": ADMIN_KEY})).json()["workers"]
+    pids.update(w["pid"] for w in final)
+    return {
+        "requests": total,
+        "errors": errors,
+        "requests_per_second": round(total / elapsed, 1),
+        "pids_seen": len(pids),
+        "live_workers": final,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-check the multi-worker launcher.")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-requests", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hirefred-workers-")
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir}/workers.db",
+        "HIRING_ADMIN_KEY": ADMIN_KEY,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(args.workers),
+        "MAX_REQUESTS": str(args.max_requests),
+        "MAX_REQUESTS_JITTER": "0",
+        "METRICS_MULTIPROC_DIR": os.path.join(workdir, "metrics"),
+        "METRICS_FLUSH_SECONDS": "0.5",
+    }
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = subprocess.Popen([sys.executable, "-m", "app.serve"], env=env, cwd=backend,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        deadline = time.time() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise SystemExit("server did not start")
+                time.sleep(0.2)
+        results = asyncio.run(_drive(base, args.requests, args.concurrency))
+    finally:
+        started = time.perf_counter()
+        server.send_signal(signal.SIGTERM)
+        code = server.wait(timeout=60)
+    results["shutdown"] = {"exit_code": code, "seconds": round(time.perf_counter() - started, 2)}
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Shared fixtures.
+
+Settings are read when app.core.config is imported, so the environment is
+pointed at a throwaway database before anything from app is imported. Unit
+tests get their own SQLite file, brought up to SCHEMA_VERSION; endpoint
+tests use `client`, the app against the shared test database, which is
+emptied after each test.
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='hirefred-tests-')}/app.db"
+os.environ["BUS_BACKEND"] = "local"
+os.environ["WEBHOOK_DELIVERY"] = "false"
+
+import pytest  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from app.core.bus import bus  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.migrations import ensure_schema  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models import Release, User  # noqa: E402
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    """Factory for engines on SQLite files in the test's directory, disposed afterwards."""
+    engines = []
+
+    def make(name: str = "test.db"):
+        engines.append(create_engine(f"sqlite:///{tmp_path / name}", connect_args={"check_same_thread": False}))
+        return engines[-1]
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def engine(make_engine):
+    engine = make_engine()
+    ensure_schema(engine)
+    return engine
+
+
+@pytest.fixture
+def user_id(engine) -> int:
+    with Session(engine) as session:
+        user = User(email="owner@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        return user.id
+
+
+@pytest.fixture
+def release_id(engine, user_id) -> int:
+    with Session(engine) as session:
+        release = Release(title="Release", version="1.0.0", content_md="first", user_id=user_id)
+        session.add(release)
+        session.commit()
+        return release.id
+
+
+# ── Endpoint tests ─────────────────────────────────────────────────────────────
+
+ADMIN = {"X-Admin-Key": settings.HIRING_ADMIN_KEY}
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.db import engine
+    from app.main import app
+
+    with TestClient(app) as client:  # startup creates the schema
+        yield client
+    with engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            if table.name != "schemaversion":
+                conn.execute(table.delete())
+    bus.resync()  # drop whatever the caches built from the rows just deleted
+
+
+@pytest.fixture
+def owner_headers(client) -> dict:
+    from app.db import engine
+
+    with Session(engine) as session:
+        user = User(email="owner@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def add_application(client, **fields) -> dict:
+    data = {"company": "Acme", "role": "Engineer", "date_sent": "2025-12-01", **fields}
+    response = client.post("/api/hiring/applications", json=data, headers=ADMIN)
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.core.security import create_access_token
+from app.db import engine
+from app.models import Release, User
+from conftest import ADMIN, add_application
+
+
+def _archive(client) -> dict:
+    response = client.post("/api/admin/archive", headers=ADMIN)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _hot_ids(client):
+    return sorted(a["id"] for a in client.get("/api/hiring/applications", headers=ADMIN).json())
+
+
+def test_archived_applications_stay_in_the_catalog_and_the_counts(client):
+    recent = add_application(client)
+    old = add_application(client, date_sent="2020-01-01", status="interview")
+    dashboard = client.get("/api/hiring/dashboard").json()
+
+    assert _archive(client)["applications"] == 1
+    assert _hot_ids(client) == [recent["id"]]
+    all_ids = [a["id"] for a in client.get("/api/hiring/applications?include_archived=true", headers=ADMIN).json()]
+    assert sorted(all_ids) == [recent["id"], old["id"]]
+    assert sorted(a["id"] for a in client.get("/api/hiring/applications/public").json()) == sorted(all_ids)
+    overview = client.get("/api/hiring/overview").json()
+    assert len(overview["catalog"]) == 2
+    assert client.get("/api/hiring/dashboard").json() == dashboard
+    assert _archive(client)["applications"] == 0
+
+
+def test_editing_an_archived_application_restores_it(client):
+    old = add_application(client, date_sent="2020-01-01")
+    _archive(client)
+    response = client.put(f"/api/hiring/applications/{old['id']}", json={"status": "offer"}, headers=ADMIN)
+    assert response.status_code == 200
+    assert _hot_ids(client) == [old["id"]]
+    assert client.get("/api/hiring/funnel").json()["overall"]["offer"] == 1
+
+
+def test_new_rows_never_take_an_archived_id(client):
+    old = add_application(client, date_sent="2020-01-01")  # the newest row, archived
+    _archive(client)
+    new = add_application(client)
+    assert new["id"] > old["id"]
+    assert client.put(f"/api/hiring/applications/{old['id']}", json={"notes": "back"}, headers=ADMIN).status_code == 200
+    assert _hot_ids(client) == [old["id"], new["id"]]
+
+
+def test_opening_an_archived_draft_restores_it_for_its_owner_only(client, owner_headers):
+    draft = client.post("/releases", json={"title": "Draft", "version": "0.1"}, headers=owner_headers).json()
+    with Session(engine) as session:
+        release = session.get(Release, draft["id"])
+        release.updated_at = datetime.utcnow() - timedelta(days=1000)
+        session.add(release)
+        stranger = User(email="stranger@example.com", password_hash="x")
+        session.add(stranger)
+        session.commit()
+        stranger_headers = {"Authorization": f"Bearer {create_access_token({'sub': str(stranger.id)})}"}
+
+    assert _archive(client)["releases"] == 1
+    assert client.get("/releases", headers=owner_headers).json() == []
+    assert len(client.get("/releases?include_archived=true", headers=owner_headers).json()) == 1
+    assert client.get(f"/releases/{draft['id']}", headers=stranger_headers).status_code == 404
+    opened = client.get(f"/releases/{draft['id']}", headers=owner_headers)
+    assert opened.status_code == 200
+    assert [r["id"] for r in client.get("/releases", headers=owner_headers).json()] == [draft["id"]]
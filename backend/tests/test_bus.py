@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from app.core.bus import InvalidationBus
+from app.core.config import settings
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def workers(engine, tmp_path, monkeypatch):
+    """Two buses sharing a file transport, as two worker processes on one host would."""
+    monkeypatch.setattr(settings, "BUS_BACKEND", "file")
+    monkeypatch.setattr(settings, "BUS_FILE", str(tmp_path / "bus.log"))
+    monkeypatch.setattr(settings, "BUS_POLL_SECONDS", 0.01)
+    buses = [InvalidationBus(), InvalidationBus()]
+    for bus in buses:
+        bus.start(engine)
+    # The start-up resync has run once the gap flag is cleared
+    _wait_for(lambda: not any(bus._transport.gap for bus in buses))
+    yield buses
+    for bus in buses:
+        bus.stop()
+
+
+def test_change_reaches_the_other_worker(workers):
+    a, b = workers
+    seen_by_a, seen_by_b = [], []
+    a.subscribe("releases", seen_by_a.append)
+    b.subscribe("releases", seen_by_b.append)
+
+    version = a.publish("releases")
+    _wait_for(lambda: seen_by_b)
+    assert [change.remote for change in seen_by_b] == [True]
+    assert b.version("releases") >= version
+    time.sleep(0.05)
+    assert [change.remote for change in seen_by_a] == [False]  # no echo of our own message
+
+
+def test_peer_change_is_kept_when_we_published_later(workers):
+    a, b = workers
+    seen_by_b = []
+    b.subscribe("releases", seen_by_b.append)
+
+    a.publish("releases")
+    b.publish("releases")  # b's own (later, larger) version must not hide a's change
+    _wait_for(lambda: any(change.remote for change in seen_by_b))
+    assert [change.remote for change in seen_by_b] == [False, True]
+    versions = [change.version for change in seen_by_b]
+    assert versions == sorted(versions)
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.core.config import settings
+from conftest import ADMIN, add_application
+
+
+def _export(client, path="/api/hiring/applications/export", **params):
+    response = client.get(path, params=params, headers=ADMIN)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_csv_export_streams_every_row_in_id_order(client, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 2)  # several cursor batches
+    ids = [add_application(client, company=f"Company {i}", notes='says "hi", twice')["id"] for i in range(5)]
+
+    response = _export(client)
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="applications-')
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == ids
+    assert rows[0]["company"] == "Company 0"
+    assert rows[0]["notes"] == 'says "hi", twice'
+    assert rows[0]["date_sent"] == "2025-12-01"
+    assert rows[0]["status"] == "applied"
+
+
+def test_ndjson_export_applies_the_filters(client):
+    add_application(client, date_sent="2025-01-15")
+    wanted = add_application(client, date_sent="2025-02-15", status="interview")
+    add_application(client, date_sent="2025-02-20")
+
+    response = _export(client, format="ndjson", date_from="2025-02-01", date_to="2025-02-28", status="interview")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["id"], row["status"], row["date_sent"]) for row in rows] == [(wanted["id"], "interview", "2025-02-15")]
+
+
+def test_export_includes_archived_rows_on_request(client):
+    recent = add_application(client)
+    old = add_application(client, date_sent="2020-01-01")
+    client.post("/api/admin/archive", headers=ADMIN)
+
+    def exported_ids(**params):
+        return [json.loads(line)["id"] for line in _export(client, format="ndjson", **params).text.splitlines()]
+
+    assert exported_ids() == [recent["id"]]
+    assert exported_ids(include_archived="true") == [recent["id"], old["id"]]
+
+
+def test_contacts_export(client):
+    client.post("/api/hiring/contacts", json={
+        "name": "Ada", "company": "Acme", "role": "Recruiter", "last_contact_date": "2025-12-01",
+    }, headers=ADMIN)
+    rows = list(csv.DictReader(io.StringIO(_export(client, "/api/hiring/contacts/export").text)))
+    assert [(row["name"], row["last_contact_date"], row["status"]) for row in rows] == [("Ada", "2025-12-01", "active")]
+
+
+def test_parquet_export(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+    first = add_application(client)
+    add_application(client, status="offer")
+    table = pq.read_table(io.BytesIO(_export(client, format="parquet").content))
+    assert table.column("id").to_pylist()[0] == first["id"]
+    assert table.column("status").to_pylist() == ["applied", "offer"]
+
+
+def test_export_rejects_unknown_formats_and_anonymous_callers(client):
+    assert client.get("/api/hiring/applications/export?format=xml", headers=ADMIN).status_code == 422
+    assert client.get("/api/hiring/applications/export").status_code == 401
@@ -0,0 +1,75 @@
+import json
+from xml.etree import ElementTree
+
+from app.core.config import settings
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _release(client, headers, title, publish=True) -> dict:
+    release = client.post("/releases", json={"title": title, "version": "1.0", "content_md": f"# {title}"}, headers=headers)
+    assert release.status_code == 201, release.text
+    if publish:
+        assert client.post(f"/releases/{release.json()['id']}/publish", headers=headers).status_code == 200
+    return release.json()
+
+
+def _titles(client):
+    feed = client.get("/public/releases/feed.json")
+    assert feed.status_code == 200, feed.text
+    return [item["title"] for item in json.loads(feed.content)["items"]]
+
+
+def test_published_releases_appear_in_every_format_newest_first(client, owner_headers):
+    _release(client, owner_headers, "First")
+    _release(client, owner_headers, "Second")
+    _release(client, owner_headers, "Draft", publish=False)
+
+    rss = client.get("/public/releases/feed.xml")
+    assert rss.headers["content-type"].startswith("application/rss+xml")
+    assert [item.findtext("title") for item in ElementTree.fromstring(rss.content).iter("item")] == [
+        "Second (1.0)", "First (1.0)",
+    ]
+    atom = client.get("/public/releases/feed.atom")
+    assert atom.headers["content-type"].startswith("application/atom+xml")
+    assert [entry.findtext(f"{ATOM}title") for entry in ElementTree.fromstring(atom.content).iter(f"{ATOM}entry")] == [
+        "Second (1.0)", "First (1.0)",
+    ]
+    assert client.get("/public/releases/feed.json").headers["content-type"].startswith("application/feed+json")
+    assert _titles(client) == ["Second (1.0)", "First (1.0)"]
+
+
+def test_unpublish_and_delete_drop_the_entry(client, owner_headers):
+    first = _release(client, owner_headers, "First")
+    second = _release(client, owner_headers, "Second")
+    client.post(f"/releases/{second['id']}/unpublish", headers=owner_headers)
+    assert _titles(client) == ["First (1.0)"]
+    client.delete(f"/releases/{first['id']}", headers=owner_headers)
+    assert _titles(client) == []
+
+
+def test_etag_changes_only_when_the_feed_does(client, owner_headers):
+    _release(client, owner_headers, "First")
+    draft = _release(client, owner_headers, "Draft", publish=False)
+    etag = client.get("/public/releases/feed.xml").headers["etag"]
+    assert client.get("/public/releases/feed.xml", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/releases/{draft['id']}", json={"content_md": "still a draft"}, headers=owner_headers)
+    assert client.get("/public/releases/feed.xml").headers["etag"] == etag
+
+    client.post(f"/releases/{draft['id']}/publish", headers=owner_headers)
+    changed = client.get("/public/releases/feed.xml", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_feed_keeps_the_newest_entries(client, owner_headers, monkeypatch):
+    monkeypatch.setattr(settings, "FEED_MAX_ENTRIES", 2)
+    for title in ("First", "Second"):
+        _release(client, owner_headers, title)
+    third = _release(client, owner_headers, "Third")
+    assert _titles(client) == ["Third (1.0)", "Second (1.0)"]
+
+    # The older release moves back into the window
+    client.post(f"/releases/{third['id']}/unpublish", headers=owner_headers)
+    assert _titles(client) == ["Second (1.0)", "First (1.0)"]
@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+from conftest import ADMIN, add_application
+
+
+def _funnel(client, **params):
+    response = client.get("/api/hiring/funnel", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _stages(counts):
+    return {stage: counts[stage] for stage in ("applied", "responded", "interview", "offer")}
+
+
+def test_funnel_counts_every_stage_an_application_reached(client):
+    add_application(client)
+    add_application(client, status="rejected")
+    add_application(client, status="interview", job_type="contract")
+    add_application(client, status="offer")
+
+    funnel = _funnel(client)
+    assert _stages(funnel["overall"]) == {"applied": 4, "responded": 3, "interview": 2, "offer": 1}
+    assert funnel["overall"]["applied_to_offer"] == 25.0
+    assert _stages(funnel["by_job_type"]["contract"]) == {"applied": 1, "responded": 1, "interview": 1, "offer": 0}
+
+
+def test_funnel_follows_updates_and_deletes(client):
+    first = add_application(client, status="interview")
+    second = add_application(client)
+
+    client.put(f"/api/hiring/applications/{first['id']}", json={"status": "offer"}, headers=ADMIN)
+    client.put(f"/api/hiring/applications/{second['id']}", json={"status": "response"}, headers=ADMIN)
+    assert _stages(_funnel(client)["overall"]) == {"applied": 2, "responded": 2, "interview": 1, "offer": 1}
+
+    client.delete(f"/api/hiring/applications/{first['id']}", headers=ADMIN)
+    assert _stages(_funnel(client)["overall"]) == {"applied": 1, "responded": 1, "interview": 0, "offer": 0}
+
+
+def test_funnel_cohorts_are_limited_to_the_requested_weeks(client):
+    today = date.today()
+    add_application(client, date_sent=today.isoformat())
+    add_application(client, date_sent=(today - timedelta(weeks=10)).isoformat())
+
+    assert len(_funnel(client, weeks=4)["by_cohort"]) == 1
+    assert len(_funnel(client, weeks=12)["by_cohort"]) == 2
+    assert _funnel(client, weeks=4)["overall"]["applied"] == 2
+    assert client.get("/api/hiring/funnel?weeks=0").status_code == 422
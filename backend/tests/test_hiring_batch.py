@@ -0,0 +1,66 @@
+from conftest import ADMIN, add_application
+
+
+def _batch(client, items):
+    response = client.patch("/api/hiring/applications:batch", json={"items": items}, headers=ADMIN)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _statuses(client):
+    return {a["id"]: a["status"] for a in client.get("/api/hiring/applications", headers=ADMIN).json()}
+
+
+def test_batch_applies_valid_items_and_reports_the_rest(client):
+    first, second = add_application(client), add_application(client, company="Globex")
+    result = _batch(client, [
+        {"id": first["id"], "patch": {"status": "interview"}},
+        {"id": second["id"], "op": "delete"},
+        {"id": first["id"], "op": "delete"},
+        {"id": 999, "patch": {"status": "offer"}},
+        {"id": first["id"] + 10, "op": "delete"},
+    ])
+    assert (result["updated"], result["deleted"], result["failed"]) == (1, 1, 3)
+    assert [r["status"] for r in result["results"]] == ["updated", "deleted", "invalid", "not_found", "not_found"]
+    assert _statuses(client) == {first["id"]: "interview"}
+    assert client.get("/api/hiring/dashboard").json()["total_sent"] == 1
+
+
+def test_null_on_a_required_field_is_an_invalid_item(client):
+    application = add_application(client)
+    result = _batch(client, [
+        {"id": application["id"], "patch": {"status": None}},
+        {"id": application["id"] + 1, "patch": {}},
+    ])
+    assert result["failed"] == 2
+    assert result["results"][0] == {
+        "id": application["id"], "op": "update", "status": "invalid", "detail": "status cannot be null",
+    }
+    contacts = client.patch(
+        "/api/hiring/contacts:batch", json={"items": [{"id": 1, "patch": {"name": None}}]}, headers=ADMIN,
+    )
+    assert contacts.status_code == 200
+
+
+def test_null_on_a_required_field_is_rejected_by_single_updates(client):
+    application = add_application(client)
+    response = client.put(f"/api/hiring/applications/{application['id']}", json={"company": None}, headers=ADMIN)
+    assert response.status_code == 422
+    assert client.put(
+        f"/api/hiring/applications/{application['id']}", json={"notes": None}, headers=ADMIN,
+    ).status_code == 200
+
+
+def test_batch_moves_archived_applications_back(client):
+    old = [add_application(client, date_sent="2020-01-01", company=f"Old {n}") for n in range(2)]
+    add_application(client)  # the newest row is never archived
+    assert client.post("/api/admin/archive", headers=ADMIN).json()["applications"] == 2
+    assert set(_statuses(client)) == {old[-1]["id"] + 1}
+
+    result = _batch(client, [
+        {"id": old[0]["id"], "patch": {"status": "offer"}},
+        {"id": old[1]["id"], "op": "delete"},
+    ])
+    assert (result["updated"], result["deleted"]) == (1, 1)
+    assert _statuses(client)[old[0]["id"]] == "offer"
+    assert client.get("/api/hiring/dashboard").json()["total_sent"] == 2
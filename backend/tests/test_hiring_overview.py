@@ -0,0 +1,51 @@
+import threading
+from datetime import date
+
+from sqlmodel import Session
+
+from app.core import history
+from app.core.history import ApplicationChange
+from app.db import engine
+from app.models import Application
+from app.routers import hiring
+from conftest import ADMIN, add_application
+
+
+def test_overview_returns_the_requested_sections(client):
+    add_application(client)
+    client.put("/api/hiring/banner", json={"message": "Open to work", "is_active": True}, headers=ADMIN)
+    overview = client.get("/api/hiring/overview").json()
+    assert set(overview) == {"dashboard", "contacts", "banner", "catalog"}
+    assert overview["dashboard"]["total_sent"] == 1
+    assert overview["banner"]["message"] == "Open to work"
+
+    assert set(client.get("/api/hiring/overview?include=catalog").json()) == {"catalog"}
+    assert client.get("/api/hiring/overview?include=nope").status_code == 422
+
+
+def _insert_application():
+    with Session(engine) as session:
+        application = Application(company="Late", role="Engineer", date_sent=date(2025, 12, 2))
+        session.add(application)
+        session.flush()
+        history.record(session, [ApplicationChange(application.id, "created", None, history.snapshot(application))])
+        session.commit()
+
+
+def test_overview_sections_come_from_one_snapshot(client, monkeypatch):
+    add_application(client)
+    writer = threading.Thread(target=_insert_application)
+    dashboard_stats = hiring.dashboard_stats
+
+    def dashboard_then_write(session):
+        stats = dashboard_stats(session)
+        writer.start()
+        writer.join(timeout=0.5)  # commits right away unless the overview holds a read transaction
+        return stats
+
+    monkeypatch.setattr(hiring, "dashboard_stats", dashboard_then_write)
+    overview = client.get("/api/hiring/overview?include=dashboard,catalog").json()
+    writer.join()
+    monkeypatch.setattr(hiring, "dashboard_stats", dashboard_stats)
+    assert overview["dashboard"]["total_sent"] == len(overview["catalog"]) == 1
+    assert len(client.get("/api/hiring/applications", headers=ADMIN).json()) == 2
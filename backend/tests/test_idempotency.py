@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core import idempotency
+from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware, StoredResponse, fingerprint, storage_key
+from app.models import IdempotencyRecord
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def make_client(engine, calls):
+    """A client for a small app behind the middleware; every call gets a fresh (empty) LRU."""
+    api = FastAPI()
+
+    @api.post("/items")
+    def create_item(item: dict):
+        calls.append(item)
+        return {"call": len(calls), **item}
+
+    @api.post("/broken")
+    def broken(item: dict):
+        calls.append(item)
+        return JSONResponse({"detail": "down"}, status_code=503)
+
+    return lambda: TestClient(IdempotencyMiddleware(api, engine))
+
+
+def _post(client, body, key="key-1", path="/items", params=None):
+    return client.post(path, json=body, params=params, headers={"Idempotency-Key": key})
+
+
+def test_retry_replays_the_stored_response(make_client, calls):
+    client = make_client()
+    first = _post(client, {"name": "a"})
+    again = _post(client, {"name": "a"})
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json() == {"call": 1, "name": "a"}
+    assert again.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert len(calls) == 1
+
+
+def test_replay_survives_a_restart(make_client, calls):
+    _post(make_client(), {"name": "a"})
+    replayed = _post(make_client(), {"name": "a"})  # new middleware: nothing cached, read from the table
+    assert replayed.headers["idempotent-replayed"] == "true"
+    assert replayed.json() == {"call": 1, "name": "a"}
+    assert len(calls) == 1
+
+
+def test_key_reused_with_a_different_body_is_rejected(make_client, calls):
+    client = make_client()
+    _post(client, {"name": "a"})
+    mismatch = _post(client, {"name": "b"})
+    assert mismatch.status_code == 422
+    assert len(calls) == 1
+    assert _post(make_client(), {"name": "b"}).status_code == 422  # also when read from the table
+
+
+def test_key_reused_with_a_different_query_string_is_rejected(make_client, calls):
+    client = make_client()
+    _post(client, {"name": "a"}, params={"notify": "true"})
+    assert _post(client, {"name": "a"}, params={"notify": "true"}).headers["idempotent-replayed"] == "true"
+    assert _post(client, {"name": "a"}, params={"notify": "false"}).status_code == 422
+    assert _post(client, {"name": "a"}).status_code == 422
+    assert len(calls) == 1
+
+
+def test_requests_without_a_key_always_run(make_client, calls):
+    client = make_client()
+    client.post("/items", json={"name": "a"})
+    client.post("/items", json={"name": "a"})
+    assert len(calls) == 2
+
+
+def test_server_errors_are_not_stored(make_client, calls):
+    client = make_client()
+    assert _post(client, {"name": "a"}, path="/broken").status_code == 503
+    assert _post(client, {"name": "a"}, path="/broken").status_code == 503
+    assert len(calls) == 2
+
+
+def test_key_still_in_progress_is_a_conflict(engine, make_client, calls, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.2)
+    body = b'{"name": "a"}'
+    with Session(engine) as session:
+        # Claimed by another worker that has not finished yet
+        session.add(IdempotencyRecord(
+            key=storage_key("POST", "/items", b"\0", b"key-1"), fingerprint=fingerprint(b"", body),
+        ))
+        session.commit()
+    response = make_client().post(
+        "/items", content=body, headers={"Idempotency-Key": "key-1", "Content-Type": "application/json"},
+    )
+    assert response.status_code == 409
+    assert calls == []
+
+
+def test_expired_key_runs_again(engine, make_client, calls):
+    _post(make_client(), {"name": "a"})
+    key = storage_key("POST", "/items", b"\0", b"key-1")
+    with Session(engine) as session:
+        record = session.get(IdempotencyRecord, key)
+        record.created_at -= timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS + 1)
+        session.add(record)
+        session.commit()
+    assert _post(make_client(), {"name": "a"}).json() == {"call": 2, "name": "a"}
+
+
+def test_cached_response_expires_with_its_record():
+    cache = idempotency._LRU(2)
+    response = StoredResponse("fingerprint", 200, [], b"{}")
+    cache.put("fresh", response, datetime.utcnow())
+    cache.put("stale", response, datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS, seconds=1))
+    assert cache.get("fresh") == response
+    assert cache.get("stale") is None
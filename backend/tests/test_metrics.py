@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import RETIRED_FILE, Registry, labels
+
+
+@pytest.fixture
+def registry():
+    registry = Registry()
+    registry.counter("requests_total", "Requests.")
+    registry.gauge("in_flight", "In flight.")
+    registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    return registry
+
+
+def _run_threads(count: int, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_updates_are_not_lost(registry):
+    def work():
+        for _ in range(10_000):
+            registry.inc("requests_total", labels(route="/"))
+            registry.observe("latency_seconds", "", 0.5)
+
+    _run_threads(8, work)
+    snapshot = registry.snapshot()
+    assert snapshot["requests_total"] == {'route="/"': 80_000}
+    assert snapshot["latency_seconds"][""] == [0, 80_000, 0, 40_000.0]
+
+
+def test_values_of_finished_threads_are_kept(registry):
+    _run_threads(3, lambda: registry.inc("requests_total"))
+    assert registry.snapshot()["requests_total"] == {"": 3}
+    registry.inc("requests_total")
+    assert registry.snapshot()["requests_total"] == {"": 4}  # retired shards are not counted twice
+
+
+def test_gauges_combine_set_and_inc(registry):
+    registry.set("in_flight", "", 5)
+    registry.set("in_flight", "", 2)
+    registry.inc("in_flight", 'pid="1"')
+    snapshot = registry.snapshot()
+    assert snapshot["in_flight"] == {"": 2, 'pid="1"': 1}
+    assert 'in_flight{pid="1"} 1' in registry.render([snapshot])
+
+
+def test_reset_drops_everything(registry):
+    registry.inc("requests_total")
+    registry.set("in_flight", "", 1)
+    registry.reset()
+    assert registry.snapshot() == {"requests_total": {}, "in_flight": {}, "latency_seconds": {}}
+
+
+def test_exited_workers_keep_their_counters(registry, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    dead = tmp_path / f"{exited.pid}.json"
+    dead.write_text(json.dumps({
+        "requests_total": {"": 5},
+        "in_flight": {f'pid="{exited.pid}"': 3},
+        "latency_seconds": {"": [1, 0, 0, 0.05]},
+    }))
+    registry.inc("requests_total")
+
+    for _ in range(2):  # retired once, then read from the aggregate
+        text = registry.collect_all()
+        assert "requests_total 6" in text
+        assert "latency_seconds_count 1" in text
+        assert f'pid="{exited.pid}"' not in text  # gauges of a gone process are dropped
+    assert not dead.exists()
+    assert (tmp_path / RETIRED_FILE).exists()
+    assert set(registry.worker_snapshots()) == {os.getpid()}
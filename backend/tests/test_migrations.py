@@ -0,0 +1,110 @@
+from datetime import date
+
+from sqlalchemy import inspect, text
+from sqlmodel import Session, func, select
+
+from app.core.migrations import SCHEMA_VERSION, current_version, ensure_schema
+from app.models import Application, ArchivedApplication, DailyRollup, RecruiterContact, SchemaVersion
+
+# The tables as the first release created them: free-form date strings, no schema version
+BASELINE_SCHEMA = [
+    """CREATE TABLE user (
+        id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, password_hash VARCHAR NOT NULL,
+        created_at DATETIME NOT NULL)""",
+    """CREATE TABLE release (
+        id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, version VARCHAR(50) NOT NULL,
+        content_md VARCHAR NOT NULL, visibility VARCHAR(8) NOT NULL, user_id INTEGER NOT NULL REFERENCES user (id),
+        slug VARCHAR, published_at DATETIME, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)""",
+    """CREATE TABLE application (
+        id INTEGER PRIMARY KEY, company VARCHAR(200) NOT NULL, role VARCHAR(200) NOT NULL,
+        job_type VARCHAR(9) NOT NULL, date_sent VARCHAR NOT NULL, status VARCHAR(12) NOT NULL,
+        notes VARCHAR, created_at DATETIME NOT NULL)""",
+    """CREATE TABLE recruitercontact (
+        id INTEGER PRIMARY KEY, application_id INTEGER REFERENCES application (id), name VARCHAR(200) NOT NULL,
+        company VARCHAR(200) NOT NULL, role VARCHAR(200) NOT NULL, last_contact_date VARCHAR NOT NULL,
+        status VARCHAR(100) NOT NULL, note VARCHAR)""",
+    """CREATE TABLE statusbanner (
+        id INTEGER PRIMARY KEY, message VARCHAR NOT NULL, is_active BOOLEAN NOT NULL, updated_at DATETIME NOT NULL)""",
+]
+
+
+def _baseline(engine):
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO application (id, company, role, job_type, date_sent, status, created_at) VALUES "
+            "(1, 'Acme', 'Engineer', 'fulltime', '2025-03-04', 'applied', '2025-03-04 09:00:00'), "
+            "(2, 'Globex', 'Engineer', 'contract', 'last week', 'interview', '2025-02-01 10:00:00')"
+        ))
+        conn.execute(text(
+            "INSERT INTO recruitercontact (id, application_id, name, company, role, last_contact_date, status) "
+            "VALUES (1, 2, 'Sam', 'Globex', 'Recruiter', ' 2025-01-05 ', 'active')"
+        ))
+    return engine
+
+
+def test_fresh_database_is_created_at_current_version(make_engine):
+    engine = make_engine()
+    assert current_version(engine) is None
+    assert ensure_schema(engine) is True
+    assert current_version(engine) == SCHEMA_VERSION
+    assert ensure_schema(engine) is False  # already current: nothing runs
+
+
+def test_baseline_database_is_upgraded(make_engine):
+    engine = _baseline(make_engine())
+    assert ensure_schema(engine) is True
+    assert current_version(engine) == SCHEMA_VERSION
+
+    with Session(engine) as session:
+        sent = dict(session.exec(select(Application.id, Application.date_sent)).all())
+        contact = session.get(RecruiterContact, 1)
+        rolled_up = session.exec(select(func.sum(DailyRollup.count))).one()
+    assert sent == {1: date(2025, 3, 4), 2: date(2025, 2, 1)}  # invalid value falls back to created_at
+    assert contact.last_contact_date == date(2025, 1, 5)
+    assert rolled_up == 2  # derived tables are seeded from the existing applications
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("application")}
+    assert "ix_application_date_sent" in indexes
+
+
+def test_upgrade_from_older_version_is_idempotent(make_engine):
+    engine = _baseline(make_engine())
+    ensure_schema(engine)
+    with Session(engine) as session:
+        row = session.get(SchemaVersion, 1)
+        row.version = SCHEMA_VERSION - 1
+        session.add(row)
+        session.commit()
+
+    assert ensure_schema(engine) is True
+    with Session(engine) as session:
+        assert session.exec(select(func.sum(DailyRollup.count))).one() == 2  # not seeded twice
+        assert session.exec(select(func.count()).select_from(SchemaVersion)).one() == 1
+    assert current_version(engine) == SCHEMA_VERSION
+
+
+def test_ids_are_not_reused_after_upgrade(make_engine):
+    engine = _baseline(make_engine())
+    ArchivedApplication.__table__.create(engine)
+    with engine.begin() as conn:
+        # Archived by an earlier version, which then let SQLite hand out id 7 again
+        conn.execute(text(
+            "INSERT INTO archivedapplication (id, company, role, job_type, date_sent, status, created_at, archived_at) "
+            "VALUES (7, 'Initech', 'Engineer', 'fulltime', '2020-01-01', 'rejected', '2020-01-01', '2025-01-01')"
+        ))
+    ensure_schema(engine)
+
+    with Session(engine) as session:
+        assert sorted(session.exec(select(Application.id)).all()) == [1, 2]  # rows survive the rebuild
+        for _ in range(2):
+            session.add(Application(company="Hooli", role="Engineer", date_sent=date(2025, 6, 1)))
+            session.commit()
+        session.delete(session.get(Application, 9))
+        session.commit()
+        session.add(Application(company="Hooli", role="Engineer", date_sent=date(2025, 6, 2)))
+        session.commit()
+        assert sorted(session.exec(select(Application.id)).all()) == [1, 2, 8, 10]
+    indexes = {index["name"] for index in inspect(engine).get_indexes("application")}
+    assert "ix_application_date_sent" in indexes
@@ -0,0 +1,54 @@
+from collections import Counter
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core import querylog
+from app.core.config import settings
+from app.models import Application, ApplicationBatchItem, ApplicationUpdate
+from app.routers.hiring import _apply_batch
+
+
+@pytest.fixture
+def request_queries(engine, monkeypatch):
+    """Statements on `engine` tracked as one request, in raise mode."""
+    monkeypatch.setattr(settings, "QUERY_LOG_MODE", "raise")
+    querylog.instrument_engine(engine)
+    request = querylog._RequestQueries({"type": "http", "path": "/test"})
+    token = querylog._current.set(request)
+    yield request
+    querylog._current.reset(token)
+
+
+def test_statement_shape_collapses_in_lists():
+    assert querylog.statement_shape("SELECT a FROM t WHERE id IN (?, ?,\n ?)") == "SELECT a FROM t WHERE id IN (?)"
+    assert querylog._normalize("SELECT a FROM t WHERE (a, b) IN (VALUES (?, ?), (?, ?), (?, ?))") == (
+        "SELECT a FROM t WHERE (a, b) IN (VALUES (?))", 3,
+    )
+    # A wide VALUES row is one insert, not a list of keys
+    assert querylog._normalize("INSERT INTO t (a, b, c, d, e) VALUES (?, ?, ?, ?, ?)")[1] == 0
+
+
+def test_chunked_batches_are_not_reported_as_repeats(engine, request_queries):
+    ids = list(range(1, 2602))  # six chunks, the last one holding a single id
+    with Session(engine) as session:
+        result = _apply_batch(session, Application, [
+            ApplicationBatchItem(id=i, patch=ApplicationUpdate(notes="x")) for i in ids
+        ])
+    assert result.failed == len(ids)
+    assert max(request_queries.shapes.values()) == 6
+    assert not request_queries.repeats or max(request_queries.repeats.values()) == 1
+
+
+def test_per_item_lookups_still_raise(engine, request_queries):
+    with Session(engine) as session, pytest.raises(querylog.QueryPatternError):
+        for i in range(settings.N_PLUS_ONE_THRESHOLD):
+            session.exec(select(Application).where(Application.id == i)).all()
+
+
+def test_report_counts_batched_statements_without_flagging_them():
+    report = querylog.QueryReport()
+    report.record_request(Counter({"SELECT batch": 6, "SELECT item": 7}), Counter({"SELECT item": 7}), "/test")
+    summary = report.summary()
+    assert [r["shape"] for r in summary["repeated_statements"]] == ["SELECT item"]
+    assert {s["shape"]: s["executions"] for s in summary["top_statements"]} == {"SELECT batch": 6, "SELECT item": 7}
@@ -0,0 +1,74 @@
+import threading
+
+from sqlmodel import Session, select
+
+from app.core import revisions
+from app.models import Release, ReleaseRevision
+
+
+def _edit(engine, release_id: int, content: str):
+    """What update_release does: change the content and record the revision in one transaction."""
+    with Session(engine) as session:
+        release = session.get(Release, release_id)
+        previous, release.content_md = release.content_md, content
+        session.add(release)
+        revisions.record(session, release_id, content, previous=previous)
+        session.commit()
+
+
+def test_revisions_round_trip(engine, release_id):
+    for n in range(1, 6):
+        _edit(engine, release_id, f"line\nedit {n}\n")
+    with Session(engine) as session:
+        assert revisions.latest_number(session, release_id) == 6  # the original content is revision 1
+        assert revisions.load(session, release_id, 1)[1] == "first"
+        assert revisions.load(session, release_id, 4)[1] == "line\nedit 3\n"
+        assert revisions.load(session, release_id, 7) is None
+
+
+def test_concurrent_records_get_consecutive_numbers(engine, release_id):
+    threads, edits, errors = 8, 10, []
+
+    def write(worker: int):
+        try:
+            for n in range(edits):
+                # Only the revision is written, so nothing but record() itself orders the writers
+                with Session(engine) as session:
+                    revisions.record(session, release_id, f"worker {worker} edit {n}")
+                    session.commit()
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=write, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert errors == []
+    with Session(engine) as session:
+        numbers = session.exec(
+            select(ReleaseRevision.number).where(ReleaseRevision.release_id == release_id)
+            .order_by(ReleaseRevision.number)
+        ).all()
+    assert numbers == list(range(1, threads * edits + 1))
+
+
+def test_interleaved_edits_diff_against_the_stored_revision(engine, release_id):
+    with Session(engine) as session:
+        release = session.get(Release, release_id)
+        release.content_md = "a\nb\nc\n"
+        session.add(release)
+        session.commit()
+    # Both editors read the same content; the second one commits on top of the first
+    first, second = Session(engine), Session(engine)
+    slow, fast = first.get(Release, release_id), second.get(Release, release_id)
+    for session, release, content in ((second, fast, "z\nb\nc\n"), (first, slow, "a\nb\nX\nc\n")):
+        previous, release.content_md = release.content_md, content
+        session.add(release)
+        revisions.record(session, release_id, content, previous=previous)
+        session.commit()
+        session.close()
+
+    with Session(engine) as session:
+        history = [revisions.load(session, release_id, n)[1] for n in (1, 2, 3)]
+    assert history == ["a\nb\nc\n", "z\nb\nc\n", "a\nb\nX\nc\n"]
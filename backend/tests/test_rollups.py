@@ -0,0 +1,91 @@
+import threading
+from collections import Counter
+from datetime import date
+
+from sqlmodel import Session, select
+
+from app.core.rollups import apply_deltas
+from app.models import ApplicationStatus, DailyRollup, JobType
+from conftest import ADMIN, add_application
+
+KEY = ["day", "status", "job_type"]
+MONDAY = (date(2025, 3, 3), ApplicationStatus.applied, JobType.fulltime)
+TUESDAY = (date(2025, 3, 4), ApplicationStatus.interview, JobType.contract)
+
+
+def _counts(engine):
+    with Session(engine) as session:
+        return {(r.day, r.status, r.job_type): r.count for r in session.exec(select(DailyRollup)).all()}
+
+
+def _apply(engine, deltas):
+    with Session(engine) as session:
+        apply_deltas(session, DailyRollup, KEY, Counter(deltas))
+        session.commit()
+
+
+def test_apply_deltas_inserts_new_keys_and_adds_to_existing_ones(engine):
+    _apply(engine, {MONDAY: 2})
+    _apply(engine, {MONDAY: -1, TUESDAY: 3})
+    assert _counts(engine) == {MONDAY: 1, TUESDAY: 3}
+
+
+def test_apply_deltas_skips_zero_deltas(engine):
+    _apply(engine, {MONDAY: 0})
+    assert _counts(engine) == {}
+
+
+def test_concurrent_writers_of_a_new_key_lose_nothing(engine):
+    threads, errors = 8, []
+    commits = 20
+
+    def write():
+        try:
+            for _ in range(commits):
+                _apply(engine, {MONDAY: 1})
+        except Exception as e:  # collected, so a failure names the error instead of a lost count
+            errors.append(e)
+
+    workers = [threading.Thread(target=write) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert errors == []
+    assert _counts(engine) == {MONDAY: threads * commits}
+
+
+def test_timeseries_endpoint_buckets_and_zero_fills(client):
+    add_application(client, date_sent="2025-03-03")
+    add_application(client, date_sent="2025-03-04", status="interview")
+    add_application(client, date_sent="2025-03-19", job_type="contract")
+
+    response = client.get("/api/hiring/timeseries", params={"from": "2025-03-01", "to": "2025-03-31"})
+    assert response.status_code == 200, response.text
+    weeks = {p["period"]: p["total"] for p in response.json()["points"]}
+    assert weeks == {"2025-W09": 0, "2025-W10": 2, "2025-W11": 0, "2025-W12": 1, "2025-W13": 0, "2025-W14": 0}
+
+    by_status = client.get(
+        "/api/hiring/timeseries",
+        params={"from": "2025-03-01", "to": "2025-03-31", "granularity": "month", "group_by": "status"},
+    ).json()["points"]
+    assert by_status == [{"period": "2025-03", "total": 3, "counts": {"applied": 2, "interview": 1}}]
+
+
+def test_timeseries_endpoint_follows_deletes(client):
+    application = add_application(client, date_sent="2025-03-03")
+    client.delete(f"/api/hiring/applications/{application['id']}", headers=ADMIN)
+    points = client.get(
+        "/api/hiring/timeseries", params={"from": "2025-03-03", "to": "2025-03-03", "granularity": "day"}
+    ).json()["points"]
+    assert points == [{"period": "2025-03-03", "total": 0, "counts": {}}]
+
+
+def test_timeseries_endpoint_rejects_bad_parameters(client):
+    for params in (
+        {"granularity": "hour"},
+        {"group_by": "company"},
+        {"from": "2025-04-01", "to": "2025-03-01"},
+        {"from": "2000-01-01", "to": "2025-01-01", "granularity": "day"},
+    ):
+        assert client.get("/api/hiring/timeseries", params=params).status_code == 422, params
@@ -0,0 +1,195 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.webhooks import DeliveryEngine
+from app.models import WebhookDelivery, WebhookSubscription
+
+
+class FakeClient:
+    """Stands in for the httpx client: returns (or raises) the queued outcomes in order."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    async def post(self, url, **kwargs):
+        self.requests.append(url)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def delivery_id(engine, user_id) -> int:
+    with Session(engine) as session:
+        subscription = WebhookSubscription(user_id=user_id, url="https://hooks.example.com/in", secret="s3cret")
+        session.add(subscription)
+        session.flush()
+        delivery = WebhookDelivery(subscription_id=subscription.id, event="release.published", payload="{}")
+        session.add(delivery)
+        session.commit()
+        return delivery.id
+
+
+@pytest.fixture
+def outbox(engine, monkeypatch):
+    """A DeliveryEngine whose requests skip DNS and go to a FakeClient (outbox.fake)."""
+    outbox = DeliveryEngine(engine)
+
+    async def send(delivery, headers):
+        return await outbox.fake.post(delivery.url, content=delivery.payload, headers=headers)
+
+    monkeypatch.setattr(outbox, "_send", send)
+    return outbox
+
+
+def _attempt(outbox, *outcomes):
+    """Claim what is due and deliver it against `outcomes`; returns how many rows were claimed."""
+    outbox.fake = FakeClient(*outcomes)
+    claimed = outbox._claim(10)
+    for delivery in claimed:
+        asyncio.run(outbox._deliver(delivery))
+    return len(claimed)
+
+
+def _row(engine, delivery_id) -> WebhookDelivery:
+    with Session(engine) as session:
+        return session.get(WebhookDelivery, delivery_id)
+
+
+def _make_due(engine, delivery_id):
+    with Session(engine) as session:
+        session.exec(update(WebhookDelivery).where(WebhookDelivery.id == delivery_id)
+                     .values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+        session.commit()
+
+
+def test_success_marks_the_delivery_done(engine, outbox, delivery_id):
+    assert _attempt(outbox, httpx.Response(204)) == 1
+    row = _row(engine, delivery_id)
+    assert (row.status, row.attempts, row.response_status) == ("delivered", 1, 204)
+    assert row.delivered_at is not None
+
+
+def test_server_error_is_retried_later(engine, outbox, delivery_id):
+    before = datetime.utcnow()
+    _attempt(outbox, httpx.Response(503))
+    row = _row(engine, delivery_id)
+    assert (row.status, row.attempts, row.last_error) == ("pending", 1, "HTTP 503")
+    assert row.next_attempt_at >= before + timedelta(seconds=settings.WEBHOOK_BACKOFF_SECONDS * 0.5)
+    assert _attempt(outbox) == 0  # not due again yet
+
+
+def test_retry_after_is_respected(engine, outbox, delivery_id):
+    before = datetime.utcnow()
+    _attempt(outbox, httpx.Response(429, headers={"Retry-After": "120"}))
+    assert _row(engine, delivery_id).next_attempt_at >= before + timedelta(seconds=120)
+
+
+def test_network_error_is_retried(engine, outbox, delivery_id):
+    _attempt(outbox, httpx.ConnectError("refused"))
+    row = _row(engine, delivery_id)
+    assert (row.status, row.response_status) == ("pending", None)
+    assert row.last_error.startswith("ConnectError")
+
+
+@pytest.mark.parametrize("status, error", [(404, "HTTP 404"), (302, "HTTP 302 (redirects are not followed)")])
+def test_client_errors_and_redirects_fail_for_good(engine, outbox, delivery_id, status, error):
+    _attempt(outbox, httpx.Response(status))
+    row = _row(engine, delivery_id)
+    assert (row.status, row.last_error) == ("failed", error)
+
+
+def test_unexpected_exception_fails_instead_of_looping(engine, outbox, delivery_id):
+    _attempt(outbox, KeyError("boom"))
+    row = _row(engine, delivery_id)
+    assert (row.status, row.attempts) == ("failed", 1)
+    assert "KeyError" in row.last_error
+    _make_due(engine, delivery_id)
+    assert _attempt(outbox) == 0
+
+
+def test_gives_up_after_max_attempts(engine, outbox, delivery_id, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_ATTEMPTS", 3)
+    for _ in range(3):
+        _make_due(engine, delivery_id)
+        assert _attempt(outbox, httpx.Response(500)) == 1
+    row = _row(engine, delivery_id)
+    assert (row.status, row.attempts) == ("failed", 3)
+
+
+def test_claim_is_a_lease(engine, outbox, delivery_id):
+    assert len(outbox._claim(10)) == 1
+    assert outbox._claim(10) == []  # another worker polling now gets nothing
+    row = _row(engine, delivery_id)
+    assert (row.status, row.attempts) == ("pending", 1)
+    assert row.next_attempt_at > datetime.utcnow()
+
+
+def test_exhausted_rows_are_failed_instead_of_claimed(engine, outbox, delivery_id):
+    # A worker died mid-send on the last attempt, leaving the row pending with its lease expired
+    with Session(engine) as session:
+        session.exec(update(WebhookDelivery).where(WebhookDelivery.id == delivery_id)
+                     .values(attempts=settings.WEBHOOK_MAX_ATTEMPTS))
+        session.commit()
+    assert outbox._claim(10) == []
+    row = _row(engine, delivery_id)
+    assert (row.status, row.last_error) == ("failed", "Attempts exhausted without a result")
+
+
+def test_private_target_fails_for_good(engine, delivery_id, monkeypatch):
+    with Session(engine) as session:
+        session.exec(update(WebhookSubscription).values(url="http://127.0.0.1:9/in"))
+        session.commit()
+    outbox, fake = DeliveryEngine(engine), FakeClient()
+
+    async def client_for(host):
+        return fake
+
+    monkeypatch.setattr(outbox, "_client_for", client_for)
+    asyncio.run(outbox._deliver(outbox._claim(10)[0]))
+    row = _row(engine, delivery_id)
+    assert row.status == "failed"
+    assert "non-public address" in row.last_error
+    assert fake.requests == []
+
+
+def test_claims_no_more_per_host_than_it_can_send(engine, outbox, delivery_id, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_PER_HOST", 2)
+    with Session(engine) as session:
+        user_id = session.get(WebhookSubscription, 1).user_id
+        other = WebhookSubscription(user_id=user_id, url="https://other.example.com/in", secret="s")
+        session.add(other)
+        session.flush()
+        session.add_all([WebhookDelivery(subscription_id=1, event="release.published", payload="{}")
+                         for _ in range(4)])
+        session.add(WebhookDelivery(subscription_id=other.id, event="release.published", payload="{}"))
+        session.commit()
+
+    hosts = [delivery.host for delivery in outbox._claim(10, {"https://hooks.example.com": 1})]
+    # Queued behind the per-host cap, the rest would sit out their lease and be claimed twice
+    assert sorted(hosts) == ["https://hooks.example.com", "https://other.example.com"]
+    assert len(outbox._claim(10)) == 2
+
+
+def test_connections_are_pooled_per_host_name(engine):
+    outbox = DeliveryEngine(engine)
+
+    async def clients():
+        first = await outbox._client_for("https://a.example.com")
+        again = await outbox._client_for("https://a.example.com")
+        other = await outbox._client_for("https://b.example.com")
+        for client in outbox._clients.values():
+            await client.aclose()
+        return first, again, other
+
+    first, again, other = asyncio.run(clients())
+    assert first is again
+    assert first is not other
@@ -27,21 +27,51 @@ export default function HiringProgressPage() {
 
   useEffect(() => {
     if (!company) return
-    // Public dashboard fetches — no admin key needed for reading applications via dashboard endpoint
-    Promise.all([
-      hiringApi.getDashboard(),
-      hiringApi.getContacts(),
-      hiringApi.getBanner(),
-      fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/hiring/applications/public`)
-        .then(r => r.ok ? r.json() : [])
-        .catch(() => []),
-    ]).then(([statsData, contactsData, bannerData, appsData]) => {
-      setStats(statsData)
-      setContacts(contactsData)
-      setBanner(bannerData)
-      setApplications(Array.isArray(appsData) ? appsData : [])
+    // One round trip for everything the page renders
+    const load = () => hiringApi.getOverview().then((overview) => {
+      setStats(overview.dashboard ?? null)
+      setContacts(overview.contacts ?? [])
+      setBanner(overview.banner ?? null)
+      setApplications(overview.catalog ?? [])
       setLoading(false)
     })
+    load()
+
+    // Keep the page live instead of re-fetching everything
+    return hiringApi.subscribe({
+      onStats: setStats,
+      onBanner: setBanner,
+      onApplication: (delta) => {
+        if (delta.op === 'imported' || delta.op === 'batch') {
+          hiringApi.getOverview(['catalog']).then(o => { if (o.catalog) setApplications(o.catalog) })
+          return
+        }
+        setApplications(prev => {
+          if (delta.op === 'deleted') return prev.filter(a => a.id !== delta.id)
+          const rest = prev.filter(a => a.id !== delta.application.id)
+          return [delta.application, ...rest].sort((a, b) => b.date_sent.localeCompare(a.date_sent))
+        })
+      },
+      onContact: (delta) => {
+        if (delta.op === 'batch') {
+          hiringApi.getContacts().then(setContacts)
+          return
+        }
+        setContacts(prev => {
+          if (delta.op === 'deleted') return prev.filter(c => c.id !== delta.id)
+          const idx = prev.findIndex(c => c.id === delta.contact.id)
+          if (idx === -1) return [...prev, delta.contact]
+          return prev.map(c => (c.id === delta.contact.id ? delta.contact : c))
+        })
+      },
+      onInvalidate: ({ resource }) => {
+        if (resource === 'contacts') hiringApi.getContacts().then(setContacts)
+        if (resource === 'applications') {
+          hiringApi.getOverview(['catalog']).then(o => { if (o.catalog) setApplications(o.catalog) })
+        }
+      },
+      onResync: load,
+    })
   }, [company])
 
   if (!company) {
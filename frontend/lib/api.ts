@@ -318,6 +318,37 @@ export interface DashboardStats {
   by_job_type: Partial<Record<JobType, number>>
 }
 
+export type OverviewSection = 'dashboard' | 'contacts' | 'banner' | 'catalog'
+
+export interface HiringOverview {
+  dashboard?: DashboardStats
+  contacts?: RecruiterContact[]
+  banner?: HiringStatusBanner | null
+  catalog?: Application[]
+}
+
+export type ApplicationDelta =
+  | { op: 'created' | 'updated'; application: Application }
+  | { op: 'deleted'; id: number }
+  | { op: 'imported'; count: number }
+  | { op: 'batch'; updated: number[]; deleted: number[] }
+
+export type ContactDelta =
+  | { op: 'created' | 'updated'; contact: RecruiterContact }
+  | { op: 'deleted'; id: number }
+  | { op: 'batch'; updated: number[]; deleted: number[] }
+
+export interface HiringStreamHandlers {
+  onStats?: (stats: DashboardStats) => void
+  onBanner?: (banner: HiringStatusBanner | null) => void
+  onApplication?: (delta: ApplicationDelta) => void
+  onContact?: (delta: ContactDelta) => void
+  // Another server worker changed a resource; refetch it
+  onInvalidate?: (change: { resource: string; version: number }) => void
+  // Events may have been missed (dropped as a slow consumer, or reconnected); refetch everything
+  onResync?: () => void
+}
+
 // ============================================
 // Hiring Fallback Data
 // ============================================
@@ -354,6 +385,22 @@ const FALLBACK_BANNER: HiringStatusBanner = {
 // ============================================
 
 export const hiringApi = {
+  // Dashboard, contacts, banner and catalog in a single round trip
+  async getOverview(include?: OverviewSection[]): Promise<HiringOverview> {
+    const fallback: HiringOverview = {
+      dashboard: FALLBACK_DASHBOARD_STATS,
+      contacts: FALLBACK_CONTACTS,
+      banner: FALLBACK_BANNER,
+      catalog: [],
+    }
+    return tryFetchOrFallback(async () => {
+      const query = include ? `?include=${include.join(',')}` : ''
+      const res = await fetch(`${API_URL}/api/hiring/overview${query}`)
+      if (!res.ok) throw new Error('Failed to fetch overview')
+      return res.json()
+    }, fallback)
+  },
+
   async getDashboard(): Promise<DashboardStats> {
     return tryFetchOrFallback(async () => {
       const res = await fetch(`${API_URL}/api/hiring/dashboard`)
@@ -378,6 +425,35 @@ export const hiringApi = {
     }, FALLBACK_BANNER)
   },
 
+  // Live updates over Server-Sent Events; returns an unsubscribe function
+  subscribe(handlers: HiringStreamHandlers): () => void {
+    if (DEMO_MODE || typeof EventSource === 'undefined') return () => {}
+    const source = new EventSource(`${API_URL}/api/hiring/stream`)
+    const on = <T,>(event: string, handler?: (data: T) => void) => {
+      if (!handler) return
+      source.addEventListener(event, (e) => handler(JSON.parse((e as MessageEvent).data)))
+    }
+    on('stats', handlers.onStats)
+    on('banner', handlers.onBanner)
+    on('application', handlers.onApplication)
+    on('contact', handlers.onContact)
+    on('invalidate', handlers.onInvalidate)
+    // Nothing is replayed after a drop or a reconnect, so resync on both; the browser
+    // reconnects by itself after `retry`, and the open after it resyncs once more
+    let stale = false
+    source.addEventListener('dropped', () => {
+      stale = true
+      handlers.onResync?.()
+    })
+    source.addEventListener('error', () => { stale = true })
+    source.addEventListener('open', () => {
+      if (!stale) return
+      stale = false
+      handlers.onResync?.()
+    })
+    return () => source.close()
+  },
+
   async getApplications(adminKey: string): Promise<Application[]> {
     const res = await fetch(`${API_URL}/api/hiring/applications`, {
       headers: { 'X-Admin-Key': adminKey },